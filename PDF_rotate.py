@@ -3,22 +3,39 @@ PDF Page Rotation Tool
 
 Drag-and-drop a PDF, preview pages in a 200×200 window,
 rotate clockwise or counter-clockwise, then save.
+
+Run with arguments for the batch mode (``python PDF_rotate.py --help``).
 """
 
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import shutil
 import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from os import path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
-import fitz
-from PIL import Image, ImageQt
-from PySide6.QtCore import Qt, QPoint
-from PySide6.QtGui import QPixmap, QImage
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QObject, QPoint, QSize, QTimer, Signal
+from PySide6.QtGui import QColor, QPixmap, QImage, QTransform
 from PySide6.QtWidgets import (
+    QAbstractItemView,
     QApplication,
+    QComboBox,
     QFileDialog,
     QFrame,
     QHBoxLayout,
     QLabel,
+    QLineEdit,
+    QListView,
     QMainWindow,
+    QMessageBox,
     QPushButton,
     QSizePolicy,
     QSpacerItem,
@@ -27,52 +44,508 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from display_lists import DisplayListCache
+from lazy_imports import lazy_import
+from orientation import detect_orientations
+from raster_cache import RasterCache
+from raster_utils import pixmap_to_qimage
+from settings_store import get_settings_store
+
+fitz = lazy_import("fitz")
+
+# display lists shared by the previews and thumbnails of the open document
+PREVIEW_DISPLAY_LIST_BUDGET = 64 * 1024 * 1024
+# <linux/fs.h>: share all blocks of one file with another (reflink)
+FICLONE = 0x40049409
+
 
 # ---------------------------------------------------------------------------
-# light wrappers over PyMuPDF + Pillow
+# light wrappers over PyMuPDF
 # ---------------------------------------------------------------------------
 
-def render_page_preview(pdf_path: str, page_index: int, rotation: int,
-                        preview_size: int = 200) -> Image.Image:
-    """Render one page fitted inside a ``preview_size × preview_size`` box
-    **preserving the original aspect ratio**, rotated by *rotation* degrees."""
-    doc = fitz.open(pdf_path)
-    page = doc.load_page(page_index)
-    
-    # cardinal rotation swaps width/height, so determine the "rotated" dimensions
-    rot = rotation % 360
+def _render_fitted(page, preview_size: int, renderer: Optional[RasterCache] = None):
+    """Render *page* unrotated so its longer side equals *preview_size*."""
+    # a quarter turn keeps the longer side, so the same raster serves all rotations
     pw, ph = page.rect.width, page.rect.height
-    if rot in (90, 270):
-        pw, ph = ph, pw
-
-    # scale so the longer side fits inside preview_size
     scale = preview_size / max(pw, ph, 1)
-    
-    # [FIXED] Pass scale for both X and Y axes. 
+
+    # [FIXED] Pass scale for both X and Y axes.
     # Passing a single argument creates a rotation matrix, not a scale matrix!
     mat = fitz.Matrix(scale, scale)
 
-    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csRGB)
-    img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-    doc.close()
+    if renderer is not None:
+        return renderer.get_pixmap(page, matrix=mat, colorspace=fitz.csRGB, alpha=False)
+    return page.get_pixmap(matrix=mat, colorspace=fitz.csRGB, alpha=False)
+
+
+class PageRenderCache:
+    """Keeps one document open and an LRU of fitted, unrotated page renders.
+
+    Renders are cached as ``QImage`` so a quarter-turn is a lossless
+    transpose in Qt rather than another trip through MuPDF.  The preview and
+    the thumbnails of a page replay one cached display list, and expensive
+    renders are kept on disk across sessions.  A single background thread
+    renders neighbouring pages ahead of navigation.  All
+    access to the document goes through one lock because a PyMuPDF document
+    must not be used from two threads at once.
+    """
+
+    def __init__(self, pdf_path: str, preview_size: int = 200, max_entries: int = 64):
+        self.preview_size = preview_size
+        self.max_entries = max_entries
+        self._doc = fitz.open(pdf_path)
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[int, QImage]" = OrderedDict()
+        self._display_lists = DisplayListCache(PREVIEW_DISPLAY_LIST_BUDGET)
+        # the on-disk renders shared with the comparison, in front of the display lists
+        settings = get_settings_store()
+        raster_budget = settings.get("RASTER_CACHE_MB", 1024) * 1024 * 1024 if settings.get("RASTER_CACHE", True) else 0
+        # hashing a large archive takes seconds: renders skip the disk until it is done off the GUI thread
+        self._rasters = RasterCache(raster_budget, self._display_lists, hash_on_demand=False)
+        if raster_budget > 0:
+            self._rasters.prepare(self._doc, background=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-prefetch")
+
+    @property
+    def page_count(self) -> int:
+        return self._doc.page_count
+
+    def get(self, page_index: int) -> QImage:
+        with self._lock:
+            img = self._cache.get(page_index)
+            if img is not None:
+                self._cache.move_to_end(page_index)
+                return img
+            return self._render_locked(page_index)
+
+    def render_thumbnail(self, page_index: int, size: int) -> QImage:
+        """Uncached low-resolution render for the thumbnail grid."""
+        with self._lock:
+            pix = _render_fitted(self._doc.load_page(page_index), size, self._rasters)
+        return pixmap_to_qimage(pix)
+
+    def prefetch(self, page_indices: Iterable[int]) -> None:
+        for page_index in page_indices:
+            if 0 <= page_index < self.page_count and page_index not in self._cache:
+                self._executor.submit(self._prefetch_one, page_index)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            self._cache.clear()
+            self._display_lists.clear()
+            self._rasters.forget(self._doc)
+            self._doc.close()
+
+    def _prefetch_one(self, page_index: int) -> None:
+        with self._lock:
+            if page_index not in self._cache and not self._doc.is_closed:
+                self._render_locked(page_index)
+
+    def _render_locked(self, page_index: int) -> QImage:
+        pix = _render_fitted(self._doc.load_page(page_index), self.preview_size, self._rasters)
+        img = pixmap_to_qimage(pix)
+        self._cache[page_index] = img
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return img
+
+
+def parse_page_ranges(spec: str, page_count: int) -> List[int]:
+    """Turn a 1-based range spec such as ``"1-3,7,10-"`` into sorted 0-based
+    page indices.  An empty spec or ``"all"`` selects every page."""
+    spec = (spec or "").strip().lower()
+    if spec in ("", "all"):
+        return list(range(page_count))
+
+    pages = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, _, last = part.partition("-")
+            start = int(first) if first.strip() else 1
+            stop = int(last) if last.strip() else max(page_count, start)
+        else:
+            start = stop = int(part)
+        if start < 1 or stop < start:
+            raise ValueError(f"Invalid page range: {part!r}")
+        pages.update(range(start - 1, min(stop, page_count)))
+    return sorted(pages)
+
+
+# degrees for every selected page, or a {0-based page index: degrees} map
+RotationSpec = Union[int, Mapping[int, int]]
+
+
+def _set_rotations(doc, rotation: RotationSpec, pages: Optional[Iterable[int]]) -> int:
+    """Add *rotation* to the selected pages of *doc*; return how many changed."""
+    if isinstance(rotation, Mapping):
+        items = rotation.items()
+    else:
+        indices = range(doc.page_count) if pages is None else pages
+        items = ((index, rotation) for index in indices)
+
+    changed = 0
+    for index, delta in items:
+        delta %= 360
+        if delta == 0:
+            continue
+        page = doc.load_page(index)
+        page.set_rotation((page.rotation + delta) % 360)
+        changed += 1
+    return changed
+
+
+def rotate_pdf(source_path: str, out_path: str, rotation: RotationSpec,
+               pages: Optional[Iterable[int]] = None) -> bool:
+    """Apply *rotation* (in degrees, multiple of 90) to *pages* (0-based,
+    default: all) and write the result to *out_path*.  *rotation* may also be
+    a per-page ``{page_index: degrees}`` map, in which case *pages* is ignored.
+
+    Only the ``/Rotate`` keys change, so the fast path never re-serializes the
+    document: when *out_path* is the source itself the changed page objects
+    are appended with an incremental save; otherwise the file is copied with
+    :func:`_clone_file` and the copy is saved incrementally.  Documents that
+    cannot be saved incrementally (e.g. repaired on open) fall back to a full
+    save.  If anything fails, no partial *out_path* is left behind.  Returns
+    ``True`` if the incremental path was taken.
+    """
+    if path.exists(out_path) and path.samefile(source_path, out_path):
+        return rotate_pdf_in_place(source_path, rotation, pages)
+
+    try:
+        _clone_file(source_path, out_path)
+        with fitz.open(out_path) as doc:
+            if doc.can_save_incrementally():
+                if _set_rotations(doc, rotation, pages):
+                    doc.saveIncr()
+                return True
+
+        # slow path: rewrite the whole document from the source
+        os.remove(out_path)
+        with fitz.open(source_path) as doc:
+            _set_rotations(doc, rotation, pages)
+            doc.save(out_path, garbage=1)
+    except BaseException:
+        try:
+            os.remove(out_path)
+        except OSError:
+            pass
+        raise
+    return False
+
+
+def _clone_file(source_path: str, out_path: str) -> None:
+    """Copy *source_path* to *out_path*, sharing its blocks where the file system can.
+
+    On Linux, Btrfs and XFS clone the file in constant time (reflink); other
+    file systems copy it inside the kernel with ``copy_file_range``.  Elsewhere,
+    and if both fail, this is a plain byte-for-byte copy, so the time grows
+    with the file size.
+    """
+    if sys.platform.startswith("linux"):
+        import fcntl
+
+        with open(source_path, "rb") as source, open(out_path, "wb") as target:
+            try:
+                fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+                return
+            except OSError:
+                pass
+            try:
+                remaining = os.fstat(source.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(source.fileno(), target.fileno(), remaining)
+                    if not copied:
+                        break
+                    remaining -= copied
+                if remaining == 0:
+                    return
+            except OSError:
+                pass
+    shutil.copyfile(source_path, out_path)
+
+
+def rotate_pdf_in_place(file_path: str, rotation: RotationSpec,
+                        pages: Optional[Iterable[int]] = None) -> bool:
+    """Apply *rotation* to *pages* of *file_path* (default: all), writing the file once.
+    Like :func:`rotate_pdf`, *rotation* may be a per-page map.
+
+    Uses an incremental save (only the changed page objects are appended)
+    when the document allows it; otherwise rewrites through a temporary file
+    in the same directory and atomically replaces the original.  Returns
+    ``True`` if the incremental path was taken.
+    """
+    doc = fitz.open(file_path)
+    try:
+        if not _set_rotations(doc, rotation, pages):
+            return True
+        if doc.can_save_incrementally():
+            doc.saveIncr()
+            return True
+
+        fd, temp_path = tempfile.mkstemp(suffix=".pdf", dir=path.dirname(path.abspath(file_path)))
+        os.close(fd)
+        try:
+            doc.save(temp_path, garbage=1)
+        except Exception:
+            os.remove(temp_path)
+            raise
+    finally:
+        doc.close()
 
-    rotated = img.rotate(-rot, expand=True, fillcolor=(255, 255, 255))
+    os.replace(temp_path, file_path)
+    return False
 
-    # centre inside a preview_size × preview_size canvas (letterboxed)
-    canvas = Image.new("RGB", (preview_size, preview_size), (255, 255, 255))
-    px = (preview_size - rotated.width) // 2
-    py = (preview_size - rotated.height) // 2
-    canvas.paste(rotated, (px, py))
-    return canvas
 
+# ---------------------------------------------------------------------------
+# thumbnail grid
+# ---------------------------------------------------------------------------
 
-def rotate_pdf(source_path: str, out_path: str, rotation: int):
-    """Apply *rotation* (in degrees, multiple of 90) to every page and save."""
-    doc = fitz.open(source_path)
-    for page in doc:
-        page.set_rotation((page.rotation + rotation) % 360)
-    doc.save(out_path)
-    doc.close()
+class ThumbnailRenderer(QObject):
+    """Renders thumbnails on a worker thread, most recent request first.
+
+    The view only asks for rows that are on screen, so serving the newest
+    request first keeps up with scrolling; requests beyond *max_pending* are
+    dropped and simply asked for again if their rows scroll back into view.
+    """
+
+    thumbnailReady = Signal(int, QImage)
+
+    def __init__(self, render_cache: PageRenderCache, size: int, max_pending: int = 64):
+        super().__init__()
+        self._render_cache = render_cache
+        self._size = size
+        self._max_pending = max_pending
+        self._stack: List[int] = []
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="thumbnail-renderer", daemon=True)
+        self._thread.start()
+
+    def request(self, page_index: int) -> None:
+        with self._cond:
+            if page_index in self._stack:
+                self._stack.remove(page_index)
+            self._stack.append(page_index)
+            del self._stack[:-self._max_pending]
+            self._cond.notify()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._stack.clear()
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stack and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                page_index = self._stack.pop()
+            try:
+                image = self._render_cache.render_thumbnail(page_index, self._size)
+            except Exception:
+                continue
+            self.thumbnailReady.emit(page_index, image)
+
+
+class ThumbnailModel(QAbstractListModel):
+    """Page list for a virtualized ``QListView``.
+
+    Thumbnails are rendered lazily when the view asks for a row's decoration
+    (i.e. only for visible rows), kept in a bounded LRU, and rotated in Qt
+    according to the shared per-page rotation map.
+    """
+
+    def __init__(self, thumb_size: int = 96, max_cached: int = 400, parent=None):
+        super().__init__(parent)
+        self.thumb_size = thumb_size
+        self.max_cached = max_cached
+        self._page_count = 0
+        self._rotations: Mapping[int, int] = {}
+        self._cache: "OrderedDict[int, QImage]" = OrderedDict()
+        self._renderer: ThumbnailRenderer | None = None
+        self._placeholder = QPixmap(thumb_size, thumb_size)
+        self._placeholder.fill(QColor("#F5F7FA"))
+
+    def set_document(self, render_cache: PageRenderCache, rotations: Mapping[int, int]) -> None:
+        self.beginResetModel()
+        self._stop_renderer()
+        self._cache.clear()
+        self._rotations = rotations
+        self._page_count = render_cache.page_count
+        self._renderer = ThumbnailRenderer(render_cache, self.thumb_size)
+        self._renderer.thumbnailReady.connect(self._on_thumbnail_ready)
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._stop_renderer()
+        self._cache.clear()
+        self._page_count = 0
+        self.endResetModel()
+
+    def rotations_changed(self, pages: Optional[Iterable[int]] = None) -> None:
+        """Refresh the captions and decorations of *pages* (default: all)."""
+        if not self._page_count:
+            return
+        if pages is None:
+            self.dataChanged.emit(self.index(0), self.index(self._page_count - 1))
+            return
+        for page_index in pages:
+            self.dataChanged.emit(self.index(page_index), self.index(page_index))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._page_count
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        page_index = index.row()
+        rotation = self._rotations.get(page_index, 0)
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{page_index + 1}  ↻{rotation}°" if rotation else str(page_index + 1)
+
+        if role == Qt.ItemDataRole.DecorationRole:
+            image = self._cache.get(page_index)
+            if image is None:
+                if self._renderer is not None:
+                    self._renderer.request(page_index)
+                return self._placeholder
+            self._cache.move_to_end(page_index)
+            if rotation:
+                image = image.transformed(QTransform().rotate(rotation))
+            return QPixmap.fromImage(image)
+
+        return None
+
+    def _on_thumbnail_ready(self, page_index: int, image: QImage) -> None:
+        if page_index >= self._page_count:
+            return
+        self._cache[page_index] = image
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        model_index = self.index(page_index)
+        self.dataChanged.emit(model_index, model_index, [Qt.ItemDataRole.DecorationRole])
+
+    def _stop_renderer(self) -> None:
+        if self._renderer is not None:
+            self._renderer.thumbnailReady.disconnect(self._on_thumbnail_ready)
+            self._renderer.stop()
+            self._renderer = None
+
+
+# ---------------------------------------------------------------------------
+# batch command line
+# ---------------------------------------------------------------------------
+
+def _rotate_job(source_path: str, out_path: str, rotation: int, page_spec: str,
+                auto: bool = False, detect_jobs: int = 1) -> Tuple[str, str, bool, float, Optional[int]]:
+    """Rotate one file; with *auto* each page is turned upright instead of by *rotation*.
+    The last item is the number of pages auto-orientation turned (``None`` otherwise)."""
+    started = time.perf_counter()
+    pages = None
+    if page_spec.strip().lower() not in ("", "all"):
+        with fitz.open(source_path) as doc:
+            pages = parse_page_ranges(page_spec, doc.page_count)
+    turned = None
+    if auto:
+        rotation = detect_orientations(source_path, pages, jobs=detect_jobs)
+        turned = len(rotation)
+    incremental = rotate_pdf(source_path, out_path, rotation, pages)
+    return source_path, out_path, incremental, time.perf_counter() - started, turned
+
+
+def _collect_pdfs(inputs: Iterable[str], recursive: bool, output_suffix: str = "") -> List[str]:
+    """PDFs named in *inputs* or found in its folders; folder scans skip the
+    copies an earlier run wrote with *output_suffix*."""
+    files = []
+    for item in inputs:
+        if path.isdir(item):
+            pattern = path.join(item, "**", "*.pdf") if recursive else path.join(item, "*.pdf")
+            files.extend(
+                file_path
+                for file_path in sorted(glob.glob(pattern, recursive=recursive))
+                if not output_suffix or not path.splitext(path.basename(file_path))[0].endswith(output_suffix)
+            )
+        else:
+            files.append(item)
+    return files
+
+
+def run_batch(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Rotate pages of many PDFs in parallel (incremental save, no full rewrite)."
+    )
+    parser.add_argument("inputs", nargs="+", help="PDF files or folders containing PDFs")
+    parser.add_argument("-r", "--rotate", type=int, default=90, help="degrees, multiple of 90 (default: 90)")
+    parser.add_argument("-p", "--pages", default="all", help='1-based page ranges, e.g. "1-3,7,10-" (default: all)')
+    parser.add_argument("--auto", action="store_true",
+                        help="detect each page's orientation and turn it upright (replaces --rotate)")
+    parser.add_argument("--recursive", action="store_true", help="descend into sub-folders")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--in-place", action="store_true", help="modify the input files themselves")
+    target.add_argument("-o", "--output-dir", help="write rotated copies into this folder")
+    parser.add_argument("--suffix", default="_rotated", help="file name suffix for copies (default: _rotated)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="parallel worker processes")
+    args = parser.parse_args(argv)
+
+    if args.rotate % 90:
+        parser.error("--rotate must be a multiple of 90")
+
+    jobs = []
+    for source_path in _collect_pdfs(args.inputs, args.recursive, "" if args.in_place else args.suffix):
+        if args.in_place:
+            out_path = source_path
+        else:
+            base, ext = path.splitext(path.basename(source_path))
+            out_dir = args.output_dir or path.dirname(source_path)
+            out_path = path.join(out_dir, f"{base}{args.suffix}{ext}")
+        jobs.append((source_path, out_path))
+
+    if not jobs:
+        print("No PDF files found.", file=sys.stderr)
+        return 1
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    def report(result):
+        source_path, out_path, incremental, seconds, turned = result
+        mode = "incremental" if incremental else "full rewrite"
+        detail = f", {turned} page(s) turned upright" if turned is not None else ""
+        print(f"OK      {source_path} -> {out_path}  ({mode}{detail}, {seconds:.2f}s)")
+
+    if len(jobs) == 1:
+        # a single document: spend the workers on its pages instead
+        source_path, out_path = jobs[0]
+        try:
+            report(_rotate_job(source_path, out_path, args.rotate, args.pages, args.auto, args.jobs))
+        except Exception as error:
+            print(f"FAILED  {source_path}: {error}", file=sys.stderr)
+            return 1
+        return 0
+
+    failures = 0
+    with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(jobs)))) as executor:
+        futures = {
+            executor.submit(_rotate_job, source_path, out_path, args.rotate, args.pages, args.auto): source_path
+            for source_path, out_path in jobs
+        }
+        for future in as_completed(futures):
+            try:
+                report(future.result())
+            except Exception as error:
+                failures += 1
+                print(f"FAILED  {futures[future]}: {error}", file=sys.stderr)
+
+    return 1 if failures else 0
 
 
 # ---------------------------------------------------------------------------
@@ -137,14 +610,17 @@ class RotateWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("PDF Rotation Tool")
-        self.setGeometry(200, 200, 420, 480)
+        self.setGeometry(200, 200, 820, 560)
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
 
         # ---- state ----
         self._pdf_path: str | None = None
+        self._render_cache: PageRenderCache | None = None
         self._page_count: int = 0
         self._current_page: int = 0
-        self._rotation: int = 0  # cumulative rotation in degrees (0 | 90 | 180 | 270)
+        # extra rotation per 0-based page index in degrees (0 | 90 | 180 | 270); absent means 0
+        self._page_rotations: Dict[int, int] = {}
+        self._redraw_pending: bool = False
 
         # ---- title bar ----
         self.title_bar = TitleBar(self)
@@ -154,9 +630,12 @@ class RotateWindow(QMainWindow):
         # ---- central widget ----
         central = QWidget()
         self.setCentralWidget(central)
-        root = QVBoxLayout(central)
-        root.setContentsMargins(16, 16, 16, 16)
+        outer = QHBoxLayout(central)
+        outer.setContentsMargins(16, 16, 16, 16)
+        outer.setSpacing(16)
+        root = QVBoxLayout()
         root.setSpacing(10)
+        outer.addLayout(root)
 
         # ----- drop zone / file picker -----
         self.drop_btn = QPushButton("Drop PDF here\nor click to browse")
@@ -210,6 +689,20 @@ class RotateWindow(QMainWindow):
         )
         root.addWidget(self.rot_label)
 
+        # ----- which pages the buttons act on -----
+        scope_row = QHBoxLayout()
+        self.scope_combo = QComboBox()
+        self.scope_combo.addItems(["All pages", "Current page", "Selected pages", "Page range"])
+        self.scope_combo.currentTextChanged.connect(
+            lambda text: self.range_edit.setEnabled(text == "Page range")
+        )
+        scope_row.addWidget(self.scope_combo)
+        self.range_edit = QLineEdit()
+        self.range_edit.setPlaceholderText("e.g. 1-3, 7, 10-")
+        self.range_edit.setEnabled(False)
+        scope_row.addWidget(self.range_edit)
+        root.addLayout(scope_row)
+
         # ----- rotate buttons -----
         rot_row = QHBoxLayout()
 
@@ -241,6 +734,24 @@ class RotateWindow(QMainWindow):
         ))
         action_row.addWidget(self.save_btn)
         root.addLayout(action_row)
+        root.addStretch(1)
+
+        # ----- thumbnail grid (virtualized: only visible rows are rendered) -----
+        self.thumb_model = ThumbnailModel(96, parent=self)
+        self.thumb_view = QListView()
+        self.thumb_view.setViewMode(QListView.ViewMode.IconMode)
+        self.thumb_view.setIconSize(QSize(96, 96))
+        self.thumb_view.setGridSize(QSize(116, 130))
+        self.thumb_view.setUniformItemSizes(True)
+        self.thumb_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.thumb_view.setMovement(QListView.Movement.Static)
+        self.thumb_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.thumb_view.setModel(self.thumb_model)
+        self.thumb_view.clicked.connect(lambda index: self._go_to_page(index.row()))
+        self.thumb_view.setStyleSheet(
+            "QListView { background-color: #FFFFFF; border: 1px solid #E0E6ED; border-radius: 8px; }"
+        )
+        outer.addWidget(self.thumb_view, 1)
 
         # ---- global stylesheet ----
         self._apply_stylesheet()
@@ -315,13 +826,18 @@ class RotateWindow(QMainWindow):
 
     def _load_pdf(self, file_path: str):
         """Open a PDF and reset state for the new file."""
+        # opened first: if the file cannot be read, the current document stays loaded
+        render_cache = PageRenderCache(file_path, 200)
+        self.thumb_model.clear()
+        if self._render_cache is not None:
+            self._render_cache.close()
         self._pdf_path = file_path
-        doc = fitz.open(file_path)
-        self._page_count = doc.page_count
-        doc.close()
+        self._render_cache = render_cache
+        self._page_count = render_cache.page_count
 
         self._current_page = 0
-        self._rotation = 0
+        self._page_rotations = {}
+        self.thumb_model.set_document(self._render_cache, self._page_rotations)
         self._update_ui_for_pdf()
         self._redraw_preview()
         self._enable_controls(True)
@@ -351,35 +867,64 @@ class RotateWindow(QMainWindow):
     def _prev_page(self):
         if self._page_count == 0:
             return
-        self._current_page = (self._current_page - 1) % self._page_count
-        self._redraw_preview()
-        self._update_page_label()
+        self._go_to_page((self._current_page - 1) % self._page_count)
 
     def _next_page(self):
         if self._page_count == 0:
             return
-        self._current_page = (self._current_page + 1) % self._page_count
-        self._redraw_preview()
+        self._go_to_page((self._current_page + 1) % self._page_count)
+
+    def _go_to_page(self, page_index: int):
+        self._current_page = page_index
+        self._schedule_redraw()
         self._update_page_label()
+        self._update_rot_label()
+        self.thumb_view.scrollTo(self.thumb_model.index(page_index))
 
     # ------------------------------------------------------------------ #
     #  rotation                                                          #
     # ------------------------------------------------------------------ #
 
-    def _rotate_cw(self):
-        self._rotation = (self._rotation + 90) % 360
-        self._redraw_preview()
+    def _target_pages(self) -> Optional[List[int]]:
+        """Pages the rotate/reset buttons act on; ``None`` means every page."""
+        scope = self.scope_combo.currentText()
+        if scope == "Current page":
+            return [self._current_page]
+        if scope == "Selected pages":
+            rows = sorted(index.row() for index in self.thumb_view.selectionModel().selectedIndexes())
+            return rows or [self._current_page]
+        if scope == "Page range":
+            try:
+                pages = parse_page_ranges(self.range_edit.text(), self._page_count)
+            except ValueError:
+                self.range_edit.setStyleSheet("border: 1px solid #FF5252;")
+                return []
+            self.range_edit.setStyleSheet("")
+            return pages
+        return None
+
+    def _apply_rotation(self, delta: Optional[int]):
+        """Add *delta* degrees to the targeted pages, or reset them when ``None``."""
+        pages = self._target_pages()
+        indices = range(self._page_count) if pages is None else pages
+        for page_index in indices:
+            rotation = 0 if delta is None else (self._page_rotations.get(page_index, 0) + delta) % 360
+            if rotation:
+                self._page_rotations[page_index] = rotation
+            else:
+                self._page_rotations.pop(page_index, None)
+        self.thumb_model.rotations_changed(pages)
+        self._schedule_redraw()
         self._update_rot_label()
 
+    def _rotate_cw(self):
+        self._apply_rotation(90)
+
     def _rotate_ccw(self):
-        self._rotation = (self._rotation - 90) % 360
-        self._redraw_preview()
-        self._update_rot_label()
+        self._apply_rotation(-90)
 
     def _reset_rotation(self):
-        self._rotation = 0
-        self._redraw_preview()
-        self._update_rot_label()
+        self._apply_rotation(None)
 
     # ------------------------------------------------------------------ #
     #  save                                                              #
@@ -389,36 +934,70 @@ class RotateWindow(QMainWindow):
         if not self._pdf_path:
             return
         base, _ = path.splitext(self._pdf_path)
-        default_name = f"{base}_rotated_{self._rotation}.pdf"
+        rotations = set(self._page_rotations.values())
+        if len(self._page_rotations) == self._page_count and len(rotations) == 1:
+            default_name = f"{base}_rotated_{rotations.pop()}.pdf"
+        else:
+            default_name = f"{base}_rotated.pdf"
         out_path, _ = QFileDialog.getSaveFileName(
             self, "Save Rotated PDF", default_name, "PDF Files (*.pdf)"
         )
-        if out_path:
-            rotate_pdf(self._pdf_path, out_path, self._rotation)
-            # update the drop-zone label to show the new file name
-            self.drop_btn.setText(
-                f"Saved: {path.basename(out_path)}"
-            )
+        if not out_path:
+            return
+        in_place = path.exists(out_path) and path.samefile(self._pdf_path, out_path)
+        try:
+            rotate_pdf(self._pdf_path, out_path, dict(self._page_rotations))
+        except Exception as exc:
+            QMessageBox.critical(self, "Error", f"Failed to save the rotated PDF:\n{exc}")
+            return
+        if in_place:
+            # the file now holds the rotations: reopen it so they are not pending (and applied) again
+            self._load_pdf(self._pdf_path)
+        # update the drop-zone label to show the new file name
+        self.drop_btn.setText(
+            f"Saved: {path.basename(out_path)}"
+        )
 
     # ------------------------------------------------------------------ #
     #  preview rendering                                                 #
     # ------------------------------------------------------------------ #
 
+    def _schedule_redraw(self):
+        """Coalesce redraw requests: a burst of clicks renders once."""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            QTimer.singleShot(0, self._redraw_preview)
+
     def _redraw_preview(self):
+        self._redraw_pending = False
         if not self._pdf_path:
             self.preview_label.clear()
             return
         try:
-            pil_img = render_page_preview(
-                self._pdf_path, self._current_page, self._rotation, 200
-            )
-            data = pil_img.tobytes("raw", "RGB")
-            qt_img = QImage(data, pil_img.width, pil_img.height,
-                            pil_img.width * 3, QImage.Format.Format_RGB888)
+            qt_img = self._render_cache.get(self._current_page)
+            rotation = self._page_rotations.get(self._current_page, 0)
+            if rotation:
+                # multiples of 90° are an exact pixel transpose in Qt
+                qt_img = qt_img.transformed(QTransform().rotate(rotation))
+            # the label centres the pixmap on its white background (letterbox)
             pixmap = QPixmap.fromImage(qt_img)
             self.preview_label.setPixmap(pixmap)
         except Exception as exc:
             self.preview_label.setText(f"Preview error:\n{exc}")
+            return
+
+        # warm the neighbours so Prev / Next hit the cache
+        self._render_cache.prefetch((
+            (self._current_page + 1) % self._page_count,
+            (self._current_page - 1) % self._page_count,
+        ))
+
+    def closeEvent(self, event):
+        self.thumb_model.clear()
+        if self._render_cache is not None:
+            self._render_cache.close()
+            self._render_cache = None
+        super().closeEvent(event)
 
     # ------------------------------------------------------------------ #
     #  UI helpers                                                        #
@@ -438,7 +1017,8 @@ class RotateWindow(QMainWindow):
         )
 
     def _update_rot_label(self):
-        self.rot_label.setText(f"Rotation: {self._rotation}°")
+        rotation = self._page_rotations.get(self._current_page, 0)
+        self.rot_label.setText(f"Rotation: {rotation}° (page {self._current_page + 1})")
 
     def _enable_controls(self, enabled: bool):
         self.prev_btn.setEnabled(enabled)
@@ -454,6 +1034,11 @@ class RotateWindow(QMainWindow):
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
+    # any command-line arguments select the batch mode, e.g.
+    #   python PDF_rotate.py --rotate 90 --pages 1-3 --in-place scans/
+    if len(sys.argv) > 1:
+        sys.exit(run_batch())
+
     app = QApplication([])
     app.setStyle(QStyleFactory.create("Fusion"))
 
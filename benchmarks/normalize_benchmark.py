@@ -0,0 +1,104 @@
+"""
+Token normalization benchmark.
+
+Compares the original per-word normalization (``strip``, ``lower`` and two
+``re.sub`` calls) with the compiled pipeline of ``text_normalize`` — called
+per word and in bulk per page — and checks that the default rules produce
+identical output.
+
+Words come from a PDF when one is given, otherwise from a synthetic mix of
+Latin, CJK, full-width, punctuation and whitespace tokens::
+
+    python benchmarks/normalize_benchmark.py
+    python benchmarks/normalize_benchmark.py --pdf drawing.pdf --runs 10
+"""
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from os import path
+
+REPO_ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from text_normalize import DEFAULT_RULES, get_normalizer  # noqa: E402
+
+WORDS_PER_PAGE = 400
+
+
+def legacy_normalize(text):
+    text = text.strip()
+    text = text.lower()
+    text = re.sub(r"[\s\t\r\n]+", "", text)
+    text = re.sub(r"[\.,;:()\[\]{}<>\-_=+`~\"']+", "", text)
+    return text
+
+
+def _synthetic_pages(count, seed=0):
+    rng = random.Random(seed)
+    alphabet = (
+        "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+        ".,;:()[]{}<>-_=+`~\"'!?/#%&*"
+        "ÄÖÜßÉİΣσς"
+        "图纸修订版本尺寸公差"
+        "ＡＢＣａｂｃ０１２（）"
+        " \t 　"
+    )
+    return [
+        ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12))) for _ in range(WORDS_PER_PAGE)]
+        for _ in range(count)
+    ]
+
+
+def _pdf_pages(file_path):
+    import fitz
+
+    with fitz.open(file_path) as doc:
+        return [[word[4] for word in page.get_text("words") if word[4].strip()] for page in doc]
+
+
+def _time(function, pages, runs):
+    timings = []
+    result = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = function(pages)
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark token normalization")
+    parser.add_argument("--pdf", help="take the words from this PDF instead of synthetic pages")
+    parser.add_argument("--pages", type=int, default=200, help="synthetic pages (default: 200)")
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per variant (default: 5)")
+    args = parser.parse_args()
+
+    pages = _pdf_pages(args.pdf) if args.pdf else _synthetic_pages(args.pages)
+    normalizer = get_normalizer(DEFAULT_RULES)
+    variants = {
+        "legacy": lambda data: [[legacy_normalize(word) for word in words] for words in data],
+        "per-word": lambda data: [[normalizer(word) for word in words] for words in data],
+        "per-page": lambda data: [normalizer.normalize_many(words) for words in data],
+    }
+
+    word_count = sum(len(words) for words in pages)
+    print(f"{len(pages)} pages, {word_count} words, rules={','.join(DEFAULT_RULES)}")
+    reference = None
+    for label, function in variants.items():
+        result, timings = _time(function, pages, args.runs)
+        if reference is None:
+            reference = result
+        elif result != reference:
+            raise SystemExit(f"{label}: output differs from the legacy normalization")
+        median = statistics.median(timings)
+        print(f"{label:<9} median={median:8.2f} ms  min={min(timings):8.2f} ms  "
+              f"{median * 1e6 / max(word_count, 1):8.1f} ns/word")
+    print("output identical to the legacy normalization")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Character-level highlight check.
+
+Builds a two-page pair in memory in which several numbers on the same page
+change by a single digit (``12.50`` → ``12.55``), runs the text diff with
+character refinement and checks that every replaced number is highlighted by
+a box narrower than the word, not by the whole word::
+
+    python benchmarks/refine_check.py
+"""
+
+import os
+import sys
+from os import path
+
+REPO_ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import fitz  # noqa: E402
+
+from py_PDF_compare_gui import CompareThread  # noqa: E402
+
+CHANGES = [("12.50", "12.55"), ("7.25", "7.26"), ("310.0", "318.0")]
+
+
+def _document(values):
+    doc = fitz.open()
+    for page_number in range(2):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Sheet {page_number + 1} general notes and dimensions", fontsize=11)
+        for line, value in enumerate(values):
+            page.insert_text((72, 120 + 40 * line), f"Dimension {line + 1} is {value} mm on this sheet", fontsize=11)
+    return doc
+
+
+def main():
+    old_doc = _document([old for old, _ in CHANGES])
+    new_doc = _document([new for _, new in CHANGES])
+    engine = CompareThread([], None)
+    # no extraction is cached for documents made in memory
+    diff_entries, _ = engine._diff_documents(old_doc, new_doc, set())
+
+    replaced = [entry for entry in diff_entries if entry["type"] == "replace"]
+    if len(replaced) != 2 * len(CHANGES):
+        raise SystemExit(f"expected {2 * len(CHANGES)} replacements, found {len(replaced)}")
+    for entry in replaced:
+        for side in ("old", "new"):
+            page_index = entry[f"{side}_page"] - 1
+            word = next(
+                fitz.Rect(word[:4])
+                for word in (old_doc if side == "old" else new_doc)[page_index].get_text("words")
+                if word[4] == entry[f"{side}_desc"]
+            )
+            rects = entry[f"{side}_rects"].get(page_index, [])
+            if not rects or any(rect.width >= word.width - 0.5 for rect in rects):
+                raise SystemExit(
+                    f"page {page_index + 1}: {entry[f'{side}_desc']!r} is highlighted as a whole word, not by character"
+                )
+    print(f"{len(replaced)} replacement(s) on {len(replaced) // len(CHANGES)} page(s) highlighted by character")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Startup-time benchmark for the PDF Toolkit GUI.
+
+Launches the application repeatedly with ``PDF_TOOLKIT_STARTUP_BENCHMARK`` set;
+in that mode ``main.py`` prints how long it took from its first import to the
+first painted frame and exits immediately.
+
+* **cold** — first launch with an empty bytecode cache (a fresh
+  ``PYTHONPYCACHEPREFIX``), so every module is compiled from source.
+* **warm** — subsequent launches reusing that bytecode cache.
+
+Run from source::
+
+    python benchmarks/startup_benchmark.py --runs 10
+
+Run against a PyInstaller build (``resource_path`` then resolves through
+``sys._MEIPASS``; the first launch of a one-file build also pays unpacking)::
+
+    python benchmarks/startup_benchmark.py --frozen dist/main.exe --runs 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from os import path
+
+REPO_ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+BENCHMARK_ENV = "PDF_TOOLKIT_STARTUP_BENCHMARK"
+
+
+def _launch(command, env):
+    started = time.perf_counter()
+    result = subprocess.run(command, env=env, capture_output=True, text=True, timeout=120)
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    report = {"WALL_MS": wall_ms}
+    for line in result.stdout.splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            report[key.strip()] = value.strip()
+    if "STARTUP_MS" not in report:
+        raise RuntimeError(f"Application did not report startup time:\n{result.stdout}\n{result.stderr}")
+    report["STARTUP_MS"] = float(report["STARTUP_MS"])
+    return report
+
+
+def _summarize(label, reports):
+    if not reports:
+        return
+    startup = [report["STARTUP_MS"] for report in reports]
+    wall = [report["WALL_MS"] for report in reports]
+    print(
+        f"{label:<6} runs={len(reports):<3} "
+        f"first-frame median={statistics.median(startup):8.1f} ms  min={min(startup):8.1f} ms  "
+        f"process wall median={statistics.median(wall):8.1f} ms"
+    )
+
+
+def run_benchmark(runs: int, frozen_executable=None, offscreen=False):
+    env = dict(os.environ)
+    env[BENCHMARK_ENV] = "1"
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+
+    if frozen_executable:
+        command = [path.abspath(frozen_executable)]
+    else:
+        command = [sys.executable, path.join(REPO_ROOT, "main.py")]
+
+    with tempfile.TemporaryDirectory(prefix="pdf-toolkit-pycache-") as pycache_dir:
+        if not frozen_executable:
+            env["PYTHONPYCACHEPREFIX"] = pycache_dir
+
+        cold = [_launch(command, env)]
+        warm = [_launch(command, env) for _ in range(max(runs - 1, 0))]
+
+    mode = "frozen" if frozen_executable else "source"
+    print(f"Startup benchmark ({mode}: {' '.join(command)})")
+    print(f"resource_path base: {cold[0].get('RESOURCE_BASE', '?')}  (frozen={cold[0].get('FROZEN', '?')})")
+    print(f"PyMuPDF imported before first frame: {'yes' if cold[0].get('FITZ_LOADED') == '1' else 'no'}")
+    _summarize("cold", cold)
+    _summarize("warm", warm)
+    return cold, warm
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="total launches (1 cold + N-1 warm)")
+    parser.add_argument("--frozen", metavar="EXE", help="benchmark a PyInstaller-built executable instead of main.py")
+    parser.add_argument("--offscreen", action="store_true", help="use Qt's offscreen platform (CI / headless)")
+    args = parser.parse_args(argv)
+    run_benchmark(args.runs, args.frozen, args.offscreen)
+
+
+if __name__ == "__main__":
+    main()
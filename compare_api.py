@@ -0,0 +1,216 @@
+"""
+Library API of the comparison engine.
+
+The GUI produces a compiled PDF; pipelines often only need to know whether
+anything changed, or the first few changes.  :func:`iter_differences` yields
+the diff entries lazily while the documents are being read, so a caller that
+stops early never extracts the rest of the documents and nothing is ever
+rendered::
+
+    from compare_api import has_differences, iter_differences, render_comparison
+
+    if has_differences("plan_A.pdf", "plan_B.pdf"):
+        first = list(itertools.islice(iter_differences("plan_A.pdf", "plan_B.pdf"), 10))
+        render_comparison("plan_A.pdf", "plan_B.pdf", first, "plan_B review.pdf")
+
+Entries are the dictionaries of the engine: ``type`` (``replace``,
+``delete``, ``add``, ``move``, ``raster``, ``vector`` or ``image``),
+``old_desc``/``new_desc``, 1-based ``old_page``/``new_page`` (``"无"`` for a
+side without content) and ``old_rects``/``new_rects`` mapping 0-based page
+indices to ``fitz.Rect`` lists in unrotated page space.
+
+The documents are read in windows of ``window_pages`` pages.  Text is
+diffed over the tokens read so far, and changes are only reported up to the
+last long run of equal tokens; everything after it is carried into the next
+window, so edits that reflow across a window boundary are still found
+whole.  Moves are detected within the reported part of a window: a block
+moved further than that is reported as a deletion and an addition.
+``window_pages=0`` reads both documents at once and gives exactly the
+entries of the GUI.
+
+Options are the settings of the Settings dialog, as keyword arguments
+(``move_min_tokens=0``, ``vector_diff=False``, ``dpi_level=300``, ...);
+anything not given comes from ``settings.json``.  The on-disk caches are
+shared with the GUI.  Files larger than ``EAGER_DIGEST_BYTES`` are only
+hashed when both have the same size: hashing two large scans costs more
+than finding their first difference, so such comparisons bypass the word
+cache.
+"""
+
+from __future__ import annotations
+
+import os
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from lazy_imports import lazy_import
+from move_detection import token_ids
+from page_fingerprint import PageComparer, file_digest, identical_pages
+from word_cache import page_words
+
+fitz = lazy_import("fitz")
+
+DEFAULT_WINDOW_PAGES = 4
+# a run of equal tokens this long is trusted as an alignment point between windows
+ANCHOR_TOKENS = 16
+# larger files of different sizes are not hashed up front
+EAGER_DIGEST_BYTES = 64 * 1024 * 1024
+
+
+def _engine(options: Dict[str, Any], rotations: Sequence[int]):
+    """A headless comparison engine with *options* applied over the saved settings."""
+    # imported here: importing the engine pulls in Qt
+    from py_PDF_compare_gui import CompareThread
+
+    engine = CompareThread([], None, rotations=list(rotations))
+    allowed = (set(engine._diff_settings(0, 1)) | set(engine._output_settings()) | {"OUTPUT_PATH"}) - {"ROTATIONS"}
+    for name, value in options.items():
+        key = name.upper()
+        if key not in allowed:
+            raise TypeError(f"unknown comparison option: {name!r}")
+        if key == "PAGE_SIZE":
+            engine.PAGE_SIZE_NAME = value
+            value = tuple(engine.PAGE_SIZES.get(value, [None, None]))
+        elif key == "NORMALIZE_RULES":
+            value = tuple(value)
+        setattr(engine, key, value)
+    return engine
+
+
+def _orient(engine, old_doc, new_doc, old_path: str, new_path: str) -> None:
+    engine._orient(old_doc, old_path, engine.rotations[0], "old")
+    engine._orient(new_doc, new_path, engine.rotations[1], "new")
+
+
+def _identical_files(engine, old_path: str, new_path: str) -> Tuple[bool, Optional[bytes], Optional[bytes]]:
+    """Whether the files are byte-identical, and their digests (``None`` if not computed)."""
+    old_size, new_size = os.path.getsize(old_path), os.path.getsize(new_path)
+    if old_size != new_size and max(old_size, new_size) > EAGER_DIGEST_BYTES:
+        return False, None, None
+    old_digest, new_digest = file_digest(old_path), file_digest(new_path)
+    same_rotation = engine.AUTO_ORIENT or engine.rotations[0] % 360 == engine.rotations[1] % 360
+    return same_rotation and old_digest == new_digest, old_digest, new_digest
+
+
+def _committed(opcodes: List[Tuple[str, int, int, int, int]], final: bool) -> Tuple[int, int, int]:
+    """Number of opcodes safe to report and the old/new token counts they cover.
+
+    Opcodes up to the last long equal run are final: later tokens may still
+    align with text of the next window.
+    """
+    if final:
+        return len(opcodes), opcodes[-1][2] if opcodes else 0, opcodes[-1][4] if opcodes else 0
+    for index in range(len(opcodes) - 1, -1, -1):
+        tag, i1, i2, j1, j2 = opcodes[index]
+        if tag == "equal" and i2 - i1 >= ANCHOR_TOKENS:
+            return index + 1, i2, j2
+    return 0, 0, 0
+
+
+def iter_differences(old_path: str, new_path: str, *, window_pages: int = DEFAULT_WINDOW_PAGES,
+                     rotations: Sequence[int] = (0, 0), **options: Any) -> Iterator[Dict]:
+    """Yield the differences between two PDF files as they are found.
+
+    *rotations* are extra quarter turns applied in memory to every page of
+    the old and the new document (ignored with ``auto_orient=True``).
+    """
+    engine = _engine(options, rotations)
+    identical, old_digest, new_digest = _identical_files(engine, old_path, new_path)
+    if identical:
+        return
+
+    with fitz.open(old_path) as old_doc, fitz.open(new_path) as new_doc, engine.display_lists:
+        for doc, digest in ((old_doc, old_digest), (new_doc, new_digest)):
+            if digest is not None:
+                engine.rasters.register(doc, digest)
+        _orient(engine, old_doc, new_doc, old_path, new_path)
+        pages = PageComparer(old_doc, new_doc)
+        normalizer = engine._normalizer()
+        words = {"old": engine.words.load(old_digest), "new": engine.words.load(new_digest)}
+        extracted = {"old": False, "new": False}
+
+        def page_tokens(side: str, doc, page_index: int) -> List[Dict]:
+            if page_index >= doc.page_count:
+                return []
+            page_word_list = words[side].get(page_index)
+            if page_word_list is None:
+                page_word_list = words[side][page_index] = page_words(doc.load_page(page_index))
+                extracted[side] = True
+            return engine._tokens_from_words(page_word_list, page_index, normalizer)
+
+        total_pages = max(old_doc.page_count, new_doc.page_count)
+        step = window_pages if window_pages > 0 else total_pages
+        old_tokens: List[Dict] = []
+        new_tokens: List[Dict] = []
+        try:
+            for window_start in range(0, total_pages, max(step, 1)):
+                window = range(window_start, min(window_start + step, total_pages))
+                # byte-identical pages are skipped on both sides, as in the GUI
+                compared = [page_index for page_index in window if not pages.identical(page_index)]
+                old_text_pages, new_text_pages = set(), set()
+                for page_index in compared:
+                    old_page_tokens = page_tokens("old", old_doc, page_index)
+                    new_page_tokens = page_tokens("new", new_doc, page_index)
+                    old_tokens.extend(old_page_tokens)
+                    new_tokens.extend(new_page_tokens)
+                    if old_page_tokens:
+                        old_text_pages.add(page_index)
+                    if new_page_tokens:
+                        new_text_pages.add(page_index)
+
+                final = window.stop >= total_pages
+                old_ids, new_ids = token_ids(
+                    [token["norm"] for token in old_tokens],
+                    [token["norm"] for token in new_tokens],
+                )
+                opcodes = SequenceMatcher(None, old_ids, new_ids, autojunk=False).get_opcodes()
+                count, old_end, new_end = _committed(opcodes, final)
+                if count:
+                    entries = engine._opcode_entries(
+                        old_tokens[:old_end], new_tokens[:new_end], old_ids[:old_end], new_ids[:new_end], opcodes[:count]
+                    )
+                    engine._refine_replacements(entries, old_doc, new_doc)
+                    yield from entries
+                    old_tokens, new_tokens = old_tokens[old_end:], new_tokens[new_end:]
+
+                shared_pages = [page_index for page_index in compared
+                                if page_index < min(old_doc.page_count, new_doc.page_count)]
+                yield from engine._build_page_entries(old_doc, new_doc, shared_pages, old_text_pages, new_text_pages)
+        finally:
+            # pages read before an early stop are kept for the next comparison
+            for side, digest in (("old", old_digest), ("new", new_digest)):
+                if extracted[side]:
+                    engine.words.store(digest, words[side])
+
+
+def has_differences(old_path: str, new_path: str, **options: Any) -> bool:
+    """Whether the two files differ, reading no further than the first difference."""
+    return next(iter_differences(old_path, new_path, **options), None) is not None
+
+
+def render_comparison(old_path: str, new_path: str, entries: Optional[List[Dict]] = None,
+                      output_path: Optional[str] = None, *, rotations: Sequence[int] = (0, 0),
+                      **options: Any) -> Optional[str]:
+    """Write the comparison PDF of the two files and return its path.
+
+    *entries* are the differences to mark, e.g. a filtered or truncated list
+    from :func:`iter_differences`; by default all of them are computed.
+    Without *output_path* the file is named like the GUI's output.  Returns
+    ``None`` without writing anything if the files are identical.
+    """
+    if entries is None:
+        entries = list(iter_differences(old_path, new_path, window_pages=0, rotations=rotations, **options))
+    engine = _engine(options, rotations)
+    if _identical_files(engine, old_path, new_path)[0]:
+        return None
+
+    main_path = new_path if engine.MAIN_PAGE == "New Document" else old_path
+    with fitz.open(old_path) as old_doc, fitz.open(new_path) as new_doc, engine.display_lists:
+        _orient(engine, old_doc, new_doc, old_path, new_path)
+        unchanged_pages = identical_pages(old_doc, new_doc)
+        engine.statistics["NUM_PAGES"] = max(old_doc.page_count, new_doc.page_count)
+        engine.statistics["IDENTICAL_PAGES"] = len(unchanged_pages)
+        all_highlights = engine._collect_highlights(entries)
+        return engine._write_output(
+            old_doc, new_doc, old_path, new_path, main_path, entries, all_highlights, unchanged_pages, output_path
+        )
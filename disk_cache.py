@@ -0,0 +1,184 @@
+"""
+Size-bounded on-disk caches.
+
+A :class:`DiskCache` is a directory of plain files named by key, sharded
+into subdirectories by the first two characters of the key.  It is safe to
+share between threads and processes without locks:
+
+* entries are written to a temporary file in the same directory and moved
+  into place with ``os.replace``, so a reader sees either the whole entry or
+  none of it, and two writers of the same key simply race to install equal
+  content;
+* recency is the file's modification time, refreshed on every hit, so the
+  least recently used entries are found from a directory scan;
+* an entry evicted (or being replaced) under a reader turns into a miss.
+
+The total size is tracked approximately in memory and the directory is only
+scanned when that estimate exceeds the budget; eviction then removes the
+oldest entries until the cache is back to 90 % of its budget.
+
+Caches live under :func:`cache_root`, in the user's cache directory, since
+the program itself may be installed read-only.  A cache is only ever an
+optimization: a write that fails (read-only or full disk) is reported once
+on stderr and the entry is simply not stored.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from os import path
+from typing import Optional
+
+# eviction stops below this share of the budget, so it does not rerun on every write
+EVICT_TO = 0.9
+STALE_TEMPORARY_AGE = 3600.0
+CACHE_DIRNAME = "PDF-Comparison"
+
+
+def cache_root() -> str:
+    """Directory holding all on-disk caches, in the per-user cache directory of the platform."""
+    if sys.platform == "win32":
+        base_dir = os.environ.get("LOCALAPPDATA") or path.expanduser(path.join("~", "AppData", "Local"))
+    elif sys.platform == "darwin":
+        base_dir = path.expanduser(path.join("~", "Library", "Caches"))
+    else:
+        base_dir = os.environ.get("XDG_CACHE_HOME") or path.expanduser(path.join("~", ".cache"))
+    return path.join(base_dir, CACHE_DIRNAME)
+
+
+class DiskCache:
+    """Directory of keyed files with LRU eviction by total size in bytes."""
+
+    def __init__(self, name: str, budget: int, root: Optional[str] = None):
+        self.directory = path.join(root or cache_root(), name)
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None  # unknown until the first write
+        self._write_failed = False
+
+    def entry_path(self, key: str, suffix: str = "") -> str:
+        return path.join(self.directory, key[:2], key + suffix)
+
+    def lookup(self, key: str, suffix: str = "") -> Optional[str]:
+        """Path of the entry for *key*, marked as recently used, or ``None``."""
+        entry = self.entry_path(key, suffix)
+        try:
+            os.utime(entry)
+        except OSError:
+            return None
+        return entry
+
+    def read(self, key: str, suffix: str = "") -> Optional[bytes]:
+        entry = self.lookup(key, suffix)
+        if entry is None:
+            return None
+        try:
+            with open(entry, "rb") as handle:
+                return handle.read()
+        except OSError:
+            return None
+
+    def write(self, key: str, data: bytes, suffix: str = "") -> Optional[str]:
+        """Store *data* under *key* atomically and return the entry's path,
+        or ``None`` if it could not be written."""
+        return self._install(key, suffix, lambda handle: handle.write(data))
+
+    def write_file(self, key: str, source: str, suffix: str = "") -> Optional[str]:
+        """Store a copy of the file *source* under *key* atomically."""
+        def copy(handle):
+            with open(source, "rb") as source_handle:
+                shutil.copyfileobj(source_handle, handle)
+
+        return self._install(key, suffix, copy)
+
+    def _install(self, key: str, suffix: str, fill) -> Optional[str]:
+        entry = self.entry_path(key, suffix)
+        try:
+            os.makedirs(path.dirname(entry), exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(dir=path.dirname(entry), prefix=".tmp-")
+            try:
+                with os.fdopen(handle, "wb") as temp_file:
+                    fill(temp_file)
+                    size = temp_file.tell()
+                os.replace(temp_path, entry)
+            except BaseException:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                raise
+
+            with self._lock:
+                if self._size is None:
+                    self._size = self._scan_size()
+                else:
+                    self._size += size
+                over_budget = self._size > self.budget
+            if over_budget:
+                self.evict()
+        except OSError as error:
+            self._report(error)
+            return None
+        return entry
+
+    def _report(self, error: OSError) -> None:
+        with self._lock:
+            if self._write_failed:
+                return
+            self._write_failed = True
+        print(f"Cache {self.directory} is not writable, continuing without storing: {error}", file=sys.stderr)
+
+    def _entries(self, temporaries: bool = False):
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.is_file() and entry.name.startswith(".tmp-") == temporaries:
+                    yield entry
+
+    def _scan_size(self) -> int:
+        total = 0
+        for entry in self._entries():
+            try:
+                total += entry.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits its budget."""
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = self.budget * EVICT_TO
+        for _, size, entry_path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(entry_path)
+            except OSError:
+                # another process evicted it first
+                pass
+            total -= size
+        with self._lock:
+            self._size = total
+
+        # temporaries this old belong to writers that crashed
+        cutoff = time.time() - STALE_TEMPORARY_AGE
+        for entry in self._entries(temporaries=True):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
@@ -0,0 +1,102 @@
+"""
+Reuse of MuPDF display lists across renders of the same page.
+
+Every ``page.get_pixmap`` call interprets the page's content stream again,
+which dominates render time on complex vector drawings.  A display list
+records that interpretation once; rendering it at another resolution, clip
+or colourspace only replays the recorded drawing operations.
+
+:class:`DisplayListCache` keeps the display lists of recently rendered pages,
+keyed by document, page number and rotation (the list bakes the rotation
+in).  Their memory is not exposed by MuPDF, so each list is charged an
+estimate based on the size of its decoded content streams, and the least
+recently used lists are dropped once the total exceeds the budget.  A page
+larger than the whole budget is rendered directly and never cached.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from lazy_imports import lazy_import
+
+fitz = lazy_import("fitz")
+
+DEFAULT_BUDGET = 256 * 1024 * 1024
+# recorded operations take several times the bytes of the operators they come from
+CONTENT_FACTOR = 8
+# nodes for annotations, fonts and images referenced from the list
+BASE_COST = 16 * 1024
+
+Key = Tuple[int, int, int]
+
+
+class DisplayListCache:
+    """LRU of page display lists bounded by an estimated memory budget in bytes."""
+
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        self.budget = budget
+        self._entries: "OrderedDict[Key, Tuple[object, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(page) -> Key:
+        return id(page.parent), page.number, page.rotation
+
+    @staticmethod
+    def _cost(page) -> int:
+        return BASE_COST + CONTENT_FACTOR * len(page.read_contents())
+
+    def display_list(self, page):
+        """Display list of *page*, recorded on first use; ``None`` if over budget."""
+        key = self._key(page)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+
+        cost = self._cost(page)
+        if cost > self.budget:
+            return None
+        display_list = page.get_displaylist()
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (display_list, cost)
+                self._size += cost
+                while self._size > self.budget:
+                    _, (_, evicted_cost) = self._entries.popitem(last=False)
+                    self._size -= evicted_cost
+        return display_list
+
+    def get_pixmap(self, page, matrix: Optional[fitz.Matrix] = None, dpi: Optional[int] = None,
+                   colorspace=None, alpha: bool = False, clip: Optional[fitz.Rect] = None):
+        """Like ``page.get_pixmap``, replaying the cached display list of *page*."""
+        if matrix is None:
+            zoom = (dpi or 72) / 72
+            matrix = fitz.Matrix(zoom, zoom)
+        colorspace = colorspace or fitz.csRGB
+        display_list = self.display_list(page)
+        if display_list is None:
+            return page.get_pixmap(matrix=matrix, colorspace=colorspace, alpha=alpha, clip=clip)
+        return display_list.get_pixmap(matrix=matrix, colorspace=colorspace, alpha=alpha, clip=clip)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __enter__(self) -> "DisplayListCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        # lists refer to their document's resources: release them before it closes
+        self.clear()
+
+    @property
+    def size(self) -> int:
+        """Estimated bytes held by the cached display lists."""
+        return self._size
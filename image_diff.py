@@ -0,0 +1,129 @@
+"""
+Comparison of embedded images.
+
+Replacing a photo, logo or stamp changes neither the text nor the linework,
+so neither of the other diff stages sees it.  This stage works from xref
+metadata only — nothing is rendered or decoded:
+
+* every image XObject is identified by a digest of its raw (still encoded)
+  stream bytes and those of its soft mask.  Digests are cached per document
+  and xref, so an image shared by many pages is hashed once;
+* each placement of an image on a page (``page.get_image_rects``) becomes a
+  ``(digest, bbox)`` pair in unrotated page space, the same space as word
+  boxes.
+
+Placements with the same digest and (within the tolerance) the same bbox are
+unchanged.  Among the rest, an image present on both sides at another place
+was **moved**, an old and a new image at overlapping places were
+**replaced**, and whatever is left was **removed** or **added**.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from lazy_imports import lazy_import
+
+fitz = lazy_import("fitz")
+
+Placement = Tuple[bytes, Tuple[float, float, float, float]]
+# (kind, old bbox, new bbox); kind is "moved", "replaced", "removed" or "added"
+Change = Tuple[str, Optional[Tuple[float, float, float, float]], Optional[Tuple[float, float, float, float]]]
+
+
+class ImageDigests:
+    """Digests of the image streams of one document, computed once per xref."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._cache: Dict[Tuple[int, int], bytes] = {}
+
+    def digest(self, xref: int, smask: int = 0) -> bytes:
+        key = (xref, smask)
+        if key not in self._cache:
+            hasher = hashlib.blake2b(digest_size=16)
+            hasher.update(self.doc.xref_stream_raw(xref) or b"")
+            if smask:
+                hasher.update(self.doc.xref_stream_raw(smask) or b"")
+            self._cache[key] = hasher.digest()
+        return self._cache[key]
+
+
+def page_images(page, digests: ImageDigests) -> List[Placement]:
+    """Every placement of an image on *page* as ``(digest, bbox)``."""
+    placements = []
+    for image in page.get_images(full=True):
+        xref, smask = image[0], image[1]
+        rects = page.get_image_rects(xref)
+        if not rects:
+            continue
+        digest = digests.digest(xref, smask)
+        placements.extend((digest, tuple(rect)) for rect in rects if not rect.is_empty)
+    return placements
+
+
+def _close(first, second, tolerance: float) -> bool:
+    return all(abs(a - b) <= tolerance for a, b in zip(first, second))
+
+
+def _overlaps(first, second) -> bool:
+    return first[0] < second[2] and second[0] < first[2] and first[1] < second[3] and second[1] < first[3]
+
+
+def _unmatched(placements: List[Placement], others: List[Placement], tolerance: float) -> List[Placement]:
+    """Placements of *placements* left over once every placement of *others* cancels an equal one."""
+    def key(placement):
+        digest, bbox = placement
+        return digest, tuple(round(value / tolerance) for value in bbox)
+
+    budget = Counter(key(placement) for placement in others)
+    left = []
+    for placement in placements:
+        if budget[key(placement)] > 0:
+            budget[key(placement)] -= 1
+        else:
+            left.append(placement)
+    return left
+
+
+def match_images(old: List[Placement], new: List[Placement], tolerance: float = 1.0) -> List[Change]:
+    """Classify the placements of *old* and *new* that have no unchanged counterpart."""
+    # exact pass: equal digests at (rounded) equal places cancel out
+    old_left, new_left = _unmatched(old, new, tolerance), _unmatched(new, old, tolerance)
+
+    changes: List[Change] = []
+    # the same image elsewhere: unchanged if only rounding separated it, otherwise moved
+    for old_placement in list(old_left):
+        digest, old_bbox = old_placement
+        candidates = [placement for placement in new_left if placement[0] == digest]
+        if not candidates:
+            continue
+        nearest = min(candidates, key=lambda placement: abs(placement[1][0] - old_bbox[0]) + abs(placement[1][1] - old_bbox[1]))
+        old_left.remove(old_placement)
+        new_left.remove(nearest)
+        if not _close(old_bbox, nearest[1], tolerance):
+            changes.append(("moved", old_bbox, nearest[1]))
+
+    # different images at overlapping places replaced one another
+    for old_placement in list(old_left):
+        partner = next((placement for placement in new_left if _overlaps(old_placement[1], placement[1])), None)
+        if partner is not None:
+            old_left.remove(old_placement)
+            new_left.remove(partner)
+            changes.append(("replaced", old_placement[1], partner[1]))
+
+    changes.extend(("removed", bbox, None) for _, bbox in old_left)
+    changes.extend(("added", None, bbox) for _, bbox in new_left)
+    return changes
+
+
+def diff_pages(old_page, new_page, old_digests: ImageDigests, new_digests: ImageDigests,
+               tolerance: float = 1.0) -> List[Tuple[str, Optional[fitz.Rect], Optional[fitz.Rect]]]:
+    """Image changes between two pages as ``(kind, old_rect, new_rect)``; absent sides are ``None``."""
+    changes = match_images(page_images(old_page, old_digests), page_images(new_page, new_digests), tolerance)
+    return [
+        (kind, fitz.Rect(old_bbox) if old_bbox else None, fitz.Rect(new_bbox) if new_bbox else None)
+        for kind, old_bbox, new_bbox in changes
+    ]
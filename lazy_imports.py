@@ -0,0 +1,69 @@
+"""
+Deferred imports for heavy optional-at-startup modules.
+
+``fitz`` and Pillow together add a few hundred milliseconds to launch, yet the
+window does not need either of them until a PDF is dropped.  Modules bind a
+:class:`LazyModule` under the usual name instead::
+
+    fitz = lazy_import("fitz")
+
+and the real import happens on first attribute access.
+"""
+
+import importlib
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module placeholder that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_lock"] = threading.Lock()
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        with self._lazy_lock:
+            module = self.__dict__["_lazy_module"]
+            if module is None:
+                module = importlib.import_module(self.__name__)
+                # copy the namespace so later lookups skip __getattr__ entirely
+                self.__dict__.update(module.__dict__)
+                self.__dict__["_lazy_module"] = module
+            return module
+
+    def __getattr__(self, name: str):
+        return getattr(self._load(), name)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__["_lazy_module"] is not None
+
+
+_registry: dict = {}
+_registry_lock = threading.Lock()
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return the shared placeholder for *name* (one per module name)."""
+    with _registry_lock:
+        module = _registry.get(name)
+        if module is None:
+            module = _registry[name] = LazyModule(name)
+        return module
+
+
+def preload(*modules: LazyModule) -> threading.Thread:
+    """Import *modules* on a daemon thread, e.g. right after the window is shown."""
+
+    def _run():
+        for module in modules:
+            try:
+                module._load()
+            except ImportError:
+                pass
+
+    thread = threading.Thread(target=_run, name="preload-imports", daemon=True)
+    thread.start()
+    return thread
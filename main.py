@@ -1,11 +1,13 @@
+import time
+
+# 启动计时起点（供启动性能基准测试使用），必须位于其它导入之前
+_STARTUP_T0 = time.perf_counter()
+
+import multiprocessing
 import os
 import sys
-import tempfile
-import shutil
-import fitz
-from PIL import Image
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap, QImage
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QPixmap
 from PySide6.QtWidgets import (
     QApplication,
     QHBoxLayout,
@@ -19,12 +21,23 @@ from PySide6.QtWidgets import (
 
 # 导入原始脚本中的组件
 import py_PDF_compare_gui
+from lazy_imports import lazy_import, preload
+from preview_service import PreviewService
+from PDF_rotate import rotate_pdf_in_place
 from py_PDF_compare_gui import (
     MainWindow,
     DragDropLabel,
+    resource_path,
     stylesheet,
 )
 
+# PyMuPDF / Pillow 延迟到首次使用时才真正导入，窗口可以先显示出来
+fitz = lazy_import("fitz")
+Image = lazy_import("PIL.Image")
+
+# 设置该环境变量后，窗口首次绘制完成即打印启动耗时并退出（见 benchmarks/startup_benchmark.py）
+STARTUP_BENCHMARK_ENV = "PDF_TOOLKIT_STARTUP_BENCHMARK"
+
 class ExtendedMainWindow(MainWindow):
     def __init__(self):
         super().__init__()
@@ -37,6 +50,12 @@ class ExtendedMainWindow(MainWindow):
 
     def init_extended_widgets(self):
         """初始化在主界面展示的预览区与一级菜单旋转按钮"""
+        # 缩略图在后台进程渲染并按 (路径, mtime, 大小, 旋转) 缓存，交换文件时直接复用
+        self.preview_service = PreviewService(box_size=210, parent=self)
+        self.preview_service.previewReady.connect(self._on_preview_ready)
+        self.preview_service.previewFailed.connect(self._on_preview_failed)
+        self._preview_keys = {"old": None, "new": None}
+
         # --- 旧文档区域组件 ---
         self.preview_old = QLabel()
         self.preview_old.setFixedSize(220, 220)
@@ -52,11 +71,15 @@ class ExtendedMainWindow(MainWindow):
         old_btn_style = self._btn_style("#FF6B6B", "#FFF5F5", "#FFE0E0")
         self.rot_ccw_old_btn = QPushButton("↺ 90° CCW")
         self.rot_ccw_old_btn.setStyleSheet(old_btn_style)
-        self.rot_ccw_old_btn.clicked.connect(lambda: self.rotate_file_in_place("old", -90))
+        self.rot_ccw_old_btn.clicked.connect(lambda: self.rotate_pending("old", -90))
 
         self.rot_cw_old_btn = QPushButton("90° CW ↻")
         self.rot_cw_old_btn.setStyleSheet(old_btn_style)
-        self.rot_cw_old_btn.clicked.connect(lambda: self.rotate_file_in_place("old", 90))
+        self.rot_cw_old_btn.clicked.connect(lambda: self.rotate_pending("old", 90))
+
+        self.save_rot_old_btn = QPushButton("Save Rotation")
+        self.save_rot_old_btn.setStyleSheet(old_btn_style)
+        self.save_rot_old_btn.clicked.connect(lambda: self.save_pending_rotation("old"))
 
         # --- 新文档区域组件 ---
         self.preview_new = QLabel()
@@ -73,16 +96,20 @@ class ExtendedMainWindow(MainWindow):
         new_btn_style = self._btn_style("#2196F3", "#F0F8FF", "#E3F2FD")
         self.rot_ccw_new_btn = QPushButton("↺ 90° CCW")
         self.rot_ccw_new_btn.setStyleSheet(new_btn_style)
-        self.rot_ccw_new_btn.clicked.connect(lambda: self.rotate_file_in_place("new", -90))
+        self.rot_ccw_new_btn.clicked.connect(lambda: self.rotate_pending("new", -90))
 
         self.rot_cw_new_btn = QPushButton("90° CW ↻")
         self.rot_cw_new_btn.setStyleSheet(new_btn_style)
-        self.rot_cw_new_btn.clicked.connect(lambda: self.rotate_file_in_place("new", 90))
+        self.rot_cw_new_btn.clicked.connect(lambda: self.rotate_pending("new", 90))
+
+        self.save_rot_new_btn = QPushButton("Save Rotation")
+        self.save_rot_new_btn.setStyleSheet(new_btn_style)
+        self.save_rot_new_btn.clicked.connect(lambda: self.save_pending_rotation("new"))
 
     def rebuild_layout(self):
         """丢弃原有 MainWindow 的旧垂直布局，重新编排一个整洁的紧凑型双栏布局"""
         # 调整主窗口尺寸以完美适应双栏直观预览
-        self.resize(550, 600)
+        self.resize(550, 640)
 
         # 核心中央小部件
         new_central = QWidget()
@@ -113,6 +140,7 @@ class ExtendedMainWindow(MainWindow):
         old_rot_layout.addWidget(self.rot_ccw_old_btn)
         old_rot_layout.addWidget(self.rot_cw_old_btn)
         old_col.addLayout(old_rot_layout)
+        old_col.addWidget(self.save_rot_old_btn)
 
         # --- 右侧一栏 (New) ---
         new_col = QVBoxLayout()
@@ -133,6 +161,7 @@ class ExtendedMainWindow(MainWindow):
         new_rot_layout.addWidget(self.rot_ccw_new_btn)
         new_rot_layout.addWidget(self.rot_cw_new_btn)
         new_col.addLayout(new_rot_layout)
+        new_col.addWidget(self.save_rot_new_btn)
 
         cols_layout.addLayout(old_col)
         cols_layout.addLayout(new_col)
@@ -182,63 +211,72 @@ class ExtendedMainWindow(MainWindow):
         """
 
     def refresh_preview(self, role):
-        """即时加载并渲染 PDF 的第一页"""
+        """显示 PDF 第一页的缩略图：命中缓存立即显示，否则交给后台进程渲染"""
         label = self.drop_label_new if role == "new" else self.drop_label_old
         preview_widget = self.preview_new if role == "new" else self.preview_old
         file_path = label.file_path
 
-        if not file_path or not os.path.exists(file_path):
+        rotation = self.page_rotations[self._role_index(role)]
+        key = self.preview_service.make_key(file_path, rotation) if file_path else None
+        self._preview_keys[role] = key
+        if key is None:
             preview_widget.clear()
             text = "Drop NEW PDF here\nor click to browse" if role == "new" else "Drop OLD PDF here\nor click to browse"
             preview_widget.setText(text)
             return
 
-        try:
-            # 打开、渲染、随后立即关闭文档（防止文件占用锁定，方便本地写入和旋转）
-            doc = fitz.open(file_path)
-            page = doc.load_page(0)
-            
-            rect = page.rect
-            scale = 210 / max(rect.width, rect.height, 1)  # 缩放到预览框内
-            mat = fitz.Matrix(scale, scale)
-            pix = page.get_pixmap(matrix=mat, colorspace=fitz.csRGB)
-            
-            img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-            doc.close()
-
-            data = img.tobytes("raw", "RGB")
-            qt_img = QImage(data, img.width, img.height, img.width * 3, QImage.Format.Format_RGB888)
-            pixmap = QPixmap.fromImage(qt_img)
-            preview_widget.setPixmap(pixmap)
-        except Exception as e:
-            preview_widget.setText(f"Preview Error:\n{e}")
+        image = self.preview_service.cached(key)
+        if image is not None:
+            preview_widget.setPixmap(QPixmap.fromImage(image))
+            return
+
+        preview_widget.clear()
+        preview_widget.setText("Loading preview...")
+        self.preview_service.request(key)
+
+    def _on_preview_ready(self, key, image):
+        """后台渲染完成：只更新仍然指向该文件版本的预览框（丢弃过期结果）"""
+        for role, preview_widget in (("old", self.preview_old), ("new", self.preview_new)):
+            if self._preview_keys.get(role) == key:
+                preview_widget.setPixmap(QPixmap.fromImage(image))
 
-    def rotate_file_in_place(self, role, angle_diff):
-        """直接旋转本地的真实文件"""
+    def _on_preview_failed(self, key, message):
+        for role, preview_widget in (("old", self.preview_old), ("new", self.preview_new)):
+            if self._preview_keys.get(role) == key:
+                preview_widget.setText(f"Preview Error:\n{message}")
+
+    @staticmethod
+    def _role_index(role):
+        """角色在 self.files / self.page_rotations 中的下标（与原 MainWindow 一致：0 为新文档）"""
+        return 0 if role == "new" else 1
+
+    def rotate_pending(self, role, angle_diff):
+        """仅记录待应用的旋转角度：预览通过渲染矩阵旋转，比对引擎在内存中旋转页面，不改写文件"""
+        label = self.drop_label_new if role == "new" else self.drop_label_old
+        if not label.file_path or not os.path.exists(label.file_path):
+            return
+
+        index = self._role_index(role)
+        self.page_rotations[index] = (self.page_rotations[index] + angle_diff) % 360
+        self.update_ui_state()
+
+    def save_pending_rotation(self, role):
+        """显式保存：把累计的旋转一次性写回原文件（尽量使用增量保存）"""
         label = self.drop_label_new if role == "new" else self.drop_label_old
         file_path = label.file_path
-        if not file_path or not os.path.exists(file_path):
+        index = self._role_index(role)
+        rotation = self.page_rotations[index]
+        if not file_path or not os.path.exists(file_path) or rotation == 0:
             return
 
         try:
-            # 1. 打开 PDF
-            doc = fitz.open(file_path)
-            # 2. 遍历并顺时针/逆时针旋转每一页 [1]
-            for page in doc:
-                page.set_rotation((page.rotation + angle_diff) % 360)
-            
-            # 3. 为防止覆写时发生进程占用，将修改安全写入临时文件后，再替换原真实文件 [1]
-            temp_fd, temp_path = tempfile.mkstemp(suffix=".pdf")
-            os.close(temp_fd)
-            doc.save(temp_path)
-            doc.close()
-
-            shutil.move(temp_path, file_path)
-
-            # 4. 刷新当前的预览图 [1]
-            self.refresh_preview(role)
+            rotate_pdf_in_place(file_path, rotation)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to modify and save PDF locally:\n{e}")
+            return
+
+        self.page_rotations[index] = 0
+        self.update_ui_state()
 
     def update_ui_state(self):
         """动态控制按钮的可点击状态与预览刷新"""
@@ -251,6 +289,13 @@ class ExtendedMainWindow(MainWindow):
         self.rot_ccw_new_btn.setEnabled(has_new)
         self.rot_cw_new_btn.setEnabled(has_new)
 
+        # 只有存在未保存的旋转时才允许保存，按钮上显示待应用的角度
+        for role, button in (("old", self.save_rot_old_btn), ("new", self.save_rot_new_btn)):
+            rotation = self.page_rotations[self._role_index(role)]
+            has_file = has_old if role == "old" else has_new
+            button.setEnabled(has_file and rotation != 0)
+            button.setText(f"Save Rotation ({rotation}°)" if rotation else "Save Rotation")
+
         # 刷新两侧预览
         self.refresh_preview("old")
         self.refresh_preview("new")
@@ -260,6 +305,11 @@ class ExtendedMainWindow(MainWindow):
         super().swap_files()
         self.update_ui_state()
 
+    def closeEvent(self, event):
+        """关闭窗口时结束后台预览渲染进程"""
+        self.preview_service.shutdown()
+        super().closeEvent(event)
+
 
 # ---------------------------------------------------------------------------
 # 拦截 DragDropLabel 注入状态刷新
@@ -279,7 +329,21 @@ DragDropLabel.set_file = patched_set_file
 # ---------------------------------------------------------------------------
 # 启动入口
 # ---------------------------------------------------------------------------
+def _report_startup_and_quit(app):
+    """基准测试模式：输出从进程导入到首帧显示的耗时，然后退出"""
+    elapsed_ms = (time.perf_counter() - _STARTUP_T0) * 1000
+    frozen = hasattr(sys, "_MEIPASS")
+    print(f"STARTUP_MS={elapsed_ms:.1f}", flush=True)
+    print(f"FROZEN={int(frozen)}", flush=True)
+    print(f"RESOURCE_BASE={os.path.dirname(resource_path('icon.ico'))}", flush=True)
+    print(f"FITZ_LOADED={int(fitz.is_loaded)}", flush=True)
+    app.quit()
+
+
 if __name__ == "__main__":
+    # PyInstaller 打包后，预览渲染子进程需要此调用才能正常启动
+    multiprocessing.freeze_support()
+
     app = QApplication([])
     app.setStyle(QStyleFactory.create("Fusion"))
     app.setStyleSheet(stylesheet)
@@ -290,4 +354,11 @@ if __name__ == "__main__":
     py_PDF_compare_gui.window = window
 
     window.show()
+
+    if os.environ.get(STARTUP_BENCHMARK_ENV):
+        QTimer.singleShot(0, lambda: _report_startup_and_quit(app))
+    else:
+        # 窗口显示后再在后台预热 PyMuPDF / Pillow，避免首次拖入文件时卡顿
+        QTimer.singleShot(0, lambda: preload(fitz, Image))
+
     app.exec()
\ No newline at end of file
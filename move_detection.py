@@ -0,0 +1,110 @@
+"""
+Moved-block detection.
+
+A paragraph that moves shows up in the sequence diff as a deletion at its
+old place and an addition at its new one.  This module pairs such runs by
+shared content in near-linear time:
+
+* tokens are compared as small integers (one ID per normalized token);
+* every deleted run is fingerprinted by *winnowing*: hashes of all k-token
+  windows, keeping the minimum of each group of ``w`` consecutive hashes.
+  Any common stretch of at least ``w + k - 1`` tokens is then guaranteed to
+  share a fingerprint, while only about ``2 / (w + 1)`` of the hashes need to
+  be stored;
+* the added runs are fingerprinted the same way and looked up in that index;
+  each hit is verified and extended token by token in both directions
+  (staying inside its two runs) to the full common block.
+
+Blocks of at least ``min_tokens`` tokens are reported as moves.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# candidate positions looked at per fingerprint; repetitive boilerplate could
+# otherwise make the lookup quadratic
+MAX_CANDIDATES = 8
+
+Run = Tuple[int, int]  # [start, end) token indices
+Move = Tuple[int, int, int]  # (old_start, new_start, length)
+
+
+def token_ids(*sequences: Sequence[str]) -> List[List[int]]:
+    """Map equal strings across *sequences* to the same small integer."""
+    ids: Dict[str, int] = {}
+    return [[ids.setdefault(token, len(ids)) for token in sequence] for sequence in sequences]
+
+
+def _winnow(ids: Sequence[int], start: int, end: int, k: int, w: int) -> Iterable[Tuple[int, int]]:
+    """Yield ``(hash, position)`` fingerprints of ``ids[start:end]``."""
+    window: deque = deque()  # (hash, position), hashes increasing
+    last = None
+    for position in range(start, end - k + 1):
+        value = hash(tuple(ids[position:position + k]))
+        while window and window[-1][0] >= value:
+            window.pop()
+        window.append((value, position))
+        if window[0][1] <= position - w:
+            window.popleft()
+        if position - start >= w - 1 and window[0] != last:
+            last = window[0]
+            yield last
+    if end - start >= k and end - start - k + 1 < w and window:
+        # run shorter than one window: its minimum still represents it
+        yield window[0]
+
+
+def find_moves(old_ids: Sequence[int], new_ids: Sequence[int], old_runs: Sequence[Run],
+               new_runs: Sequence[Run], min_tokens: int = 8, k: int = 4) -> List[Move]:
+    """Common blocks of at least *min_tokens* between deleted *old_runs* and added *new_runs*."""
+    k = max(1, min(k, min_tokens))
+    w = max(1, min_tokens - k + 1)
+
+    index: Dict[int, List[int]] = {}
+    old_bounds: Dict[int, Run] = {}  # fingerprint position -> its deleted run
+    for start, end in old_runs:
+        if end - start < min_tokens:
+            continue
+        for value, position in _winnow(old_ids, start, end, k, w):
+            positions = index.setdefault(value, [])
+            if len(positions) < MAX_CANDIDATES:
+                positions.append(position)
+                old_bounds[position] = (start, end)
+    if not index:
+        return []
+
+    claimed_old = bytearray(len(old_ids))
+    claimed_new = bytearray(len(new_ids))
+    moves: List[Move] = []
+    for new_start, new_end in new_runs:
+        if new_end - new_start < min_tokens:
+            continue
+        for value, position in _winnow(new_ids, new_start, new_end, k, w):
+            if any(claimed_new[position:position + k]):
+                continue
+            for candidate in index.get(value, ()):
+                if any(claimed_old[candidate:candidate + k]) or old_ids[candidate:candidate + k] != new_ids[position:position + k]:
+                    continue
+                old_start, old_end = old_bounds[candidate]
+                # extend the anchor to the whole common block inside both runs
+                left = 0
+                while (candidate - left > old_start and position - left > new_start
+                       and old_ids[candidate - left - 1] == new_ids[position - left - 1]
+                       and not claimed_old[candidate - left - 1] and not claimed_new[position - left - 1]):
+                    left += 1
+                right = k
+                while (candidate + right < old_end and position + right < new_end
+                       and old_ids[candidate + right] == new_ids[position + right]
+                       and not claimed_old[candidate + right] and not claimed_new[position + right]):
+                    right += 1
+                length = left + right
+                if length < min_tokens:
+                    continue
+                block_old, block_new = candidate - left, position - left
+                claimed_old[block_old:block_old + length] = b"\x01" * length
+                claimed_new[block_new:block_new + length] = b"\x01" * length
+                moves.append((block_old, block_new, length))
+                break
+    return moves
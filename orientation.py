@@ -0,0 +1,190 @@
+"""
+Automatic page orientation detection.
+
+For every page the detector returns the clockwise rotation (0, 90, 180 or
+270 degrees) that has to be *added* to the page so that its content reads
+upright; the result plugs straight into :func:`PDF_rotate.rotate_pdf` as a
+per-page map.
+
+* **Text pages** vote with the direction vector of every text line in
+  ``page.get_text("dict")``, weighted by the line's character count.  The
+  vectors are in unrotated page space, so the page's own ``/Rotate`` is added
+  before the vote is quantized to a quarter turn.
+* **Image-only pages** (scans without an OCR layer) are rendered in grayscale
+  at a low analysis DPI.  Text lines make the ink projection profile
+  perpendicular to them strongly periodic, which tells horizontal from
+  vertical lines; the sign of the turn comes from which end of the lines is
+  aligned (line starts share a margin, line ends are ragged) and from where
+  the ink sits within each line (upright Latin lines carry more ink above
+  their middle than below it).
+
+Pages are processed in parallel worker processes; each worker opens the
+document once and handles an interleaved share of the pages.
+"""
+
+from __future__ import annotations
+
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lazy_imports import lazy_import
+from raster_utils import pixmap_array
+
+fitz = lazy_import("fitz")
+np = lazy_import("numpy")
+
+# low enough to render a letter-size page in a few milliseconds
+ANALYSIS_DPI = 40
+# pages with fewer extractable characters are judged from their pixels instead
+MIN_TEXT_CHARS = 20
+# share of the character weight the winning direction needs
+TEXT_MAJORITY = 0.6
+# one projection profile must be this much more periodic than the other
+PROFILE_RATIO = 1.3
+# below this many pages, starting worker processes costs more than it saves
+PARALLEL_MIN_PAGES = 48
+
+
+def _text_rotation(page) -> Optional[int]:
+    """Correction voted by the text lines, or ``None`` if there is too little text."""
+    votes = {0: 0, 90: 0, 180: 0, 270: 0}
+    page_rotation = page.rotation
+    for block in page.get_text("dict", flags=0)["blocks"]:
+        for line in block.get("lines", ()):
+            chars = sum(len(span["text"].strip()) for span in line["spans"])
+            if not chars:
+                continue
+            dx, dy = line["dir"]
+            # reading angle as displayed, clockwise in degrees (y points down)
+            angle = math.degrees(math.atan2(dy, dx)) + page_rotation
+            votes[int(round(angle / 90.0)) * 90 % 360] += chars
+
+    total = sum(votes.values())
+    if total < MIN_TEXT_CHARS:
+        return None
+    direction, weight = max(votes.items(), key=lambda item: item[1])
+    if weight < TEXT_MAJORITY * total:
+        return 0
+    return -direction % 360
+
+
+def _profile_score(profile) -> float:
+    steps = np.diff(profile.astype(np.float64))
+    return float(np.dot(steps, steps))
+
+
+def _line_cues(ink) -> Tuple[float, float, float]:
+    """Measure the text lines of *ink*, assumed to run horizontally.
+
+    Returns ``(start_spread, end_spread, centroid_offset)``: the median
+    absolute deviation of where lines start and end, and how far below each
+    line's middle its ink centroid sits on average, relative to the line
+    height (negative for upright Latin text).
+    """
+    rows = ink.any(axis=1)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], rows.view(np.int8), [0]))))
+    starts, ends, offsets = [], [], []
+    for top, bottom in zip(edges[::2], edges[1::2]):
+        height = bottom - top
+        if height < 2:
+            continue
+        band = ink[top:bottom]
+        columns = np.flatnonzero(band.any(axis=0))
+        starts.append(columns[0])
+        ends.append(columns[-1])
+        weights = band.sum(axis=1)
+        centroid = np.dot(weights, np.arange(height)) / max(weights.sum(), 1)
+        offsets.append((centroid - (height - 1) / 2.0) / height)
+
+    if len(starts) < 3:
+        return 0.0, 0.0, 0.0
+
+    def spread(values):
+        values = np.asarray(values, dtype=np.float64)
+        return float(np.median(np.abs(values - np.median(values))))
+
+    return spread(starts), spread(ends), float(np.mean(offsets))
+
+
+def _is_upright(ink) -> Optional[bool]:
+    """Whether horizontal text in *ink* reads upright (``False``: upside down)."""
+    start_spread, end_spread, offset = _line_cues(ink)
+    vote = 0
+    if end_spread > 1.5 * start_spread + 1:
+        vote += 1
+    elif start_spread > 1.5 * end_spread + 1:
+        vote -= 1
+    if abs(offset) > 0.03:
+        vote += 1 if offset < 0 else -1
+    return None if vote == 0 else vote > 0
+
+
+def _raster_rotation(page, dpi: int = ANALYSIS_DPI) -> int:
+    """Correction judged from a low-resolution grayscale render of *page*."""
+    pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+    gray = pixmap_array(pix)
+    # scanner edges and punch holes are not text
+    margin_y, margin_x = pix.height // 30, pix.width // 30
+    ink = gray[margin_y:pix.height - margin_y, margin_x:pix.width - margin_x] < 128
+    if ink.sum() < 50:
+        return 0
+
+    row_score = _profile_score(ink.sum(axis=1))
+    column_score = _profile_score(ink.sum(axis=0))
+    if column_score > PROFILE_RATIO * row_score:
+        # lines run vertically: turning the image a quarter counter-clockwise
+        # makes top-to-bottom text upright, which is a 270 degree correction
+        upright = _is_upright(np.rot90(ink))
+        return 90 if upright is False else 270
+    if row_score > PROFILE_RATIO * column_score and _is_upright(ink) is False:
+        return 180
+    return 0
+
+
+def detect_page_rotation(page, dpi: int = ANALYSIS_DPI) -> int:
+    """Clockwise rotation (0/90/180/270) to add to *page* so it reads upright."""
+    rotation = _text_rotation(page)
+    if rotation is None:
+        rotation = _raster_rotation(page, dpi)
+    return rotation
+
+
+def _detect_chunk(file_path: str, page_indices: List[int], dpi: int) -> List[Tuple[int, int]]:
+    results = []
+    with fitz.open(file_path) as doc:
+        for page_index in page_indices:
+            results.append((page_index, detect_page_rotation(doc.load_page(page_index), dpi)))
+    return results
+
+
+def detect_orientations(file_path: str, pages: Optional[Iterable[int]] = None,
+                        jobs: Optional[int] = None, dpi: int = ANALYSIS_DPI) -> Dict[int, int]:
+    """Detect the orientation of *pages* (0-based, default: all) of *file_path*.
+
+    Returns ``{page_index: degrees}`` for the pages that need rotating, ready
+    for :func:`PDF_rotate.rotate_pdf`.  *jobs* worker processes are used
+    (default: one per CPU); small documents are handled in-process.
+    """
+    if pages is None:
+        with fitz.open(file_path) as doc:
+            indices = list(range(doc.page_count))
+    else:
+        indices = list(pages)
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(indices) < PARALLEL_MIN_PAGES:
+        results = _detect_chunk(file_path, indices, dpi)
+    else:
+        # keep every worker's share large enough to pay for its start-up
+        jobs = min(jobs, len(indices) // (PARALLEL_MIN_PAGES // 2))
+        # interleaved shares balance runs of scanned pages across workers;
+        # "spawn" avoids forking a process that may run a Qt event loop
+        chunks = [indices[offset::jobs] for offset in range(jobs)]
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = list(chain.from_iterable(executor.map(_detect_chunk, repeat(file_path), chunks, repeat(dpi))))
+
+    return {page_index: rotation for page_index, rotation in results if rotation}
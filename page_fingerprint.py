@@ -0,0 +1,124 @@
+"""
+Byte-level fingerprints of files and pages.
+
+Revisions often differ only in their metadata or on a few pages.  Before any
+text is extracted or any page rendered, both documents are fingerprinted:
+
+* the **file digest** hashes the raw bytes, so an unchanged file is
+  recognised without even opening it;
+* a **page digest** hashes everything that determines how a page looks: its
+  rotation and boxes, its own object, and every object reachable from it —
+  content streams, resources, fonts, images, form XObjects, annotations —
+  with raw stream bytes read via xref.  References are hashed by the digest
+  of their target (a Merkle hash), so pages match even when the two files
+  number their objects differently.  Each object is hashed once per
+  document, however many pages share it.
+
+Links back into the page tree (``/Parent``, references to other page objects)
+are not followed, so one page's digest never depends on the rest of the
+document.  Equal digests mean byte-identical page content; unequal digests
+only mean the page *may* have changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Dict, List, Set
+
+DIGEST_SIZE = 16
+CHUNK_SIZE = 1 << 20
+
+_REFERENCE = re.compile(r"(\d+) 0 R")
+_PARENT = re.compile(r"/Parent\s*\d+ 0 R")
+
+
+def _hasher():
+    return hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+
+def file_digest(file_path: str) -> bytes:
+    """Digest of the raw bytes of *file_path*."""
+    digest = _hasher()
+    with open(file_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+class _DocumentHasher:
+    """Memoized Merkle hashing of the objects of one document."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.pages: Set[int] = {doc.page_xref(index) for index in range(doc.page_count)}
+        self.memo: Dict[int, bytes] = {}
+        self.active: Set[int] = set()
+
+    def _substitute(self, match: "re.Match") -> str:
+        xref = int(match.group(1))
+        if xref in self.pages:
+            return "<page>"
+        return "<" + self.object_digest(xref).hex() + ">"
+
+    def object_digest(self, xref: int) -> bytes:
+        if xref in self.memo:
+            return self.memo[xref]
+        if xref in self.active:
+            # a reference cycle: the objects on it are hashed by their content already
+            return b"cycle"
+        self.active.add(xref)
+        digest = _hasher()
+        source = _PARENT.sub("", self.doc.xref_object(xref, compressed=True))
+        digest.update(_REFERENCE.sub(self._substitute, source).encode("utf-8", "surrogatepass"))
+        if self.doc.xref_is_stream(xref):
+            digest.update(self.doc.xref_stream_raw(xref) or b"")
+        self.active.discard(xref)
+        self.memo[xref] = digest.digest()
+        return self.memo[xref]
+
+    def _inherited_resources(self, xref: int) -> str:
+        # resources may sit on an ancestor in the page tree
+        while True:
+            kind, value = self.doc.xref_get_key(xref, "Resources")
+            if kind != "null":
+                return _REFERENCE.sub(self._substitute, value)
+            kind, parent = self.doc.xref_get_key(xref, "Parent")
+            if kind != "xref":
+                return ""
+            xref = int(parent.split()[0])
+
+    def page_digest(self, page_index: int) -> bytes:
+        page = self.doc.load_page(page_index)
+        xref = page.xref
+        digest = _hasher()
+        # rotation and boxes can be inherited too, so take the effective values
+        digest.update(repr((page.rotation, tuple(page.mediabox), tuple(page.cropbox))).encode())
+        digest.update(self.object_digest(xref))
+        digest.update(self._inherited_resources(xref).encode("utf-8", "surrogatepass"))
+        return digest.digest()
+
+
+def page_digests(doc) -> List[bytes]:
+    """One digest per page of *doc*, in page order."""
+    hasher = _DocumentHasher(doc)
+    return [hasher.page_digest(index) for index in range(doc.page_count)]
+
+
+class PageComparer:
+    """Tells whether a page is identical in two documents, hashing only the pages asked about."""
+
+    def __init__(self, old_doc, new_doc):
+        self._old, self._new = _DocumentHasher(old_doc), _DocumentHasher(new_doc)
+        self._page_counts = old_doc.page_count, new_doc.page_count
+
+    def identical(self, page_index: int) -> bool:
+        if page_index >= min(self._page_counts):
+            return False
+        return self._old.page_digest(page_index) == self._new.page_digest(page_index)
+
+
+def identical_pages(old_doc, new_doc) -> Set[int]:
+    """Indices of the pages whose content is byte-identical in both documents."""
+    old_digests, new_digests = page_digests(old_doc), page_digests(new_doc)
+    return {index for index, (old, new) in enumerate(zip(old_digests, new_digests)) if old == new}
@@ -0,0 +1,30 @@
+"""
+Qt-free page rendering helpers.
+
+These functions are safe to run in worker processes: they import nothing from
+PySide6 and return plain Python values that pickle cheaply.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+from lazy_imports import lazy_import
+
+fitz = lazy_import("fitz")
+
+
+def render_thumbnail(file_path: str, page_index: int = 0, rotation: int = 0,
+                     box_size: int = 210) -> Tuple[int, int, bytes]:
+    """Render one page fitted inside a ``box_size`` square, rotated by *rotation*
+    degrees, and return ``(width, height, rgb_bytes)`` for
+    :func:`raster_utils.samples_to_qimage`."""
+    with fitz.open(file_path) as doc:
+        page = doc.load_page(page_index)
+        rect = page.rect
+        # a quarter turn keeps the longer side, so the scale is rotation-independent
+        scale = box_size / max(rect.width, rect.height, 1)
+        matrix = fitz.Matrix(scale, scale).prerotate(rotation % 360)
+        pix = page.get_pixmap(matrix=matrix, colorspace=fitz.csRGB, alpha=False)
+        # the one copy needed to send the samples to the GUI process
+        return pix.width, pix.height, bytes(pix.samples_mv)
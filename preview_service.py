@@ -0,0 +1,96 @@
+"""
+Background thumbnail rendering for the compare tab.
+
+PyMuPDF keeps the GIL while it rasterizes, so a worker *thread* would still
+freeze the window on a large drawing set.  Thumbnails are therefore rendered
+in a single long-lived worker process and handed back to the GUI thread as
+``QImage`` objects, cached by ``(path, mtime, size, rotation)``.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, Signal, Slot
+from PySide6.QtGui import QImage
+
+from pdf_render import render_thumbnail
+from raster_utils import samples_to_qimage
+
+PreviewKey = Tuple[str, int, int, int]
+
+
+class PreviewService(QObject):
+    previewReady = Signal(object, QImage)
+    previewFailed = Signal(object, str)
+    _renderFinished = Signal(object, object)
+
+    def __init__(self, box_size: int = 210, max_entries: int = 32, parent=None):
+        super().__init__(parent)
+        self.box_size = box_size
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[PreviewKey, QImage]" = OrderedDict()
+        self._pending: Dict[PreviewKey, Future] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._renderFinished.connect(self._on_render_finished)
+
+    @staticmethod
+    def make_key(file_path: str, rotation: int = 0) -> Optional[PreviewKey]:
+        """Cache key for *file_path*, or ``None`` if the file is gone."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, rotation % 360
+
+    def cached(self, key: PreviewKey) -> Optional[QImage]:
+        image = self._cache.get(key)
+        if image is not None:
+            self._cache.move_to_end(key)
+        return image
+
+    def request(self, key: PreviewKey) -> None:
+        """Render *key* in the background; ``previewReady`` fires when done."""
+        if key in self._cache or key in self._pending:
+            return
+        file_path, _, _, rotation = key
+        future = self._get_executor().submit(render_thumbnail, file_path, 0, rotation, self.box_size)
+        self._pending[key] = future
+        # runs on an executor thread; the signal hops back to the GUI thread
+        future.add_done_callback(lambda done, key=key: self._renderFinished.emit(key, done))
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # "spawn" avoids forking a process that already runs a Qt event loop
+            self._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    @Slot(object, object)
+    def _on_render_finished(self, key: PreviewKey, future: Future) -> None:
+        if self._pending.get(key) is not future:
+            return
+        del self._pending[key]
+        if future.cancelled():
+            return
+
+        try:
+            width, height, samples = future.result()
+        except Exception as error:
+            self.previewFailed.emit(key, str(error))
+            return
+
+        image = samples_to_qimage(samples, width, height, 3)
+        self._cache[key] = image
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        self.previewReady.emit(key, image)
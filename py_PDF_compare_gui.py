@@ -1,14 +1,15 @@
-import re
+from __future__ import annotations
+
+import hashlib
+import shutil
 import sys
+from contextlib import contextmanager
 from difflib import SequenceMatcher
-from json import dump, load
 from os import path
 from tempfile import TemporaryDirectory
 from time import sleep
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
-import fitz
-from PIL import Image, ImageDraw
 from PySide6.QtCore import QThread, Signal, Slot, Qt
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (
@@ -36,11 +37,35 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from display_lists import DisplayListCache
+from lazy_imports import lazy_import
+import image_diff
+import raster_diff
+import vector_diff
+from move_detection import find_moves, token_ids
+from orientation import detect_orientations
+from page_fingerprint import file_digest, identical_pages
+from raster_utils import pixmap_to_image
+from raster_cache import RasterCache
+from rect_merge import merge_rects
+from result_cache import ResultCache, decode_rect_map, encode_rect_map
+from settings_store import get_settings_store
+from text_normalize import DEFAULT_RULES, get_normalizer
+from word_cache import Word, WordCache, page_words
+
+# PyMuPDF and Pillow are only needed once a comparison runs
+fitz = lazy_import("fitz")
+Image = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+
+# anti-aliasing bits (0-8) for black/white output: enough to keep hairlines, little grey to dither
+BW_AA_LEVEL = 2
+
 
 class AdvancedSettings(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.settings = load_settings()
+        self.settings = get_settings_store()
 
         self.min_diff_label = QLabel("Minimum Diff Token Length [Default: 2]:")
         self.min_diff_desc = QLabel(
@@ -58,12 +83,20 @@ class AdvancedSettings(QWidget):
         self.normalize_checkbox.setChecked(self.settings.get("NORMALIZE_TEXT", True))
         self.normalize_checkbox.stateChanged.connect(self.update_normalize)
 
+        self.auto_orient_checkbox = QCheckBox("Auto-orient pages (turn sideways/upside-down pages upright)")
+        self.auto_orient_checkbox.setToolTip(
+            "Detect each page's orientation before comparing. Overrides the pending rotation of the previews."
+        )
+        self.auto_orient_checkbox.setChecked(self.settings.get("AUTO_ORIENT", False))
+        self.auto_orient_checkbox.stateChanged.connect(self.update_auto_orient)
+
         layout = QVBoxLayout()
         layout.setAlignment(Qt.AlignmentFlag.AlignTop)
         layout.addWidget(self.min_diff_label)
         layout.addWidget(self.min_diff_desc)
         layout.addWidget(self.min_diff_spinbox)
         layout.addWidget(self.normalize_checkbox)
+        layout.addWidget(self.auto_orient_checkbox)
         self.setLayout(layout)
 
         self.setStyleSheet("""
@@ -99,60 +132,62 @@ class AdvancedSettings(QWidget):
         """)
 
     def update_min_diff(self, value):
-        self.settings["TEXT_MIN_DIFF_LENGTH"] = int(value)
-        save_settings(self.settings)
+        self.settings.set("TEXT_MIN_DIFF_LENGTH", int(value))
 
     def update_normalize(self, state):
-        self.settings["NORMALIZE_TEXT"] = state == 2
-        save_settings(self.settings)
+        self.settings.set("NORMALIZE_TEXT", state == 2)
+
+    def update_auto_orient(self, state):
+        self.settings.set("AUTO_ORIENT", state == 2)
 
 
 class DPISettings(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent_window = window
-        self.settings = load_settings()
+        self.settings = get_settings_store()
+        dpi_levels = self.settings.get("DPI_LEVELS")
 
         self.low_draft_label = QLabel("Low DPI - Draft Quality:")
         self.low_draft_spinbox = QSpinBox(self)
         self.low_draft_spinbox.setMinimum(1)
         self.low_draft_spinbox.setMaximum(99)
-        self.low_draft_spinbox.setValue(self.settings["DPI_LEVELS"][0])
+        self.low_draft_spinbox.setValue(dpi_levels[0])
         self.low_draft_spinbox.valueChanged.connect(self.update_dpi_levels)
 
         self.low_viewing_label = QLabel("Low DPI - Viewing Only:")
         self.low_viewing_spinbox = QSpinBox(self)
         self.low_viewing_spinbox.setMinimum(100)
         self.low_viewing_spinbox.setMaximum(199)
-        self.low_viewing_spinbox.setValue(self.settings["DPI_LEVELS"][1])
+        self.low_viewing_spinbox.setValue(dpi_levels[1])
         self.low_viewing_spinbox.valueChanged.connect(self.update_dpi_levels)
 
         self.medium_label = QLabel("Medium DPI - Printable:")
         self.medium_spinbox = QSpinBox(self)
         self.medium_spinbox.setMinimum(200)
         self.medium_spinbox.setMaximum(599)
-        self.medium_spinbox.setValue(self.settings["DPI_LEVELS"][2])
+        self.medium_spinbox.setValue(dpi_levels[2])
         self.medium_spinbox.valueChanged.connect(self.update_dpi_levels)
 
         self.standard_label = QLabel("Standard DPI:")
         self.standard_spinbox = QSpinBox(self)
         self.standard_spinbox.setMinimum(600)
         self.standard_spinbox.setMaximum(999)
-        self.standard_spinbox.setValue(self.settings["DPI_LEVELS"][3])
+        self.standard_spinbox.setValue(dpi_levels[3])
         self.standard_spinbox.valueChanged.connect(self.update_dpi_levels)
 
         self.high_label = QLabel("High DPI - Professional Quality:")
         self.high_spinbox = QSpinBox(self)
         self.high_spinbox.setMinimum(1000)
         self.high_spinbox.setMaximum(1999)
-        self.high_spinbox.setValue(self.settings["DPI_LEVELS"][4])
+        self.high_spinbox.setValue(dpi_levels[4])
         self.high_spinbox.valueChanged.connect(self.update_dpi_levels)
 
         self.max_label = QLabel("Max DPI - Large File Size:")
         self.max_spinbox = QSpinBox(self)
         self.max_spinbox.setMinimum(1000)
         self.max_spinbox.setMaximum(6000)
-        self.max_spinbox.setValue(self.settings["DPI_LEVELS"][5])
+        self.max_spinbox.setValue(dpi_levels[5])
         self.max_spinbox.valueChanged.connect(self.update_dpi_levels)
 
         layout = QVBoxLayout()
@@ -204,41 +239,45 @@ class DPISettings(QWidget):
         """)
 
     def update_dpi_levels(self, new_dpi):
+        dpi_levels = self.settings.get("DPI_LEVELS")
+        dpi_labels = self.settings.get("DPI_LABELS")
         if new_dpi < 100:
-            self.settings["DPI_LEVELS"][0] = new_dpi
-            self.settings["DPI_LABELS"][0] = f"Low DPI: Draft Quality [{new_dpi}]"
+            dpi_levels[0] = new_dpi
+            dpi_labels[0] = f"Low DPI: Draft Quality [{new_dpi}]"
         elif new_dpi < 200:
-            self.settings["DPI_LEVELS"][1] = new_dpi
-            self.settings["DPI_LABELS"][1] = f"Low DPI: Viewing Quality [{new_dpi}]"
+            dpi_levels[1] = new_dpi
+            dpi_labels[1] = f"Low DPI: Viewing Quality [{new_dpi}]"
         elif new_dpi < 600:
-            self.settings["DPI_LEVELS"][2] = new_dpi
-            self.settings["DPI_LABELS"][2] = f"Medium DPI: Printable [{new_dpi}]"
+            dpi_levels[2] = new_dpi
+            dpi_labels[2] = f"Medium DPI: Printable [{new_dpi}]"
         elif new_dpi < 1000:
-            self.settings["DPI_LEVELS"][3] = new_dpi
-            self.settings["DPI_LABELS"][3] = f"Standard DPI [{new_dpi}]"
+            dpi_levels[3] = new_dpi
+            dpi_labels[3] = f"Standard DPI [{new_dpi}]"
         elif new_dpi < 2000:
-            self.settings["DPI_LEVELS"][4] = new_dpi
-            self.settings["DPI_LABELS"][4] = f"High DPI: Professional Quality [{new_dpi}]"
+            dpi_levels[4] = new_dpi
+            dpi_labels[4] = f"High DPI: Professional Quality [{new_dpi}]"
         else:
-            self.settings["DPI_LEVELS"][5] = new_dpi
-            self.settings["DPI_LABELS"][5] = f"Max DPI: High Memory [{new_dpi}]"
+            dpi_levels[5] = new_dpi
+            dpi_labels[5] = f"Max DPI: High Memory [{new_dpi}]"
 
+        self.settings.update({"DPI_LEVELS": dpi_levels, "DPI_LABELS": dpi_labels})
         self.parent_window.dpi_combo.clear()
-        self.parent_window.dpi_combo.addItems(self.settings["DPI_LABELS"])
-        self.parent_window.dpi_combo.setCurrentText(self.settings["DPI_LABELS"][3])
-        save_settings(self.settings)
+        self.parent_window.dpi_combo.addItems(dpi_labels)
+        self.parent_window.dpi_combo.setCurrentText(dpi_labels[3])
 
 
 class OutputSettings(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.settings = load_settings()
+        self.settings = get_settings_store()
+        output_path = self.settings.get("OUTPUT_PATH")
+        include_images = self.settings.get("INCLUDE_IMAGES")
         self.output_path_label = QLabel("Output Path:")
         self.output_path_combobox = QComboBox(self)
         self.output_path_combobox.addItems(["Source Path", "Default Path", "Specified Path"])
-        if self.settings["OUTPUT_PATH"] == "\\":
+        if output_path == "\\":
             self.output_path_combobox.setCurrentText("Default Path")
-        elif self.settings["OUTPUT_PATH"] is None:
+        elif output_path is None:
             self.output_path_combobox.setCurrentText("Source Path")
         else:
             self.output_path_combobox.setCurrentText("Specified Path")
@@ -247,20 +286,20 @@ class OutputSettings(QWidget):
         self.specified_label = QLabel("Specified Path:")
         self.specified_entry = QLineEdit(self)
         self.specified_entry.setText(
-            self.settings["OUTPUT_PATH"] if self.output_path_combobox.currentText() == "Specified Path" else ""
+            output_path if self.output_path_combobox.currentText() == "Specified Path" else ""
         )
         self.specified_entry.textChanged.connect(self.set_output_path)
 
         self.checkbox_image1 = QCheckBox("New Copy")
-        self.checkbox_image1.setChecked(self.settings["INCLUDE_IMAGES"]["New Copy"])
+        self.checkbox_image1.setChecked(include_images["New Copy"])
         self.checkbox_image2 = QCheckBox("Old Copy")
-        self.checkbox_image2.setChecked(self.settings["INCLUDE_IMAGES"]["Old Copy"])
+        self.checkbox_image2.setChecked(include_images["Old Copy"])
         self.checkbox_image3 = QCheckBox("Markup")
-        self.checkbox_image3.setChecked(self.settings["INCLUDE_IMAGES"]["Markup"])
+        self.checkbox_image3.setChecked(include_images["Markup"])
         self.checkbox_image4 = QCheckBox("Difference")
-        self.checkbox_image4.setChecked(self.settings["INCLUDE_IMAGES"]["Difference"])
+        self.checkbox_image4.setChecked(include_images["Difference"])
         self.checkbox_image5 = QCheckBox("Overlay")
-        self.checkbox_image5.setChecked(self.settings["INCLUDE_IMAGES"]["Overlay"])
+        self.checkbox_image5.setChecked(include_images["Overlay"])
 
         self.checkbox_image1.stateChanged.connect(self.set_output_images)
         self.checkbox_image2.stateChanged.connect(self.set_output_images)
@@ -269,25 +308,25 @@ class OutputSettings(QWidget):
         self.checkbox_image5.stateChanged.connect(self.set_output_images)
 
         self.scaling_checkbox = QCheckBox("Scale Pages")
-        self.scaling_checkbox.setChecked(self.settings["SCALE_OUTPUT"])
+        self.scaling_checkbox.setChecked(self.settings.get("SCALE_OUTPUT"))
         self.scaling_checkbox.stateChanged.connect(self.set_scaling)
 
         self.bw_checkbox = QCheckBox("Black/White")
-        self.bw_checkbox.setChecked(self.settings["OUTPUT_BW"])
+        self.bw_checkbox.setChecked(self.settings.get("OUTPUT_BW"))
         self.bw_checkbox.stateChanged.connect(self.set_bw)
 
         self.gs_checkbox = QCheckBox("Grayscale")
-        self.gs_checkbox.setChecked(self.settings["OUTPUT_GS"])
+        self.gs_checkbox.setChecked(self.settings.get("OUTPUT_GS"))
         self.gs_checkbox.stateChanged.connect(self.set_gs)
 
         self.reduce_checkbox = QCheckBox("Reduce Size")
-        self.reduce_checkbox.setChecked(self.settings["REDUCE_FILESIZE"])
+        self.reduce_checkbox.setChecked(self.settings.get("REDUCE_FILESIZE"))
         self.reduce_checkbox.stateChanged.connect(self.set_reduced_filesize)
 
         self.main_page_label = QLabel("Main Page:")
         self.main_page_combobox = QComboBox(self)
         self.main_page_combobox.addItems(["New Document", "Old Document"])
-        self.main_page_combobox.setCurrentText(self.settings["MAIN_PAGE"])
+        self.main_page_combobox.setCurrentText(self.settings.get("MAIN_PAGE"))
         self.main_page_combobox.currentTextChanged.connect(self.set_main_page)
 
         output_path_group = QGroupBox("Output Settings")
@@ -407,45 +446,37 @@ class OutputSettings(QWidget):
 
     def set_output_path(self, option):
         if option == "Source Path":
-            self.settings["OUTPUT_PATH"] = None
+            self.settings.set("OUTPUT_PATH", None)
         elif option == "Default Path":
-            self.settings["OUTPUT_PATH"] = "\\"
+            self.settings.set("OUTPUT_PATH", "\\")
         else:
             raw = self.specified_entry.text().strip()
             if raw:
                 normalized = raw.replace("/", "\\")
                 if not normalized.endswith("\\"):
                     normalized += "\\"
-                self.settings["OUTPUT_PATH"] = normalized
+                self.settings.set("OUTPUT_PATH", normalized)
             else:
-                self.settings["OUTPUT_PATH"] = None
-
-        save_settings(self.settings)
+                self.settings.set("OUTPUT_PATH", None)
 
     def set_output_images(self, state):
         checkbox = self.sender()
-        self.settings["INCLUDE_IMAGES"][checkbox.text()] = state == 2
-        save_settings(self.settings)
+        self.settings.set_item("INCLUDE_IMAGES", checkbox.text(), state == 2)
 
     def set_scaling(self, state):
-        self.settings["SCALE_OUTPUT"] = state == 2
-        save_settings(self.settings)
+        self.settings.set("SCALE_OUTPUT", state == 2)
 
     def set_bw(self, state):
-        self.settings["OUTPUT_BW"] = state == 2
-        save_settings(self.settings)
+        self.settings.set("OUTPUT_BW", state == 2)
 
     def set_gs(self, state):
-        self.settings["OUTPUT_GS"] = state == 2
-        save_settings(self.settings)
+        self.settings.set("OUTPUT_GS", state == 2)
 
     def set_reduced_filesize(self, state):
-        self.settings["REDUCE_FILESIZE"] = state == 2
-        save_settings(self.settings)
+        self.settings.set("REDUCE_FILESIZE", state == 2)
 
     def set_main_page(self, page):
-        self.settings["MAIN_PAGE"] = page
-        save_settings(self.settings)
+        self.settings.set("MAIN_PAGE", page)
 
 
 class SettingsDialog(QDialog):
@@ -625,10 +656,10 @@ class DragDropLabel(QPushButton):
         self.file_path = file_path
         if self._parent.files is None:
             self._parent.files = [None, None]
-        if self.role == "new":
-            self._parent.files[0] = file_path
-        else:
-            self._parent.files[1] = file_path
+        index = 0 if self.role == "new" else 1
+        self._parent.files[index] = file_path
+        # a pending (unsaved) rotation belongs to the previous file
+        self._parent.page_rotations[index] = 0
         self._update_style()
 
 
@@ -705,8 +736,10 @@ class MainWindow(QMainWindow):
         self.title_bar.setObjectName("TitleBar")
         self.setMenuWidget(self.title_bar)
 
-        self.settings = load_settings()
+        self.settings = get_settings_store()
         self.files = None
+        # pending per-document rotation in degrees, same order as self.files (new, old)
+        self.page_rotations = [0, 0]
         self.compare_thread: Optional["CompareThread"] = None
         self.progress_window: Optional["ProgressWindow"] = None
 
@@ -765,15 +798,15 @@ class MainWindow(QMainWindow):
         self.dpi_label = QLabel("DPI:", self)
         self.dpi_label.setAlignment(Qt.AlignmentFlag.AlignBottom)
         self.dpi_combo = QComboBox(self)
-        self.dpi_combo.addItems(self.settings["DPI_LABELS"])
-        self.dpi_combo.setCurrentText(self.settings["DPI"])
+        self.dpi_combo.addItems(self.settings.get("DPI_LABELS"))
+        self.dpi_combo.setCurrentText(self.settings.get("DPI"))
         self.dpi_combo.currentTextChanged.connect(self.update_dpi)
 
         self.page_label = QLabel("Page Size:", self)
         self.page_label.setAlignment(Qt.AlignmentFlag.AlignBottom)
         self.page_combo = QComboBox(self)
-        self.page_combo.addItems(list(self.settings["PAGE_SIZES"].keys()))
-        self.page_combo.setCurrentText(self.settings["PAGE_SIZE"])
+        self.page_combo.addItems(list(self.settings.get("PAGE_SIZES").keys()))
+        self.page_combo.setCurrentText(self.settings.get("PAGE_SIZE"))
         self.page_combo.currentTextChanged.connect(self.update_page_size)
 
         layout.addWidget(self.compare_button)
@@ -848,6 +881,7 @@ class MainWindow(QMainWindow):
     def swap_files(self):
         if self.files and self.files[0] and self.files[1]:
             self.files = [self.files[1], self.files[0]]
+            self.page_rotations = [self.page_rotations[1], self.page_rotations[0]]
             self.drop_label_old.file_path = self.files[1]
             self.drop_label_new.file_path = self.files[0]
             self.drop_label_old._update_style()
@@ -855,19 +889,18 @@ class MainWindow(QMainWindow):
 
     def update_dpi(self, dpi):
         if dpi:
-            self.settings["DPI"] = dpi
-            self.settings["DPI_LEVEL"] = self.settings["DPI_LEVELS"][self.settings["DPI_LABELS"].index(dpi)]
-            save_settings(self.settings)
+            dpi_levels = self.settings.get("DPI_LEVELS")
+            dpi_labels = self.settings.get("DPI_LABELS")
+            self.settings.update({"DPI": dpi, "DPI_LEVEL": dpi_levels[dpi_labels.index(dpi)]})
 
     def update_page_size(self, page_size):
-        self.settings["PAGE_SIZE"] = page_size
-        save_settings(self.settings)
+        self.settings.set("PAGE_SIZE", page_size)
 
     def compare(self):
         if self.files and len(self.files) == 2 and self.files[0] and self.files[1]:
             self.progress_window = ProgressWindow()
             self.progress_window.show()
-            self.compare_thread = CompareThread(self.files, self.progress_window, self)
+            self.compare_thread = CompareThread(self.files, self.progress_window, self, rotations=self.page_rotations)
             self.compare_thread.finished.connect(self._thread_cleanup)
             self.compare_thread.start()
 
@@ -880,9 +913,11 @@ class CompareThread(QThread):
     compareComplete = Signal(int)
     logMessage = Signal(str)
 
-    def __init__(self, files: List[str], progress_window: ProgressWindow, parent=None):
+    def __init__(self, files: List[str], progress_window: Optional[ProgressWindow], parent=None,
+                 rotations: Optional[List[int]] = None):
         super().__init__(parent)
-        compare_settings = load_settings()
+        # immutable per-job copy: settings edited mid-run do not affect this job
+        compare_settings = get_settings_store().snapshot()
 
         self.DPI_LEVEL = compare_settings.get("DPI_LEVEL", 600)
         self.PAGE_SIZE_NAME = compare_settings.get("PAGE_SIZE", "AUTO")
@@ -897,8 +932,43 @@ class CompareThread(QThread):
         self.REDUCE_FILESIZE = compare_settings.get("REDUCE_FILESIZE", False)
         self.TEXT_MIN_DIFF_LENGTH = int(compare_settings.get("TEXT_MIN_DIFF_LENGTH", 2))
         self.NORMALIZE_TEXT = bool(compare_settings.get("NORMALIZE_TEXT", True))
+        # rules of the normalization pipeline; NORMALIZE_TEXT off leaves only the stripping
+        self.NORMALIZE_RULES = tuple(compare_settings.get("NORMALIZE_RULES", DEFAULT_RULES))
+        self.AUTO_ORIENT = bool(compare_settings.get("AUTO_ORIENT", False))
+        # raster diff of pages without a text layer (FORCE_OCR: of every page)
+        self.FORCE_OCR = bool(compare_settings.get("FORCE_OCR", False))
+        self.THRESHOLD = int(compare_settings.get("THRESHOLD", 128))
+        self.MIN_AREA = int(compare_settings.get("MIN_AREA", 100))
+        self.RASTER_DIFF_DPI = int(compare_settings.get("RASTER_DIFF_DPI", 100))
+        self.VECTOR_DIFF = bool(compare_settings.get("VECTOR_DIFF", True))
+        self.VECTOR_TOLERANCE = float(compare_settings.get("VECTOR_TOLERANCE", 0.5))
+        self.IMAGE_DIFF = bool(compare_settings.get("IMAGE_DIFF", True))
+        # highlight padding in rendered pixels, merge gap between boxes on a line in points
+        self.VECTOR_BOX_PADDING = int(compare_settings.get("VECTOR_BOX_PADDING", 2))
+        self.OCR_MERGE_DIST_H = float(compare_settings.get("OCR_MERGE_DIST_H", 5))
+        # shortest run of tokens reported as a moved block (0 disables move detection)
+        self.MOVE_MIN_TOKENS = int(compare_settings.get("MOVE_MIN_TOKENS", 8))
+        # replacements of at most this many tokens per side are highlighted per character (0 disables)
+        self.REFINE_MAX_TOKENS = int(compare_settings.get("REFINE_MAX_TOKENS", 3))
+        # memory budget of the display lists reused across the renders of a page
+        self.DISPLAY_LIST_BUDGET_MB = int(compare_settings.get("DISPLAY_LIST_BUDGET_MB", 256))
+        self.display_lists = DisplayListCache(self.DISPLAY_LIST_BUDGET_MB * 1024 * 1024)
+        # expensive renders kept on disk across runs, in front of the display lists
+        self.RASTER_CACHE = bool(compare_settings.get("RASTER_CACHE", True))
+        self.RASTER_CACHE_MB = int(compare_settings.get("RASTER_CACHE_MB", 1024))
+        self.rasters = RasterCache(self.RASTER_CACHE_MB * 1024 * 1024 if self.RASTER_CACHE else 0, self.display_lists)
+        # page words by file digest, so each revision of a chain is parsed once
+        self.WORD_CACHE = bool(compare_settings.get("WORD_CACHE", True))
+        self.WORD_CACHE_MB = int(compare_settings.get("WORD_CACHE_MB", 128))
+        self.words = WordCache(self.WORD_CACHE_MB * 1024 * 1024 if self.WORD_CACHE else 0)
+        # diffs and output PDFs of earlier runs, reused when inputs and settings match
+        self.RESULT_CACHE = bool(compare_settings.get("RESULT_CACHE", True))
+        self.RESULT_CACHE_MB = int(compare_settings.get("RESULT_CACHE_MB", 512))
+        self.result_cache = ResultCache(self.RESULT_CACHE_MB * 1024 * 1024) if self.RESULT_CACHE else None
 
         self.files = files
+        # extra rotation applied in memory to every page, aligned with files; the files are never rewritten
+        self.rotations = list(rotations) if rotations else [0, 0]
         self.progress_window = progress_window
         self.statistics = {
             "NUM_PAGES": 0,
@@ -907,49 +977,87 @@ class CompareThread(QThread):
             "PAGES_WITH_DIFFERENCES": [],
             "ADDED_COUNT": 0,
             "DELETED_COUNT": 0,
+            "RASTER_COUNT": 0,
+            "VECTOR_COUNT": 0,
+            "IMAGE_COUNT": 0,
+            "MOVED_COUNT": 0,
+            "IDENTICAL_PAGES": 0,
         }
 
-        self.progressUpdated.connect(self.progress_window.update_progress)
-        self.logMessage.connect(self.progress_window.update_log)
-        self.compareComplete.connect(self.progress_window.operation_complete)
+        # without a progress window (headless jobs) the signals simply go unheard
+        if progress_window is not None:
+            self.progressUpdated.connect(self.progress_window.update_progress)
+            self.logMessage.connect(self.progress_window.update_log)
+            self.compareComplete.connect(self.progress_window.operation_complete)
 
     def run(self):
         try:
             self.handle_files(self.files)
-        except fitz.fitz.FileDataError as error:
+        except fitz.FileDataError as error:
             self.logMessage.emit(f"Error opening file: {error}")
         except Exception as error:
             self.logMessage.emit(f"Unhandled comparison error: {error}")
 
-    def _normalize_text(self, text: str) -> str:
-        text = text.strip()
-        if self.NORMALIZE_TEXT:
-            text = text.lower()
-            text = re.sub(r"[\s\t\r\n]+", "", text)
-            text = re.sub(r"[\.,;:()\[\]{}<>\-_=+`~\"']+", "", text)
-        return text
+    @staticmethod
+    def _apply_rotation(doc: fitz.Document, rotation: int) -> None:
+        rotation %= 360
+        if not rotation:
+            return
+        for page in doc:
+            page.set_rotation((page.rotation + rotation) % 360)
+
+    @staticmethod
+    def _apply_page_rotations(doc: fitz.Document, rotations: Dict[int, int]) -> None:
+        for page_index, rotation in rotations.items():
+            page = doc.load_page(page_index)
+            page.set_rotation((page.rotation + rotation) % 360)
+
+    def _normalizer(self):
+        return get_normalizer(self.NORMALIZE_RULES if self.NORMALIZE_TEXT else ())
+
+    def _tokens_from_words(self, words: List[Word], page_num: int, normalizer) -> List[Dict]:
+        # one normalization pass per page rather than one call per word
+        norms = normalizer.normalize_many([word[4] for word in words])
+        return [
+            {
+                "text": word[4],
+                "norm": norm,
+                "page": page_num,
+                "rect": fitz.Rect(word[0], word[1], word[2], word[3]),
+            }
+            for word, norm in zip(words, norms)
+            if len(norm) >= self.TEXT_MIN_DIFF_LENGTH
+        ]
 
-    def _extract_tokens(self, doc: fitz.Document) -> List[Dict]:
+    def _orient(self, doc: fitz.Document, file_path: str, rotation: int, label: str) -> Dict[int, int]:
+        """Turn the pages of *doc* upright (AUTO_ORIENT) or by *rotation*; return the auto-orientation corrections."""
+        if not self.AUTO_ORIENT:
+            self._apply_rotation(doc, rotation)
+            return {}
+        # detected from the file on disk, so it supersedes a pending manual rotation
+        self.logMessage.emit(f"Detecting page orientation of {label} document...")
+        corrections = detect_orientations(file_path)
+        self._apply_page_rotations(doc, corrections)
+        self.logMessage.emit(f"Turned {len(corrections)} page(s) of the {label} document upright.")
+        return corrections
+
+    def _extract_tokens(self, doc: fitz.Document, skip_pages: Set[int] = frozenset(),
+                        digest: Optional[bytes] = None) -> List[Dict]:
+        normalizer = self._normalizer()
+        # words of this file extracted by earlier comparisons, e.g. as the other side of a revision chain
+        cached_words = self.words.load(digest)
+        extracted = False
         tokens = []
         for page_num in range(doc.page_count):
-            page = doc.load_page(page_num)
-            words = page.get_text("words")
-            words.sort(key=lambda word: (word[5], word[6], word[7], word[1], word[0]))
-            for word in words:
-                raw = (word[4] or "").strip()
-                if not raw:
-                    continue
-                norm = self._normalize_text(raw)
-                if len(norm) < self.TEXT_MIN_DIFF_LENGTH:
-                    continue
-                tokens.append(
-                    {
-                        "text": raw,
-                        "norm": norm,
-                        "page": page_num,
-                        "rect": fitz.Rect(word[0], word[1], word[2], word[3]),
-                    }
-                )
+            if page_num in skip_pages:
+                continue
+            words = cached_words.get(page_num)
+            if words is None:
+                words = cached_words[page_num] = page_words(doc.load_page(page_num))
+                extracted = True
+            tokens.extend(self._tokens_from_words(words, page_num, normalizer))
+        if extracted:
+            self.words.store(digest, cached_words)
         return tokens
 
     @staticmethod
@@ -969,24 +1077,46 @@ class CompareThread(QThread):
         return rect_map
 
     def _build_diff_entries(self, old_tokens: List[Dict], new_tokens: List[Dict]) -> List[Dict]:
-        old_norm = [token["norm"] for token in old_tokens]
-        new_norm = [token["norm"] for token in new_tokens]
-        matcher = SequenceMatcher(None, old_norm, new_norm, autojunk=False)
+        # integer IDs hash and compare faster than the strings themselves
+        old_ids, new_ids = token_ids(
+            [token["norm"] for token in old_tokens],
+            [token["norm"] for token in new_tokens],
+        )
+        matcher = SequenceMatcher(None, old_ids, new_ids, autojunk=False)
+        return self._opcode_entries(old_tokens, new_tokens, old_ids, new_ids, matcher.get_opcodes())
+
+    def _opcode_entries(self, old_tokens: List[Dict], new_tokens: List[Dict], old_ids: List[int],
+                        new_ids: List[int], opcodes: List[Tuple[str, int, int, int, int]]) -> List[Dict]:
+        """Diff entries (moves included) for the *opcodes* of a sequence match of the two token lists."""
+        opcodes = [opcode for opcode in opcodes if opcode[0] != "equal"]
+
+        # a moved section shows up as a deletion plus an addition: pair them up first
+        moves = []
+        if self.MOVE_MIN_TOKENS > 0:
+            moves = find_moves(
+                old_ids,
+                new_ids,
+                [(i1, i2) for _, i1, i2, _, _ in opcodes if i2 > i1],
+                [(j1, j2) for _, _, _, j1, j2 in opcodes if j2 > j1],
+                self.MOVE_MIN_TOKENS,
+            )
+        moved_old = bytearray(len(old_tokens))
+        moved_new = bytearray(len(new_tokens))
+        for old_start, new_start, length in moves:
+            moved_old[old_start:old_start + length] = b"\x01" * length
+            moved_new[new_start:new_start + length] = b"\x01" * length
 
         entries = []
-        for opcode, i1, i2, j1, j2 in matcher.get_opcodes():
-            if opcode == "equal":
-                continue
-
-            old_slice = old_tokens[i1:i2]
-            new_slice = new_tokens[j1:j2]
+        for _, i1, i2, j1, j2 in opcodes:
+            old_slice = [old_tokens[index] for index in range(i1, i2) if not moved_old[index]]
+            new_slice = [new_tokens[index] for index in range(j1, j2) if not moved_new[index]]
             old_desc = self._tokens_to_text(old_slice)
             new_desc = self._tokens_to_text(new_slice)
 
             if old_desc == "无" and new_desc == "无":
                 continue
 
-            entry_type = "replace" if opcode == "replace" else ("delete" if opcode == "delete" else "add")
+            entry_type = "replace" if old_slice and new_slice else ("delete" if old_slice else "add")
             old_rects = self._group_rects_by_page(old_slice)
             new_rects = self._group_rects_by_page(new_slice)
 
@@ -999,61 +1129,287 @@ class CompareThread(QThread):
                 "old_rects": old_rects,
                 "new_rects": new_rects,
             }
+            if entry_type == "replace" and max(len(old_slice), len(new_slice)) <= self.REFINE_MAX_TOKENS:
+                # kept for _refine_replacements, which narrows the rects to the changed characters
+                entry["old_tokens"] = old_slice
+                entry["new_tokens"] = new_slice
             entries.append(entry)
 
+        for old_start, new_start, length in moves:
+            old_slice = old_tokens[old_start:old_start + length]
+            new_slice = new_tokens[new_start:new_start + length]
+            entries.append(
+                {
+                    "type": "move",
+                    "old_desc": self._tokens_to_text(old_slice),
+                    "old_page": old_slice[0]["page"] + 1,
+                    "new_desc": self._tokens_to_text(new_slice),
+                    "new_page": new_slice[0]["page"] + 1,
+                    "old_rects": self._group_rects_by_page(old_slice),
+                    "new_rects": self._group_rects_by_page(new_slice),
+                }
+            )
+
         return entries
 
     @staticmethod
-    def _render_page(doc: fitz.Document, page_index: int, dpi: int) -> Tuple[Image.Image, fitz.Rect]:
+    def _page_chars(page: fitz.Page, clip: fitz.Rect) -> List[Tuple[str, fitz.Rect]]:
+        """Non-blank characters with their boxes, extracted only inside *clip*."""
+        textpage = page.get_textpage(clip=clip)
+        chars = []
+        for block in page.get_text("rawdict", textpage=textpage)["blocks"]:
+            for line in block.get("lines", ()):
+                for span in line["spans"]:
+                    for char in span["chars"]:
+                        if not char["c"].isspace():
+                            chars.append((char["c"], fitz.Rect(char["bbox"])))
+        return chars
+
+    @staticmethod
+    def _char_rects(token: Dict, positions: List[int], page_chars: List[Tuple[str, fitz.Rect]]) -> List[fitz.Rect]:
+        """Rects covering the characters at *positions* of *token*; the whole word if they cannot be located."""
+        word_rect = token["rect"]
+        search_rect = fitz.Rect(word_rect.x0 - 1, word_rect.y0 - 1, word_rect.x1 + 1, word_rect.y1 + 1)
+        chars = sorted(
+            (item for item in page_chars if fitz.Point((item[1].x0 + item[1].x1) / 2, (item[1].y0 + item[1].y1) / 2) in search_rect),
+            key=lambda item: item[1].x0,
+        )
+        if "".join(char for char, _ in chars) != token["text"]:
+            return [word_rect]
+
+        rects = []
+        for position in positions:
+            box = chars[position][1]
+            # consecutive characters share one rect
+            if rects and position - 1 in positions:
+                rects[-1] |= box
+            else:
+                rects.append(fitz.Rect(box))
+        return rects
+
+    def _refine_replacements(self, entries: List[Dict], old_doc: fitz.Document, new_doc: fitz.Document) -> None:
+        """Narrow small replace entries from whole words to the characters that changed.
+
+        Character boxes come from ``rawdict`` extraction clipped to the affected
+        words, one clipped text page per page, so the cost is independent of
+        document size.
+        """
+        pending = [entry for entry in entries if "old_tokens" in entry]
+        if not pending:
+            return
+
+        changed_positions = []
+        for entry in pending:
+            old_text = " ".join(token["text"] for token in entry["old_tokens"])
+            new_text = " ".join(token["text"] for token in entry["new_tokens"])
+            old_changed, new_changed = set(), set()
+            for opcode, i1, i2, j1, j2 in SequenceMatcher(None, old_text, new_text, autojunk=False).get_opcodes():
+                if opcode == "equal":
+                    continue
+                # a pure insertion or deletion marks the neighbouring character on the other side
+                old_changed.update(range(i1, i2) if i2 > i1 else [min(i1, len(old_text) - 1)])
+                new_changed.update(range(j1, j2) if j2 > j1 else [min(j1, len(new_text) - 1)])
+            changed_positions.append((old_changed, new_changed))
+
+        for side, doc, side_index in (("old", old_doc, 0), ("new", new_doc, 1)):
+            clips: Dict[int, fitz.Rect] = {}
+            for entry in pending:
+                for token in entry[f"{side}_tokens"]:
+                    clip = clips.get(token["page"])
+                    # Rect has no in-place union: store the result back
+                    clips[token["page"]] = fitz.Rect(token["rect"]) if clip is None else clip | token["rect"]
+            page_chars = {
+                page_index: self._page_chars(doc.load_page(page_index), clip + (-2, -2, 2, 2))
+                for page_index, clip in clips.items()
+            }
+
+            for entry, positions in zip(pending, changed_positions):
+                changed = positions[side_index]
+                rect_map: Dict[int, List[fitz.Rect]] = {}
+                offset = 0
+                for token in entry[f"{side}_tokens"]:
+                    token_positions = sorted(index - offset for index in changed if offset <= index < offset + len(token["text"]))
+                    offset += len(token["text"]) + 1
+                    if token_positions:
+                        rect_map.setdefault(token["page"], []).extend(
+                            self._char_rects(token, token_positions, page_chars[token["page"]])
+                        )
+                entry[f"{side}_rects"] = rect_map
+
+        for entry in pending:
+            del entry["old_tokens"], entry["new_tokens"]
+
+    def _build_raster_entries(self, old_doc: fitz.Document, new_doc: fitz.Document, page_indices: List[int]) -> List[Dict]:
+        entries = []
+        for page_index in page_indices:
+            regions = raster_diff.diff_pages(
+                old_doc.load_page(page_index),
+                new_doc.load_page(page_index),
+                self.RASTER_DIFF_DPI,
+                self.THRESHOLD,
+                self.MIN_AREA,
+                self.rasters,
+            )
+            for old_rect, new_rect in regions:
+                entries.append(
+                    {
+                        "type": "raster",
+                        "old_desc": f"Image region ({old_rect.x0:.0f}, {old_rect.y0:.0f}, {old_rect.x1:.0f}, {old_rect.y1:.0f})",
+                        "old_page": page_index + 1,
+                        "new_desc": f"Image region ({new_rect.x0:.0f}, {new_rect.y0:.0f}, {new_rect.x1:.0f}, {new_rect.y1:.0f})",
+                        "new_page": page_index + 1,
+                        "old_rects": {page_index: [old_rect]},
+                        "new_rects": {page_index: [new_rect]},
+                    }
+                )
+        return entries
+
+    def _build_vector_entries(self, old_doc: fitz.Document, new_doc: fitz.Document, page_indices: List[int],
+                              drawn_pages: Optional[Set[int]] = None) -> List[Dict]:
+        """Drawing entries of *page_indices*; pages with linework on either
+        side are added to *drawn_pages*."""
+        entries = []
+        for page_index in page_indices:
+            old_primitives = vector_diff.extract_primitives(old_doc.load_page(page_index), self.VECTOR_TOLERANCE)
+            new_primitives = vector_diff.extract_primitives(new_doc.load_page(page_index), self.VECTOR_TOLERANCE)
+            if drawn_pages is not None and (old_primitives or new_primitives):
+                drawn_pages.add(page_index)
+            removed, added = vector_diff.diff_primitives(old_primitives, new_primitives)
+            if not removed and not added:
+                continue
+            entries.append(
+                {
+                    "type": "vector",
+                    "old_desc": f"{len(removed)} drawing element(s) removed" if removed else "无",
+                    "old_page": page_index + 1,
+                    "new_desc": f"{len(added)} drawing element(s) added" if added else "无",
+                    "new_page": page_index + 1,
+                    "old_rects": {page_index: removed} if removed else {},
+                    "new_rects": {page_index: added} if added else {},
+                }
+            )
+        return entries
+
+    def _build_image_entries(self, old_doc: fitz.Document, new_doc: fitz.Document, page_indices: List[int]) -> List[Dict]:
+        # digests are cached per xref, so images shared across pages are hashed once
+        old_digests, new_digests = image_diff.ImageDigests(old_doc), image_diff.ImageDigests(new_doc)
+        entries = []
+        for page_index in page_indices:
+            changes = image_diff.diff_pages(
+                old_doc.load_page(page_index),
+                new_doc.load_page(page_index),
+                old_digests,
+                new_digests,
+                self.VECTOR_TOLERANCE,
+            )
+            for kind, old_rect, new_rect in changes:
+                entries.append(
+                    {
+                        "type": "image",
+                        "old_desc": f"Image {kind} ({old_rect.x0:.0f}, {old_rect.y0:.0f}, {old_rect.x1:.0f}, {old_rect.y1:.0f})" if old_rect else "无",
+                        "old_page": page_index + 1,
+                        "new_desc": f"Image {kind} ({new_rect.x0:.0f}, {new_rect.y0:.0f}, {new_rect.x1:.0f}, {new_rect.y1:.0f})" if new_rect else "无",
+                        "new_page": page_index + 1,
+                        "old_rects": {page_index: [old_rect]} if old_rect else {},
+                        "new_rects": {page_index: [new_rect]} if new_rect else {},
+                    }
+                )
+        return entries
+
+    @contextmanager
+    def _antialiasing(self):
+        """Lower MuPDF's anti-aliasing for B/W output, whose edges are thresholded anyway."""
+        if not self.OUTPUT_BW or self.OUTPUT_GS:
+            yield
+            return
+        # the level is global to MuPDF, so it is restored right after the page's renders
+        previous = fitz.TOOLS.show_aa_level()["graphics"]
+        fitz.TOOLS.set_aa_level(min(previous, BW_AA_LEVEL))
+        try:
+            yield
+        finally:
+            fitz.TOOLS.set_aa_level(previous)
+
+    def _target_size(self) -> Optional[Tuple[int, int]]:
+        """Pixel size of the output pages when a page size preset applies, else ``None``."""
+        if not self.SCALE_OUTPUT or self.PAGE_SIZE[0] is None or self.PAGE_SIZE[1] is None:
+            return None
+        return int(self.PAGE_SIZE[0] * self.DPI_LEVEL), int(self.PAGE_SIZE[1] * self.DPI_LEVEL)
+
+    def _render_matrix(self, page: fitz.Page) -> fitz.Matrix:
+        # scale straight to the preset page size instead of resampling afterwards
+        target = self._target_size()
+        if target is None:
+            return fitz.Matrix(self.DPI_LEVEL / 72, self.DPI_LEVEL / 72)
+        rect = page.rect
+        return fitz.Matrix(target[0] / max(rect.width, 1), target[1] / max(rect.height, 1))
+
+    def _render_page(self, doc: fitz.Document, page_index: int) -> Tuple[Image.Image, fitz.Page]:
+        # gray and black/white output never need colour, so MuPDF renders one channel
+        gray = self.OUTPUT_GS or self.OUTPUT_BW
         if page_index < doc.page_count:
             page = doc.load_page(page_index)
-            pix = page.get_pixmap(dpi=dpi)
-            image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-            return image, page.rect
+            pix = self.rasters.get_pixmap(page, matrix=self._render_matrix(page),
+                                          colorspace=fitz.csGRAY if gray else fitz.csRGB, alpha=False)
+            # the image is the only copy of the samples, and marking draws into it in place
+            return pixmap_to_image(pix), page
 
+        # filler for a page the other document lacks: same size as its first page, nothing rendered
         first_page = doc.load_page(0)
-        pix = first_page.get_pixmap(dpi=dpi)
-        return Image.new("RGB", (pix.width, pix.height), (255, 255, 255)), first_page.rect
+        size = (first_page.rect * self._render_matrix(first_page)).irect
+        return Image.new("L" if gray else "RGB", (size.width, size.height), 255 if gray else (255, 255, 255)), first_page
 
     @staticmethod
-    def _draw_rectangles(image: Image.Image, page_rect: fitz.Rect, rects: List[fitz.Rect], color: Tuple[int, int, int]):
+    def _draw_rectangles(image: Image.Image, page: fitz.Page, rects: List[fitz.Rect], color: Tuple[int, int, int],
+                         padding: int = 2):
         if not rects:
             return image
 
+        # highlight rects are in unrotated page space, the render shows the page as displayed
+        rotation_matrix = page.rotation_matrix
+        rects = [rect * rotation_matrix for rect in rects]
+        page_rect = page.rect
         x_scale = image.width / max(page_rect.width, 1)
         y_scale = image.height / max(page_rect.height, 1)
         stroke = max(1, int(min(image.width, image.height) / 800))
 
-        overlay = Image.new("RGBA", image.size, (0, 0, 0, 0))
-        overlay_draw = ImageDraw.Draw(overlay)
-        fill_color = (*color, 50)
-        outline_color = (*color, 160)
-
+        boxes = []
         for rect in rects:
-            x0 = max(0, int(rect.x0 * x_scale) - 2)
-            y0 = max(0, int(rect.y0 * y_scale) - 2)
-            x1 = min(image.width - 1, int(rect.x1 * x_scale) + 2)
-            y1 = min(image.height - 1, int(rect.y1 * y_scale) + 2)
-            overlay_draw.rectangle((x0, y0, x1, y1), fill=fill_color, outline=outline_color, width=stroke)
-
-        image_rgba = image.convert("RGBA")
-        composited = Image.alpha_composite(image_rgba, overlay)
-        return composited.convert("RGB")
-
-    def _resize_if_needed(self, image: Image.Image) -> Image.Image:
-        if not self.SCALE_OUTPUT:
+            x0 = max(0, int(rect.x0 * x_scale) - padding)
+            y0 = max(0, int(rect.y0 * y_scale) - padding)
+            x1 = min(image.width - 1, int(rect.x1 * x_scale) + padding)
+            y1 = min(image.height - 1, int(rect.y1 * y_scale) + padding)
+            if x1 >= x0 and y1 >= y0:
+                boxes.append((x0, y0, x1, y1))
+        if not boxes:
             return image
+        if image.mode == "L":
+            # gray renders take the colour's luma, as converting the marked RGB render would give
+            color = (color[0] * 299 + color[1] * 587 + color[2] * 114) // 1000
+
+        # one coverage mask over the boxes' extent: pasting the colour through it
+        # blends in place, with no RGBA copy of the page
+        left, top = min(box[0] for box in boxes), min(box[1] for box in boxes)
+        right, bottom = max(box[2] for box in boxes) + 1, max(box[3] for box in boxes) + 1
+        mask = Image.new("L", (right - left, bottom - top), 0)
+        mask_draw = ImageDraw.Draw(mask)
+        for x0, y0, x1, y1 in boxes:
+            mask_draw.rectangle((x0 - left, y0 - top, x1 - left, y1 - top), fill=50, outline=160, width=stroke)
+        image.paste(color, (left, top, right, bottom), mask)
+        return image
 
-        if self.PAGE_SIZE[0] is None or self.PAGE_SIZE[1] is None:
+    def _resize_if_needed(self, image: Image.Image) -> Image.Image:
+        target = self._target_size()
+        # renders already come out at the target size; only fillers of odd pages may not
+        if target is None or image.size == target:
             return image
-
-        return image.resize((int(self.PAGE_SIZE[0] * self.DPI_LEVEL), int(self.PAGE_SIZE[1] * self.DPI_LEVEL)))
+        return image.resize(target)
 
     @staticmethod
     def _combine_side_by_side(left: Image.Image, right: Image.Image) -> Image.Image:
         height = max(left.height, right.height)
         width = left.width + right.width
-        merged = Image.new("RGB", (width, height), (255, 255, 255))
+        merged = Image.new(left.mode, (width, height), 255 if left.mode == "L" else (255, 255, 255))
         merged.paste(left, (0, 0))
         merged.paste(right, (left.width, 0))
         return merged
@@ -1078,6 +1434,11 @@ class CompareThread(QThread):
             f"Total Differences: {self.statistics['TOTAL_DIFFERENCES']}",
             f"Deleted Segments: {self.statistics['DELETED_COUNT']}",
             f"Added Segments: {self.statistics['ADDED_COUNT']}",
+            f"Changed Image Regions: {self.statistics['RASTER_COUNT']}",
+            f"Pages With Drawing Changes: {self.statistics['VECTOR_COUNT']}",
+            f"Changed Embedded Images: {self.statistics['IMAGE_COUNT']}",
+            f"Moved Blocks: {self.statistics['MOVED_COUNT']}",
+            f"Identical Pages (not rendered): {self.statistics['IDENTICAL_PAGES']}",
             "",
             "Structured Diff Summary:",
             "",
@@ -1112,16 +1473,306 @@ class CompareThread(QThread):
             return output_dir
         return path.dirname(source_file)
 
+    def _output_path(self, source_file: str) -> str:
+        output_dir = self._resolve_output_dir(source_file)
+        stem = path.splitext(path.basename(source_file))[0]
+        output_path = path.join(output_dir, f"{stem} Comparison.pdf")
+        output_iterator = 0
+        while path.exists(output_path):
+            output_iterator += 1
+            output_path = path.join(output_dir, f"{stem} Comparison Rev {output_iterator}.pdf")
+        return output_path
+
+    def _diff_settings(self, old_index: int, new_index: int) -> Dict:
+        """Every setting that influences the diff entries or highlights."""
+        settings = {
+            name: getattr(self, name)
+            for name in (
+                "TEXT_MIN_DIFF_LENGTH", "NORMALIZE_TEXT", "NORMALIZE_RULES", "AUTO_ORIENT", "FORCE_OCR",
+                "THRESHOLD", "MIN_AREA", "RASTER_DIFF_DPI", "VECTOR_DIFF", "VECTOR_TOLERANCE", "IMAGE_DIFF",
+                "OCR_MERGE_DIST_H", "MOVE_MIN_TOKENS", "REFINE_MAX_TOKENS", "MAIN_PAGE",
+            )
+        }
+        if not self.AUTO_ORIENT:
+            settings["ROTATIONS"] = [self.rotations[old_index] % 360, self.rotations[new_index] % 360]
+        return settings
+
+    def _output_settings(self) -> Dict:
+        """Every setting that only influences how the diff is rendered."""
+        return {
+            name: getattr(self, name)
+            for name in (
+                "DPI_LEVEL", "PAGE_SIZE", "SCALE_OUTPUT", "INCLUDE_IMAGES", "OUTPUT_BW", "OUTPUT_GS",
+                "REDUCE_FILESIZE", "VECTOR_BOX_PADDING",
+            )
+        }
+
+    @staticmethod
+    def _encode_entry(entry: Dict) -> Dict:
+        encoded = dict(entry)
+        encoded["old_rects"] = encode_rect_map(entry["old_rects"])
+        encoded["new_rects"] = encode_rect_map(entry["new_rects"])
+        return encoded
+
+    @staticmethod
+    def _decode_entry(encoded: Dict) -> Dict:
+        entry = dict(encoded)
+        entry["old_rects"] = decode_rect_map(encoded["old_rects"])
+        entry["new_rects"] = decode_rect_map(encoded["new_rects"])
+        return entry
+
+    def _restore_statistics(self, statistics: Dict) -> None:
+        main_page = self.statistics["MAIN_PAGE"]
+        self.statistics.update(statistics)
+        # JSON turned the (page, count) pairs into lists
+        self.statistics["PAGES_WITH_DIFFERENCES"] = [tuple(item) for item in statistics["PAGES_WITH_DIFFERENCES"]]
+        self.statistics["MAIN_PAGE"] = main_page
+
+    @staticmethod
+    def _image_digest(image: Image.Image) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{image.mode} {image.size}".encode())
+        digest.update(image.tobytes())
+        return digest.digest()
+
     def _apply_output_format(self, image: Image.Image) -> Image.Image:
         if self.OUTPUT_GS:
-            image = image.convert("L")
+            mode = "L"
         elif self.OUTPUT_BW:
-            image = image.convert("1")
+            mode = "1"
         else:
-            image = image.convert("RGB")
-        return image
+            mode = "RGB"
+        # renders are already gray for gray and B/W output; converting to the same mode would only copy
+        return image if image.mode == mode else image.convert(mode)
+
+    def _diff_documents(self, old_doc: fitz.Document, new_doc: fitz.Document, unchanged_pages: Set[int],
+                        digests: Tuple[Optional[bytes], Optional[bytes]] = (None, None),
+                        ) -> Tuple[List[Dict], Tuple[Dict[int, List[fitz.Rect]], ...]]:
+        """Run every diff stage; return the entries and the merged highlight maps
+        ``(old, new, old moves, new moves)``.  *digests* are the file digests
+        of both documents, used to reuse their cached words."""
+        self.logMessage.emit("Extracting text tokens from old document...")
+        old_tokens = self._extract_tokens(old_doc, unchanged_pages, digests[0])
+        self.progressUpdated.emit(10)
+
+        self.logMessage.emit("Extracting text tokens from new document...")
+        new_tokens = self._extract_tokens(new_doc, unchanged_pages, digests[1])
+        self.progressUpdated.emit(20)
+
+        self.logMessage.emit("Running semantic text diff...")
+        diff_entries = self._build_diff_entries(old_tokens, new_tokens)
+        self._refine_replacements(diff_entries, old_doc, new_doc)
+
+        compared_pages = [
+            page_index
+            for page_index in range(min(old_doc.page_count, new_doc.page_count))
+            if page_index not in unchanged_pages
+        ]
+        diff_entries.extend(self._build_page_entries(
+            old_doc, new_doc, compared_pages,
+            {token["page"] for token in old_tokens}, {token["page"] for token in new_tokens},
+        ))
+        all_highlights = self._collect_highlights(diff_entries)
+        self.logMessage.emit(f"Semantic diff complete. Found {len(diff_entries)} structured differences.")
+        self.progressUpdated.emit(30)
+        return diff_entries, all_highlights
+
+    def _build_page_entries(self, old_doc: fitz.Document, new_doc: fitz.Document, compared_pages: List[int],
+                            old_text_pages: Set[int], new_text_pages: Set[int]) -> List[Dict]:
+        """Raster, drawing and embedded image entries of *compared_pages*; pages
+        missing from a ``*_text_pages`` set have no text layer on that side."""
+        vector_entries = []
+        drawn_pages: Set[int] = set()
+        if self.VECTOR_DIFF and not self.FORCE_OCR:
+            # linework and CAD sheets with outlined text have no text layer but need no rasterizing
+            self.logMessage.emit("Running vector drawing diff...")
+            vector_entries = self._build_vector_entries(old_doc, new_doc, compared_pages, drawn_pages)
+
+        diff_entries = []
+        raster_pages = [
+            page_index
+            for page_index in compared_pages
+            if self.FORCE_OCR
+            or (page_index not in drawn_pages and (page_index not in old_text_pages or page_index not in new_text_pages))
+        ]
+        if raster_pages:
+            self.logMessage.emit(f"Running pixel diff on {len(raster_pages)} page(s) without text or drawings...")
+            diff_entries.extend(self._build_raster_entries(old_doc, new_doc, raster_pages))
+        diff_entries.extend(vector_entries)
+
+        # pages diffed pixel by pixel need no further image comparison
+        raster_set = set(raster_pages)
+        content_pages = [page_index for page_index in compared_pages if page_index not in raster_set]
+        if self.IMAGE_DIFF:
+            self.logMessage.emit("Running embedded image diff...")
+            diff_entries.extend(self._build_image_entries(old_doc, new_doc, content_pages))
+        return diff_entries
+
+    def _collect_highlights(self, diff_entries: List[Dict]) -> Tuple[Dict[int, List[fitz.Rect]], ...]:
+        """Count *diff_entries* into the statistics and merge their rects into
+        the highlight maps ``(old, new, old moves, new moves)``."""
+        old_highlights: Dict[int, List[fitz.Rect]] = {}
+        new_highlights: Dict[int, List[fitz.Rect]] = {}
+        # moved blocks are drawn in their own colour on both sides
+        old_move_highlights: Dict[int, List[fitz.Rect]] = {}
+        new_move_highlights: Dict[int, List[fitz.Rect]] = {}
+        page_change_counts: Dict[int, int] = {}
+
+        for entry in diff_entries:
+            if entry["type"] in ("delete", "replace"):
+                self.statistics["DELETED_COUNT"] += 1
+            if entry["type"] in ("add", "replace"):
+                self.statistics["ADDED_COUNT"] += 1
+            if entry["type"] == "raster":
+                self.statistics["RASTER_COUNT"] += 1
+            if entry["type"] == "vector":
+                self.statistics["VECTOR_COUNT"] += 1
+            if entry["type"] == "image":
+                self.statistics["IMAGE_COUNT"] += 1
+            if entry["type"] == "move":
+                self.statistics["MOVED_COUNT"] += 1
+                sides = ((old_move_highlights, entry["old_rects"]), (new_move_highlights, entry["new_rects"]))
+            else:
+                sides = ((old_highlights, entry["old_rects"]), (new_highlights, entry["new_rects"]))
+
+            # every entry type highlights whatever rects it carries on either side
+            for highlights, rect_map in sides:
+                for page_idx, rects in rect_map.items():
+                    highlights.setdefault(page_idx, []).extend(rects)
+                    page_change_counts[page_idx + 1] = page_change_counts.get(page_idx + 1, 0) + len(rects)
+
+        # one box per changed word is slow to draw and noisy: coalesce into lines and blocks
+        all_highlights = (old_highlights, new_highlights, old_move_highlights, new_move_highlights)
+        raw_count = sum(len(rects) for highlights in all_highlights for rects in highlights.values())
+        for highlights in all_highlights:
+            for page_idx, rects in highlights.items():
+                highlights[page_idx] = merge_rects(rects, self.OCR_MERGE_DIST_H)
+        merged_count = sum(len(rects) for highlights in all_highlights for rects in highlights.values())
+        self.logMessage.emit(f"Merged {raw_count} highlight boxes into {merged_count}.")
+
+        self.statistics["TOTAL_DIFFERENCES"] = len(diff_entries)
+        self.statistics["PAGES_WITH_DIFFERENCES"] = sorted(page_change_counts.items(), key=lambda item: item[0])
+        return all_highlights
+
+    def _write_output(self, old_doc: fitz.Document, new_doc: fitz.Document, old_path: str, new_path: str,
+                      main_path: str, diff_entries: List[Dict], all_highlights: Tuple[Dict[int, List[fitz.Rect]], ...],
+                      unchanged_pages: Set[int], output_path: Optional[str] = None) -> str:
+        """Render the marked pages and the summary into the comparison PDF and
+        return its path (by default ``<main file> Comparison.pdf``)."""
+        total_pages = max(old_doc.page_count, new_doc.page_count)
+        old_highlights, new_highlights, old_move_highlights, new_move_highlights = all_highlights
+
+        progress_per_page = 60.0 / max(total_pages - len(unchanged_pages), 1)
+        current_progress = 30.0
+        toc = []
+
+        with TemporaryDirectory() as temp_dir:
+            page_artifacts = []
+            # content digest -> single-page PDF holding that image, encoded once
+            encoded_images: Dict[bytes, str] = {}
+
+            for page_index in range(total_pages):
+                if page_index in unchanged_pages:
+                    continue
+                self.logMessage.emit(f"Rendering page {page_index + 1} / {total_pages}...")
+                with self._antialiasing():
+                    old_base, old_page = self._render_page(old_doc, page_index)
+                    new_base, new_page = self._render_page(new_doc, page_index)
+
+                # marking draws into the renders in place; nothing else reads them
+                old_marked = self._draw_rectangles(
+                    old_base, old_page, old_highlights.get(page_index, []), (220, 38, 38), self.VECTOR_BOX_PADDING
+                )
+                new_marked = self._draw_rectangles(
+                    new_base, new_page, new_highlights.get(page_index, []), (22, 163, 74), self.VECTOR_BOX_PADDING
+                )
+                old_marked = self._draw_rectangles(
+                    old_marked, old_page, old_move_highlights.get(page_index, []), (37, 99, 235), self.VECTOR_BOX_PADDING
+                )
+                new_marked = self._draw_rectangles(
+                    new_marked, new_page, new_move_highlights.get(page_index, []), (37, 99, 235), self.VECTOR_BOX_PADDING
+                )
+
+                output_images = []
+                if self.INCLUDE_IMAGES.get("New Copy", False):
+                    output_images.append(("New Copy", self._resize_if_needed(new_marked)))
+                if self.INCLUDE_IMAGES.get("Old Copy", False):
+                    output_images.append(("Old Copy", self._resize_if_needed(old_marked)))
+                if self.INCLUDE_IMAGES.get("Markup", True):
+                    output_images.append(
+                        (
+                            "Markup",
+                            self._resize_if_needed(new_marked if self.MAIN_PAGE == "New Document" else old_marked),
+                        )
+                    )
+                if self.INCLUDE_IMAGES.get("Difference", False):
+                    output_images.append(("Difference", self._combine_side_by_side(old_marked, new_marked)))
+                if self.INCLUDE_IMAGES.get("Overlay", False):
+                    output_images.append(("Overlay", self._overlay_blend(old_marked, new_marked)))
+
+                if not output_images:
+                    output_images.append(("Markup", self._resize_if_needed(new_marked if self.MAIN_PAGE == "New Document" else old_marked)))
+
+                # variants made from the same image (e.g. New Copy and Markup) are converted and hashed once;
+                # keyed by the source image, which output_images keeps alive (a converted image may be freed
+                # and its id reused by the next conversion)
+                formatted: Dict[int, Tuple[Image.Image, bytes]] = {}
+                for variant_index, (label, source) in enumerate(output_images):
+                    if id(source) not in formatted:
+                        image = self._apply_output_format(source)
+                        formatted[id(source)] = (image, self._image_digest(image))
+                    image, digest = formatted[id(source)]
+                    image_file = encoded_images.get(digest)
+                    if image_file is None:
+                        image_file = path.join(temp_dir, f"{page_index}_{variant_index}.pdf")
+                        image.save(image_file, resolution=self.DPI_LEVEL, author="MAXFIELD", optimize=self.REDUCE_FILESIZE)
+                        encoded_images[digest] = image_file
+                    page_artifacts.append(image_file)
+                    toc.append([1, f"Page {page_index + 1} {label}", len(page_artifacts)])
+
+                current_progress += progress_per_page
+                self.progressUpdated.emit(int(current_progress))
+
+            self.logMessage.emit("Generating structured diff report page...")
+            report_file = self._create_summary_pdf(temp_dir, diff_entries, old_path, new_path)
+            page_artifacts.append(report_file)
+            toc.append([1, "Structured Diff Summary", len(page_artifacts)])
+
+            self.logMessage.emit("Compiling output PDF...")
+            compiled_pdf = fitz.open()
+            # an image shown again is placed on a new page by its xref instead of being copied
+            placed_images: Dict[str, Tuple[int, fitz.Rect]] = {}
+            for pdf_file in page_artifacts:
+                if pdf_file in placed_images:
+                    xref, rect = placed_images[pdf_file]
+                    page = compiled_pdf.new_page(width=rect.width, height=rect.height)
+                    page.insert_image(page.rect, xref=xref)
+                    continue
+                part = fitz.open(pdf_file)
+                compiled_pdf.insert_pdf(part, links=False)
+                part.close()
+                page = compiled_pdf[-1]
+                images = page.get_images()
+                if len(images) == 1:
+                    placed_images[pdf_file] = (images[0][0], page.rect)
+            self.logMessage.emit(
+                f"Encoded {len(encoded_images)} distinct page image(s) for {len(page_artifacts) - 1} output page(s)."
+            )
+
+            compiled_pdf.set_toc(toc)
+            output_path = output_path or self._output_path(main_path)
+            compiled_pdf.save(output_path)
+            compiled_pdf.close()
+        return output_path
+
+    def _finish_identical(self, page_count: int) -> None:
+        self.statistics["NUM_PAGES"] = page_count
+        self.statistics["IDENTICAL_PAGES"] = page_count
+        self.progressUpdated.emit(100)
+        self.logMessage.emit("The documents are identical. No differences found; no comparison file was written.")
+        self.compareComplete.emit(2)
 
-    def handle_files(self, files: List[str]) -> str:
+    def handle_files(self, files: List[str]) -> Optional[str]:
         self.logMessage.emit(f"Processing files:\n    {files[0]}\n    {files[1]}")
 
         if self.MAIN_PAGE == "New Document":
@@ -1131,115 +1782,87 @@ class CompareThread(QThread):
             new_index, old_index = 1, 0
             main_index = 1
 
-        with fitz.open(files[old_index]) as old_doc, fitz.open(files[new_index]) as new_doc:
-            self.statistics["MAIN_PAGE"] = files[main_index]
+        old_digest, new_digest = file_digest(files[old_index]), file_digest(files[new_index])
+        self.statistics["MAIN_PAGE"] = files[main_index]
+        # the same bytes under the same rotation cannot differ; auto-orientation treats both alike
+        same_rotation = self.AUTO_ORIENT or self.rotations[0] % 360 == self.rotations[1] % 360
+        if same_rotation and old_digest == new_digest:
+            with fitz.open(files[main_index]) as doc:
+                self._finish_identical(doc.page_count)
+            return None
+
+        diff_key = output_key = cached = None
+        if self.result_cache is not None:
+            diff_key = self.result_cache.diff_key(old_digest, new_digest, self._diff_settings(old_index, new_index))
+            # the summary page names both files, so a stored PDF only serves the same paths
+            output_key = self.result_cache.output_key(
+                diff_key, {**self._output_settings(), "OLD_FILE": files[old_index], "NEW_FILE": files[new_index]}
+            )
+            cached = self.result_cache.load_diff(diff_key)
+            cached_output = self.result_cache.output(output_key) if cached is not None else None
+            if cached_output is not None:
+                self._restore_statistics(cached["statistics"])
+                output_path = self._output_path(files[main_index])
+                shutil.copyfile(cached_output, output_path)
+                self.progressUpdated.emit(100)
+                self.logMessage.emit(f"Reused the stored result of an identical comparison: {output_path}")
+                self.compareComplete.emit(2)
+                return output_path
+
+        # raster-diffed pages are rendered twice; both renders replay one display list
+        with fitz.open(files[old_index]) as old_doc, fitz.open(files[new_index]) as new_doc, self.display_lists:
             total_pages = max(old_doc.page_count, new_doc.page_count)
-            self.statistics["NUM_PAGES"] = total_pages
-
-            self.logMessage.emit("Extracting text tokens from old document...")
-            old_tokens = self._extract_tokens(old_doc)
-            self.progressUpdated.emit(10)
-
-            self.logMessage.emit("Extracting text tokens from new document...")
-            new_tokens = self._extract_tokens(new_doc)
-            self.progressUpdated.emit(20)
-
-            self.logMessage.emit("Running semantic text diff...")
-            diff_entries = self._build_diff_entries(old_tokens, new_tokens)
-
-            old_highlights: Dict[int, List[fitz.Rect]] = {}
-            new_highlights: Dict[int, List[fitz.Rect]] = {}
-            page_change_counts: Dict[int, int] = {}
-
-            for entry in diff_entries:
-                if entry["type"] in ("delete", "replace"):
-                    self.statistics["DELETED_COUNT"] += 1
-                    for page_idx, rects in entry["old_rects"].items():
-                        old_highlights.setdefault(page_idx, []).extend(rects)
-                        page_change_counts[page_idx + 1] = page_change_counts.get(page_idx + 1, 0) + len(rects)
-
-                if entry["type"] in ("add", "replace"):
-                    self.statistics["ADDED_COUNT"] += 1
-                    for page_idx, rects in entry["new_rects"].items():
-                        new_highlights.setdefault(page_idx, []).extend(rects)
-                        page_change_counts[page_idx + 1] = page_change_counts.get(page_idx + 1, 0) + len(rects)
-
-            self.statistics["TOTAL_DIFFERENCES"] = len(diff_entries)
-            self.statistics["PAGES_WITH_DIFFERENCES"] = sorted(page_change_counts.items(), key=lambda item: item[0])
-            self.logMessage.emit(f"Semantic diff complete. Found {len(diff_entries)} structured differences.")
-            self.progressUpdated.emit(30)
-
-            main_filename = path.basename(files[main_index])
-            output_dir = self._resolve_output_dir(files[main_index])
-            progress_per_page = 60.0 / max(total_pages, 1)
-            current_progress = 30.0
-            toc = []
-
-            with TemporaryDirectory() as temp_dir:
-                page_artifacts = []
-
-                for page_index in range(total_pages):
-                    self.logMessage.emit(f"Rendering page {page_index + 1} / {total_pages}...")
-                    old_base, old_page_rect = self._render_page(old_doc, page_index, self.DPI_LEVEL)
-                    new_base, new_page_rect = self._render_page(new_doc, page_index, self.DPI_LEVEL)
-
-                    old_marked = self._draw_rectangles(old_base.copy(), old_page_rect, old_highlights.get(page_index, []), (220, 38, 38))
-                    new_marked = self._draw_rectangles(new_base.copy(), new_page_rect, new_highlights.get(page_index, []), (22, 163, 74))
-
-                    output_images = []
-                    if self.INCLUDE_IMAGES.get("New Copy", False):
-                        output_images.append(("New Copy", self._resize_if_needed(new_marked)))
-                    if self.INCLUDE_IMAGES.get("Old Copy", False):
-                        output_images.append(("Old Copy", self._resize_if_needed(old_marked)))
-                    if self.INCLUDE_IMAGES.get("Markup", True):
-                        output_images.append(
-                            (
-                                "Markup",
-                                self._resize_if_needed(new_marked if self.MAIN_PAGE == "New Document" else old_marked),
-                            )
-                        )
-                    if self.INCLUDE_IMAGES.get("Difference", False):
-                        output_images.append(("Difference", self._combine_side_by_side(old_marked, new_marked)))
-                    if self.INCLUDE_IMAGES.get("Overlay", False):
-                        output_images.append(("Overlay", self._overlay_blend(old_marked, new_marked)))
-
-                    if not output_images:
-                        output_images.append(("Markup", self._resize_if_needed(new_marked if self.MAIN_PAGE == "New Document" else old_marked)))
-
-                    for variant_index, (label, image) in enumerate(output_images):
-                        image = self._apply_output_format(image)
-                        image_file = path.join(temp_dir, f"{page_index}_{variant_index}.pdf")
-                        image.save(image_file, resolution=self.DPI_LEVEL, author="MAXFIELD", optimize=self.REDUCE_FILESIZE)
-                        page_artifacts.append(image_file)
-                        toc.append([1, f"Page {page_index + 1} {label}", len(page_artifacts)])
-
-                    current_progress += progress_per_page
-                    self.progressUpdated.emit(int(current_progress))
-
-                self.logMessage.emit("Generating structured diff report page...")
-                report_file = self._create_summary_pdf(temp_dir, diff_entries, files[old_index], files[new_index])
-                page_artifacts.append(report_file)
-                toc.append([1, "Structured Diff Summary", len(page_artifacts)])
-
-                self.logMessage.emit("Compiling output PDF...")
-                compiled_pdf = fitz.open()
-                for pdf_file in page_artifacts:
-                    part = fitz.open(pdf_file)
-                    compiled_pdf.insert_pdf(part, links=False)
-                    part.close()
-
-                compiled_pdf.set_toc(toc)
-                output_path = path.join(output_dir, f"{path.splitext(main_filename)[0]} Comparison.pdf")
-                output_iterator = 0
-                while path.exists(output_path):
-                    output_iterator += 1
-                    output_path = path.join(
-                        output_dir,
-                        f"{path.splitext(main_filename)[0]} Comparison Rev {output_iterator}.pdf",
-                    )
-
-                compiled_pdf.save(output_path)
-                compiled_pdf.close()
+            self.rasters.register(old_doc, old_digest)
+            self.rasters.register(new_doc, new_digest)
+            if cached is not None:
+                # same inputs and diff settings: only the output differs, so the diff is reused
+                self.logMessage.emit("Reusing the stored diff of these documents; skipping extraction and diffing.")
+                for doc, doc_index, label in ((old_doc, old_index, "old"), (new_doc, new_index, "new")):
+                    if self.AUTO_ORIENT:
+                        corrections = cached["rotations"].get(label, {})
+                        self._apply_page_rotations(doc, {int(page): angle for page, angle in corrections.items()})
+                    else:
+                        self._apply_rotation(doc, self.rotations[doc_index])
+                unchanged_pages = set(cached["identical_pages"])
+                diff_entries = [self._decode_entry(entry) for entry in cached["entries"]]
+                all_highlights = tuple(decode_rect_map(highlights) for highlights in cached["highlights"])
+                self._restore_statistics(cached["statistics"])
+                self.progressUpdated.emit(30)
+            else:
+                applied_rotations = {
+                    label: self._orient(doc, files[doc_index], self.rotations[doc_index], label)
+                    for doc, doc_index, label in ((old_doc, old_index, "old"), (new_doc, new_index, "new"))
+                }
+                self.statistics["NUM_PAGES"] = total_pages
+
+                # byte-identical pages need no extraction, diffing or rendering
+                unchanged_pages = identical_pages(old_doc, new_doc)
+                self.statistics["IDENTICAL_PAGES"] = len(unchanged_pages)
+                if len(unchanged_pages) == total_pages:
+                    self._finish_identical(total_pages)
+                    return None
+                if unchanged_pages:
+                    self.logMessage.emit(f"Skipping {len(unchanged_pages)} identical page(s).")
+
+                diff_entries, all_highlights = self._diff_documents(
+                    old_doc, new_doc, unchanged_pages, (old_digest, new_digest)
+                )
+                if diff_key is not None:
+                    self.result_cache.store_diff(diff_key, {
+                        "entries": [self._encode_entry(entry) for entry in diff_entries],
+                        "highlights": [encode_rect_map(highlights) for highlights in all_highlights],
+                        "rotations": {label: {str(page): angle for page, angle in corrections.items()}
+                                      for label, corrections in applied_rotations.items()},
+                        "identical_pages": sorted(unchanged_pages),
+                        "statistics": self.statistics,
+                    })
+            output_path = self._write_output(
+                old_doc, new_doc, files[old_index], files[new_index], files[main_index],
+                diff_entries, all_highlights, unchanged_pages,
+            )
+
+        if output_key is not None:
+            self.result_cache.store_output(output_key, output_path)
 
         self.progressUpdated.emit(100)
         self.logMessage.emit(f"Comparison file created: {output_path}")
@@ -1247,103 +1870,12 @@ class CompareThread(QThread):
         return output_path
 
 
-def save_settings(settings: dict) -> None:
-    settings_path = "settings.json"
-    with open(settings_path, "w", encoding="utf-8") as file:
-        dump(settings, file, indent=4)
-
-
 def resource_path(relative_path: str) -> str:
     if hasattr(sys, "_MEIPASS"):
         return path.join(sys._MEIPASS, relative_path)
     return path.join(path.dirname(path.abspath(__file__)), relative_path)
 
 
-def _load_default_settings() -> dict:
-    return {
-        "PAGE_SIZES": {
-            "AUTO": [None, None],
-            "LETTER": [8.5, 11],
-            "ANSI A": [11, 8.5],
-            "ANSI B": [17, 11],
-            "ANSI C": [22, 17],
-            "ANSI D": [34, 22],
-        },
-        "DPI_LEVELS": [75, 150, 300, 600, 1200, 1800],
-        "DPI_LABELS": [
-            "Low DPI: Draft Quality [75]",
-            "Low DPI: Viewing Only [150]",
-            "Medium DPI: Printable [300]",
-            "Standard DPI [600]",
-            "High DPI [1200]: Professional Quality",
-            "Max DPI [1800]: Large File Size",
-        ],
-        "INCLUDE_IMAGES": {
-            "New Copy": True,
-            "Old Copy": True,
-            "Markup": True,
-            "Difference": False,
-            "Overlay": False,
-        },
-        "DPI": "Standard DPI [600]",
-        "DPI_LEVEL": 600,
-        "PAGE_SIZE": "AUTO",
-        "THRESHOLD": 128,
-        "MIN_AREA": 100,
-        "EPSILON": 0.0,
-        "TEXT_MIN_DIFF_LENGTH": 2,
-        "NORMALIZE_TEXT": True,
-        "OUTPUT_PATH": None,
-        "SCALE_OUTPUT": True,
-        "OUTPUT_BW": False,
-        "OUTPUT_GS": False,
-        "REDUCE_FILESIZE": False,
-        "MAIN_PAGE": "New Document",
-    }
-
-
-def _normalize_settings(settings: dict) -> dict:
-    defaults = _load_default_settings()
-
-    for key, value in defaults.items():
-        if key not in settings:
-            settings[key] = value
-            continue
-
-        if isinstance(value, dict) and isinstance(settings[key], dict):
-            for child_key, child_default in value.items():
-                settings[key].setdefault(child_key, child_default)
-
-    if isinstance(settings.get("PAGE_SIZE"), list):
-        page_size_list = settings["PAGE_SIZE"]
-        matched = "AUTO"
-        for name, size in settings["PAGE_SIZES"].items():
-            if list(size) == list(page_size_list):
-                matched = name
-                break
-        settings["PAGE_SIZE"] = matched
-
-    if settings.get("PAGE_SIZE") not in settings.get("PAGE_SIZES", {}):
-        settings["PAGE_SIZE"] = "AUTO"
-
-    return settings
-
-
-def load_settings() -> dict:
-    settings_path = "settings.json"
-    settings = None
-    if path.exists(settings_path):
-        with open(settings_path, "r", encoding="utf-8") as file:
-            settings = load(file)
-
-    if not settings:
-        settings = _load_default_settings()
-
-    settings = _normalize_settings(settings)
-    save_settings(settings)
-    return settings
-
-
 stylesheet = """
 #SettingsButton {
     background-color: #FFC107;
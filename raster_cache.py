@@ -0,0 +1,200 @@
+"""
+On-disk cache of page renders shared by every comparison and preview.
+
+The same baseline pages are rendered at the same resolution again for every
+revision they are compared against.  :class:`RasterCache` stores each render
+as a zlib-compressed tile in a :class:`disk_cache.DiskCache`, so a warm render
+costs a decompression instead of a MuPDF rasterization.
+
+Tiles are content-addressed: the key hashes the digest of the document file
+with the page number, the page rotation, the render matrix, the colourspace,
+the alpha flag, the clip and MuPDF's anti-aliasing level.  Renaming or copying a file therefore keeps its
+tiles, and saving it under the same name invalidates them.  Documents are
+assumed to match their file on disk except for page rotations, which are part
+of the key; documents without a file (opened from memory) are never cached.
+
+A tile is only written when the render took clearly longer than decoding it
+would: simple text pages rasterize faster than 100 MB of samples can be
+decompressed, so caching them would make warm renders slower.  Heavy vector
+drawings, large scans and complex transparency are what gets cached.
+
+File digests are remembered in memory by path, modification time and size,
+so reopening a file does not hash it again.  Interactive users create the
+cache with ``hash_on_demand=False`` and have :meth:`RasterCache.prepare` hash
+the file in the background: until the digest is known, renders bypass the
+disk instead of waiting for a multi-gigabyte file to be hashed.
+:meth:`RasterCache.forget` drops the digest of a document being closed.
+
+The directory is size-bounded with LRU eviction and, like every
+:class:`DiskCache`, safe to share between threads and worker processes.  A
+budget of 0 disables the disk entirely and only forwards to the renderer.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from os import path
+from typing import Dict, Optional, Set, Tuple
+
+from disk_cache import DiskCache
+from lazy_imports import lazy_import
+from page_fingerprint import file_digest
+
+fitz = lazy_import("fitz")
+
+DEFAULT_BUDGET = 1024 * 1024 * 1024
+# renders are mostly white paper: the fastest level already shrinks them 20-50x
+COMPRESSION_LEVEL = 1
+# measured cost of reading back a tile (decompression plus pixmap creation) per sample byte
+DECODE_SECONDS_PER_BYTE = 3e-9
+# a tile is written only if the render took this many times its estimated decode cost
+ADMISSION_FACTOR = 2.0
+# magic, width, height, components, alpha, origin x/y, resolution x/y
+_HEADER = struct.Struct("<4sIIBBiiII")
+_MAGIC = b"RST1"
+
+DocumentKey = Tuple[str, int, int]
+
+
+class RasterCache:
+    """Page renders by content, in front of a renderer such as a :class:`display_lists.DisplayListCache`."""
+
+    def __init__(self, budget: int = DEFAULT_BUDGET, renderer=None, root: Optional[str] = None,
+                 hash_on_demand: bool = True):
+        self.budget = budget
+        self.renderer = renderer
+        self.hash_on_demand = hash_on_demand
+        self._store = DiskCache("rasters", budget, root)
+        self._lock = threading.Lock()
+        self._digests: Dict[DocumentKey, bytes] = {}
+        self._preparing: Set[DocumentKey] = set()
+
+    @staticmethod
+    def _document_key(doc) -> Optional[DocumentKey]:
+        name = doc.name
+        if not name:
+            return None
+        try:
+            stat = os.stat(name)
+        except OSError:
+            return None
+        return path.abspath(name), stat.st_mtime_ns, stat.st_size
+
+    def register(self, doc, digest: bytes) -> None:
+        """Record the already known file digest of *doc* so it is not hashed again."""
+        key = self._document_key(doc)
+        if key is not None:
+            with self._lock:
+                self._digests[key] = digest
+
+    def prepare(self, doc, background: bool = False) -> None:
+        """Hash the file of *doc* now, or on a daemon thread with *background*."""
+        key = self._document_key(doc)
+        if key is None:
+            return
+        with self._lock:
+            if key in self._digests or key in self._preparing:
+                return
+            self._preparing.add(key)
+        if background:
+            threading.Thread(target=self._hash, args=(key,), name="page-digest", daemon=True).start()
+        else:
+            self._hash(key)
+
+    def _hash(self, key: DocumentKey) -> None:
+        digest = file_digest(key[0])
+        with self._lock:
+            # a document closed meanwhile has been forgotten
+            if key in self._preparing:
+                self._preparing.discard(key)
+                self._digests[key] = digest
+
+    def forget(self, doc) -> None:
+        """Drop the remembered digest of *doc*, e.g. when it is closed."""
+        key = self._document_key(doc)
+        if key is not None:
+            with self._lock:
+                self._digests.pop(key, None)
+                self._preparing.discard(key)
+
+    def document_digest(self, doc) -> Optional[bytes]:
+        """File digest of *doc*; ``None`` if it has none or, without
+        ``hash_on_demand``, if it has not been prepared yet."""
+        key = self._document_key(doc)
+        if key is None:
+            return None
+        with self._lock:
+            digest = self._digests.get(key)
+        if digest is None and self.hash_on_demand:
+            digest = file_digest(key[0])
+            with self._lock:
+                self._digests[key] = digest
+        return digest
+
+    def tile_key(self, page, matrix, colorspace, alpha: bool, clip) -> Optional[str]:
+        digest = self.document_digest(page.parent)
+        if digest is None:
+            return None
+        parts = [
+            _MAGIC.decode(),
+            digest.hex(),
+            page.number,
+            page.rotation,
+            [round(value, 6) for value in matrix],
+            colorspace.name,
+            bool(alpha),
+            [round(value, 3) for value in clip] if clip is not None else None,
+            # MuPDF's global anti-aliasing level, lowered for B/W output
+            sorted(fitz.TOOLS.show_aa_level().items()),
+        ]
+        return hashlib.blake2b(json.dumps(parts, separators=(",", ":")).encode(), digest_size=20).hexdigest()
+
+    def get_pixmap(self, page, matrix: Optional[fitz.Matrix] = None, dpi: Optional[int] = None,
+                   colorspace=None, alpha: bool = False, clip: Optional[fitz.Rect] = None):
+        """Like ``page.get_pixmap``, served from the disk when this render was made before."""
+        if matrix is None:
+            zoom = (dpi or 72) / 72
+            matrix = fitz.Matrix(zoom, zoom)
+        colorspace = colorspace or fitz.csRGB
+        key = self.tile_key(page, matrix, colorspace, alpha, clip) if self.budget > 0 else None
+        if key is not None:
+            data = self._store.read(key)
+            pix = self._decode(data, colorspace) if data is not None else None
+            if pix is not None:
+                return pix
+
+        started = time.perf_counter()
+        if self.renderer is None:
+            pix = page.get_pixmap(matrix=matrix, colorspace=colorspace, alpha=alpha, clip=clip)
+        else:
+            pix = self.renderer.get_pixmap(page, matrix=matrix, colorspace=colorspace, alpha=alpha, clip=clip)
+        elapsed = time.perf_counter() - started
+        if key is not None and elapsed > ADMISSION_FACTOR * DECODE_SECONDS_PER_BYTE * len(pix.samples_mv):
+            self._store.write(key, self._encode(pix))
+        return pix
+
+    @staticmethod
+    def _encode(pix) -> bytes:
+        header = _HEADER.pack(_MAGIC, pix.width, pix.height, pix.n, pix.alpha, pix.x, pix.y, pix.xres, pix.yres)
+        return header + zlib.compress(pix.samples_mv, COMPRESSION_LEVEL)
+
+    @staticmethod
+    def _decode(data: bytes, colorspace):
+        try:
+            magic, width, height, n, alpha, x, y, xres, yres = _HEADER.unpack_from(data)
+            samples = zlib.decompress(memoryview(data)[_HEADER.size:])
+        except (struct.error, zlib.error):
+            # a foreign or damaged entry is just a miss
+            return None
+        if magic != _MAGIC or len(samples) != width * height * n:
+            return None
+        pix = fitz.Pixmap(colorspace, width, height, samples, alpha)
+        pix.set_origin(x, y)
+        pix.set_dpi(xres, yres)
+        return pix
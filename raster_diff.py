@@ -0,0 +1,192 @@
+"""
+Pixel-level comparison for pages without a text layer.
+
+Scanned pages yield no words, so the text diff cannot see their changes.
+Such page pairs are rendered in grayscale at a reduced analysis DPI, aligned
+with FFT phase correlation (scans are rarely placed identically), and
+differenced in NumPy.  A pixel counts as changed only if it differs by more
+than the threshold from every pixel within one pixel of its counterpart,
+which absorbs anti-aliasing and sub-pixel misregistration.  Changed pixels
+are grouped into regions on a coarse grid and regions smaller than the
+minimum area are dropped as noise.
+
+Regions are returned as ``fitz.Rect`` in unrotated page coordinates, the same
+space as word boxes, so they can be highlighted exactly like text differences.
+"""
+
+from __future__ import annotations
+
+from typing import List, Tuple
+
+from lazy_imports import lazy_import
+from raster_utils import pixmap_array
+
+fitz = lazy_import("fitz")
+np = lazy_import("numpy")
+
+# scans rarely shift by more than this share of the page
+MAX_SHIFT_RATIO = 0.05
+# side of the grid cells (in analysis pixels) that join nearby changes into one region
+CELL_SIZE = 4
+
+
+def render_gray(page, dpi: int, renderer=None):
+    """Render *page* as a 2-D ``uint8`` array (rows, columns).
+
+    *renderer* is a :class:`display_lists.DisplayListCache` or a
+    :class:`raster_cache.RasterCache`; either serves repeated renders of the
+    page without interpreting it again.
+    """
+    if renderer is None:
+        pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+    else:
+        pix = renderer.get_pixmap(page, dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+    return pixmap_array(pix)
+
+
+def _fast_length(n: int) -> int:
+    """Smallest 5-smooth number >= *n*; FFTs of such lengths are fastest."""
+    best = 1 << max(n - 1, 0).bit_length()
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            candidate = power35
+            while candidate < n:
+                candidate *= 2
+            best = min(best, candidate)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def _half_resolution_ink(image):
+    """2x2 mean of the inverted image with its mean removed, as ``float32``."""
+    height, width = image.shape[0] // 2 * 2, image.shape[1] // 2 * 2
+    ink = 255.0 - image[:height, :width].astype(np.float32)
+    ink = ink.reshape(height // 2, 2, width // 2, 2).mean(axis=(1, 3))
+    ink -= ink.mean()
+    return ink
+
+
+def phase_correlation_shift(old, new, max_shift_ratio: float = MAX_SHIFT_RATIO) -> Tuple[int, int]:
+    """Displacement ``(dy, dx)`` of the content of *new* relative to *old*.
+
+    Both arrays must have the same shape.  The correlation runs at half
+    resolution, so the result is accurate to about one pixel, which the
+    neighbourhood tolerance of :func:`changed_mask` absorbs.  Shifts larger
+    than *max_shift_ratio* of the page are treated as unreliable and give
+    ``(0, 0)``.
+    """
+    # ink is the signal: invert and remove the mean so the white page does not dominate
+    old_ink = _half_resolution_ink(old)
+    new_ink = _half_resolution_ink(new)
+    shape = (_fast_length(old_ink.shape[0]), _fast_length(old_ink.shape[1]))
+
+    spectrum = np.fft.rfft2(old_ink, s=shape) * np.conj(np.fft.rfft2(new_ink, s=shape))
+    spectrum /= np.abs(spectrum) + 1e-9
+    correlation = np.fft.irfft2(spectrum, s=shape)
+    peak_y, peak_x = np.unravel_index(int(np.argmax(correlation)), shape)
+
+    # the peak wraps around: indices past the middle are negative shifts
+    dy = -2 * (peak_y - shape[0] if peak_y > shape[0] // 2 else peak_y)
+    dx = -2 * (peak_x - shape[1] if peak_x > shape[1] // 2 else peak_x)
+    height, width = old.shape
+    if abs(dy) > max_shift_ratio * height or abs(dx) > max_shift_ratio * width:
+        return 0, 0
+    return int(dy), int(dx)
+
+
+def _neighbourhood_difference(image, other):
+    """Per pixel of *image*, the smallest absolute difference to *other* within one pixel."""
+    height, width = image.shape
+    padded = np.pad(other.astype(np.int16), 1, mode="edge")
+    image = image.astype(np.int16)
+    best = None
+    for oy in range(3):
+        for ox in range(3):
+            difference = np.abs(image - padded[oy:oy + height, ox:ox + width])
+            best = difference if best is None else np.minimum(best, difference, out=best)
+    return best
+
+
+def changed_mask(old, new, threshold: int):
+    """Boolean mask of changed pixels between two aligned, equally sized images."""
+    return (_neighbourhood_difference(old, new) > threshold) | (_neighbourhood_difference(new, old) > threshold)
+
+
+def find_regions(mask, min_area: int, cell: int = CELL_SIZE) -> List[Tuple[int, int, int, int]]:
+    """Group the set pixels of *mask* into ``(x0, y0, x1, y1)`` boxes (exclusive end).
+
+    Pixels are first pooled into ``cell`` x ``cell`` grid cells; 8-connected
+    runs of changed cells form a region, whose box is then tightened to the
+    changed pixels it contains.  Boxes under *min_area* pixels are dropped.
+    """
+    height, width = mask.shape
+    rows, columns = -(-height // cell), -(-width // cell)
+    padded = np.zeros((rows * cell, columns * cell), dtype=bool)
+    padded[:height, :width] = mask
+    cells = padded.reshape(rows, cell, columns, cell).any(axis=(1, 3))
+
+    regions = []
+    seen = np.zeros_like(cells)
+    for start in zip(*np.nonzero(cells)):
+        if seen[start]:
+            continue
+        seen[start] = True
+        stack = [start]
+        top, left, bottom, right = start[0], start[1], start[0], start[1]
+        while stack:
+            row, column = stack.pop()
+            top, bottom = min(top, row), max(bottom, row)
+            left, right = min(left, column), max(right, column)
+            for next_row in range(max(row - 1, 0), min(row + 2, rows)):
+                for next_column in range(max(column - 1, 0), min(column + 2, columns)):
+                    if cells[next_row, next_column] and not seen[next_row, next_column]:
+                        seen[next_row, next_column] = True
+                        stack.append((next_row, next_column))
+
+        y0, x0 = top * cell, left * cell
+        window = padded[y0:(bottom + 1) * cell, x0:(right + 1) * cell]
+        changed_rows = np.flatnonzero(window.any(axis=1))
+        changed_columns = np.flatnonzero(window.any(axis=0))
+        box = (
+            x0 + int(changed_columns[0]),
+            y0 + int(changed_rows[0]),
+            x0 + int(changed_columns[-1]) + 1,
+            y0 + int(changed_rows[-1]) + 1,
+        )
+        if (box[2] - box[0]) * (box[3] - box[1]) >= min_area:
+            regions.append(box)
+    return regions
+
+
+def diff_pages(old_page, new_page, dpi: int = 100, threshold: int = 128,
+               min_area: int = 100, renderer=None) -> List[Tuple[fitz.Rect, fitz.Rect]]:
+    """Changed regions between two page renders as ``(old_rect, new_rect)`` pairs.
+
+    *threshold* is the gray-level difference (0-255) a pixel must exceed and
+    *min_area* the smallest region box in analysis pixels.
+    """
+    old = render_gray(old_page, dpi, renderer)
+    new = render_gray(new_page, dpi, renderer)
+    height, width = min(old.shape[0], new.shape[0]), min(old.shape[1], new.shape[1])
+    old, new = old[:height, :width], new[:height, :width]
+
+    dy, dx = phase_correlation_shift(old, new)
+    # overlap of the two pages once the new one is moved back by (dy, dx)
+    old_y0, old_x0 = max(0, -dy), max(0, -dx)
+    new_y0, new_x0 = max(0, dy), max(0, dx)
+    overlap_h, overlap_w = height - abs(dy), width - abs(dx)
+    old_view = old[old_y0:old_y0 + overlap_h, old_x0:old_x0 + overlap_w]
+    new_view = new[new_y0:new_y0 + overlap_h, new_x0:new_x0 + overlap_w]
+
+    # renders show the page as displayed; word boxes live in unrotated page space
+    old_matrix = fitz.Matrix(72.0 / dpi, 72.0 / dpi) * old_page.derotation_matrix
+    new_matrix = fitz.Matrix(72.0 / dpi, 72.0 / dpi) * new_page.derotation_matrix
+    pairs = []
+    for x0, y0, x1, y1 in find_regions(changed_mask(old_view, new_view, threshold), min_area):
+        old_rect = fitz.Rect(x0 + old_x0, y0 + old_y0, x1 + old_x0, y1 + old_y0) * old_matrix
+        new_rect = fitz.Rect(x0 + new_x0, y0 + new_y0, x1 + new_x0, y1 + new_y0) * new_matrix
+        pairs.append((old_rect, new_rect))
+    return pairs
@@ -0,0 +1,79 @@
+"""
+Zero-copy views of MuPDF pixmaps for NumPy, Pillow and Qt.
+
+``pix.samples`` returns a fresh ``bytes`` copy of the whole raster, and most
+consumers then copy it again.  ``pix.samples_mv`` exposes the pixmap's own
+memory instead, but that memoryview does not keep the pixmap alive: once the
+``Pixmap`` is garbage-collected the view dangles.  :func:`pixmap_array`
+therefore wraps the samples in a small ``ndarray`` subclass that holds a
+reference to the pixmap, and every view or slice derived from it inherits
+that reference.
+
+* :func:`pixmap_array` — ``(height, width, n)`` (or ``(height, width)`` for
+  gray) ``uint8`` view, no copy;
+* :func:`pixmap_to_image` — Pillow image.  Gray and RGBA share the pixmap
+  memory read-only; Pillow copies it on the first write (copy-on-write).
+  Pillow stores RGB with a padding byte, so RGB costs exactly one copy;
+* :func:`pixmap_to_qimage` — ``QImage`` owning its pixels, made with exactly
+  one copy (a ``QImage`` cannot keep a Python object alive);
+* :func:`samples_to_qimage` — the same for samples that arrive as a buffer,
+  e.g. from a render in a worker process.
+
+This module imports neither NumPy, Pillow nor Qt until first use, so it is
+safe in worker processes and does not slow down start-up.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+Image = lazy_import("PIL.Image")
+
+_PIL_MODES = {1: "L", 3: "RGB", 4: "RGBA"}
+
+
+@lru_cache(maxsize=1)
+def _array_class():
+    # created on first use so importing this module does not import NumPy
+    class PixmapArray(np.ndarray):
+        """``uint8`` view of pixmap samples that keeps the pixmap alive."""
+
+        def __array_finalize__(self, obj):
+            self.pixmap = getattr(obj, "pixmap", None)
+
+    return PixmapArray
+
+
+def pixmap_array(pix):
+    """View the samples of *pix* as an array without copying them."""
+    flat = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+    array = flat.reshape(pix.height, pix.stride).view(_array_class())
+    array.pixmap = pix
+    array = array[:, :pix.width * pix.n].reshape(pix.height, pix.width, pix.n)
+    return array[:, :, 0] if pix.n == 1 else array
+
+
+def pixmap_to_image(pix):
+    """Wrap *pix* as a Pillow image; see the module docstring for when it copies."""
+    mode = _PIL_MODES[pix.n]
+    return Image.frombuffer(mode, (pix.width, pix.height), pixmap_array(pix), "raw", mode, 0, 1)
+
+
+def pixmap_to_qimage(pix):
+    """Copy *pix* once into a ``QImage`` that owns its pixels."""
+    return samples_to_qimage(pix.samples_mv, pix.width, pix.height, pix.n, pix.stride)
+
+
+def samples_to_qimage(samples, width: int, height: int, n: int, stride: int = 0):
+    """Copy a buffer of *n*-component samples once into a ``QImage`` that owns its pixels."""
+    from PySide6.QtGui import QImage
+
+    formats = {
+        1: QImage.Format.Format_Grayscale8,
+        3: QImage.Format.Format_RGB888,
+        4: QImage.Format.Format_RGBA8888,
+    }
+    return QImage(samples, width, height, stride or width * n, formats[n]).copy()
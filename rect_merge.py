@@ -0,0 +1,109 @@
+"""
+Coalescing of highlight rectangles.
+
+The diff stages report one box per changed word (or drawing element), so a
+rewritten paragraph arrives as hundreds of overlapping boxes.  Before
+drawing, boxes are merged in two sweeps:
+
+1. **lines** — boxes sorted by vertical centre are grouped into lines (a box
+   joins the current line while its centre lies inside the line's vertical
+   extent); within a line, boxes sorted by ``x0`` merge when the horizontal
+   gap between them is at most ``h_gap``;
+2. **blocks** — line boxes sorted by ``y0`` merge into a block when the gap
+   below the block is at most ``v_ratio`` times the smaller line height and
+   their horizontal extents overlap (within ``h_gap``).  Blocks that ended
+   too far above the current line are retired from the sweep, so it stays
+   near-linear.
+
+All coordinates are page points; the result is a short list of ``fitz.Rect``.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List
+
+from lazy_imports import lazy_import
+
+fitz = lazy_import("fitz")
+
+Box = List[float]  # [x0, y0, x1, y1]
+
+
+def _merge_lines(boxes: List[Box], h_gap: float) -> List[Box]:
+    boxes.sort(key=lambda box: (box[1] + box[3]) / 2)
+    lines: List[List[Box]] = []
+    line_top = line_bottom = None
+    for box in boxes:
+        centre = (box[1] + box[3]) / 2
+        if lines and line_top <= centre <= line_bottom:
+            lines[-1].append(box)
+            line_top, line_bottom = min(line_top, box[1]), max(line_bottom, box[3])
+        else:
+            lines.append([box])
+            line_top, line_bottom = box[1], box[3]
+
+    merged = []
+    for line in lines:
+        line.sort(key=lambda box: box[0])
+        current = list(line[0])
+        for box in line[1:]:
+            if box[0] - current[2] <= h_gap:
+                current[1] = min(current[1], box[1])
+                current[2] = max(current[2], box[2])
+                current[3] = max(current[3], box[3])
+            else:
+                merged.append(current)
+                current = list(box)
+        merged.append(current)
+    return merged
+
+
+def _merge_blocks(boxes: List[Box], h_gap: float, v_ratio: float) -> List[Box]:
+    boxes.sort(key=lambda box: box[1])
+    finished: List[Box] = []
+    active: List[Box] = []
+    for box in boxes:
+        height = box[3] - box[1]
+        still_active = []
+        target = None
+        for block in active:
+            # later boxes only start further down, and the allowed gap never
+            # exceeds the block's height, so a block this far above is done
+            if box[1] - block[3] > v_ratio * (block[3] - block[1]):
+                finished.append(block)
+                continue
+            still_active.append(block)
+            if target is not None:
+                continue
+            line_height = min(height, block[3] - block[1])
+            overlaps = box[0] - h_gap <= block[2] and block[0] - h_gap <= box[2]
+            if overlaps and box[1] - block[3] <= v_ratio * line_height:
+                target = block
+        active = still_active
+        if target is None:
+            active.append(list(box))
+        else:
+            target[0] = min(target[0], box[0])
+            target[1] = min(target[1], box[1])
+            target[2] = max(target[2], box[2])
+            target[3] = max(target[3], box[3])
+    return finished + active
+
+
+def merge_rects(rects: Iterable, h_gap: float = 5.0, v_ratio: float = 0.5,
+                merge_blocks: bool = True) -> List[fitz.Rect]:
+    """Coalesce *rects* into line boxes and, with *merge_blocks*, into blocks."""
+    boxes: List[Box] = [[rect[0], rect[1], rect[2], rect[3]] for rect in rects]
+    if len(boxes) < 2:
+        return [fitz.Rect(box) for box in boxes]
+
+    boxes = _merge_lines(boxes, h_gap)
+    if merge_blocks:
+        # a grown block can newly touch a neighbour, so repeat until nothing changes
+        while True:
+            count = len(boxes)
+            boxes = _merge_blocks(boxes, h_gap, v_ratio)
+            if len(boxes) == count:
+                break
+    return [fitz.Rect(box) for box in boxes]
+
@@ -0,0 +1,84 @@
+"""
+Cache of whole comparison results.
+
+Users often re-run a comparison they already have, e.g. after closing the
+output by accident.  Results are stored in a :class:`disk_cache.DiskCache`
+in two parts:
+
+* the **diff** (``<diff key>.json``): the diff entries, the merged highlight
+  boxes, the page rotations auto-orientation applied, the byte-identical
+  pages and the statistics.  Its key hashes the digests of both files with a
+  canonical JSON form of every setting that influences the diff;
+* the **output** (``<output key>.pdf``): the compiled comparison PDF.  Its key
+  adds the settings that only influence rendering (DPI, page size, variants,
+  colour mode, ...) and the paths of both files, which the summary page
+  shows.
+
+A hit on both returns a copy of the stored PDF without opening either input.
+A hit on the diff alone (same inputs, other output settings or file paths)
+skips extraction and every diff stage and goes straight to rendering.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict, List, Mapping, Optional
+
+from disk_cache import DiskCache
+from lazy_imports import lazy_import
+
+fitz = lazy_import("fitz")
+
+# bump when the stored diff format or the meaning of a cached result changes
+FORMAT_VERSION = 2
+DEFAULT_BUDGET = 512 * 1024 * 1024
+
+
+def canonical_hash(*parts: Any) -> str:
+    """Hex digest of *parts* in a canonical JSON form (sorted keys, no whitespace)."""
+    text = json.dumps([FORMAT_VERSION, *parts], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=20).hexdigest()
+
+
+def encode_rect_map(rect_map: Mapping[int, List]) -> Dict[str, List[List[float]]]:
+    return {str(page): [[rect[0], rect[1], rect[2], rect[3]] for rect in rects] for page, rects in rect_map.items()}
+
+
+def decode_rect_map(encoded: Mapping[str, List[List[float]]]) -> Dict[int, List[fitz.Rect]]:
+    return {int(page): [fitz.Rect(rect) for rect in rects] for page, rects in encoded.items()}
+
+
+class ResultCache:
+    """Stored diffs and output PDFs of earlier comparisons."""
+
+    def __init__(self, budget: int = DEFAULT_BUDGET, root: Optional[str] = None):
+        self._store = DiskCache("results", budget, root)
+
+    @staticmethod
+    def diff_key(old_digest: bytes, new_digest: bytes, settings: Mapping[str, Any]) -> str:
+        return canonical_hash(old_digest.hex(), new_digest.hex(), settings)
+
+    @staticmethod
+    def output_key(diff_key: str, settings: Mapping[str, Any]) -> str:
+        return canonical_hash(diff_key, settings)
+
+    def load_diff(self, key: str) -> Optional[Dict]:
+        data = self._store.read(key, ".json")
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            # a truncated or foreign file is just a miss
+            return None
+
+    def store_diff(self, key: str, result: Mapping[str, Any]) -> None:
+        self._store.write(key, json.dumps(result, separators=(",", ":")).encode("utf-8"), ".json")
+
+    def output(self, key: str) -> Optional[str]:
+        """Path of the stored output PDF for *key*, or ``None``."""
+        return self._store.lookup(key, ".pdf")
+
+    def store_output(self, key: str, file_path: str) -> None:
+        self._store.write_file(key, file_path, ".pdf")
@@ -0,0 +1,279 @@
+"""
+In-memory settings store.
+
+``settings.json`` is read once per process and kept in memory.  Widgets change
+values through :class:`SettingsStore`; the file is rewritten atomically from a
+background timer once the edits settle, so a burst of checkbox toggles costs a
+single write and never blocks the UI thread.  Comparison jobs work from an
+immutable :meth:`SettingsStore.snapshot`, so edits made while a job is running
+never leak into it.
+"""
+
+import atexit
+import copy
+import json
+import os
+import sys
+import tempfile
+import threading
+from os import path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+SETTINGS_FILENAME = "settings.json"
+
+
+def settings_path() -> str:
+    """Absolute path of ``settings.json``: next to the executable when frozen,
+    otherwise next to the sources — never relative to the working directory."""
+    if getattr(sys, "frozen", False):
+        base_dir = path.dirname(path.abspath(sys.executable))
+    else:
+        base_dir = path.dirname(path.abspath(__file__))
+    return path.join(base_dir, SETTINGS_FILENAME)
+
+
+def _load_default_settings() -> dict:
+    return {
+        "PAGE_SIZES": {
+            "AUTO": [None, None],
+            "LETTER": [8.5, 11],
+            "ANSI A": [11, 8.5],
+            "ANSI B": [17, 11],
+            "ANSI C": [22, 17],
+            "ANSI D": [34, 22],
+        },
+        "DPI_LEVELS": [75, 150, 300, 600, 1200, 1800],
+        "DPI_LABELS": [
+            "Low DPI: Draft Quality [75]",
+            "Low DPI: Viewing Only [150]",
+            "Medium DPI: Printable [300]",
+            "Standard DPI [600]",
+            "High DPI [1200]: Professional Quality",
+            "Max DPI [1800]: Large File Size",
+        ],
+        "INCLUDE_IMAGES": {
+            "New Copy": True,
+            "Old Copy": True,
+            "Markup": True,
+            "Difference": False,
+            "Overlay": False,
+        },
+        "DPI": "Standard DPI [600]",
+        "DPI_LEVEL": 600,
+        "PAGE_SIZE": "AUTO",
+        "THRESHOLD": 128,
+        "MIN_AREA": 100,
+        "EPSILON": 0.0,
+        "FORCE_OCR": False,
+        "RASTER_DIFF_DPI": 100,
+        "VECTOR_DIFF": True,
+        "VECTOR_TOLERANCE": 0.5,
+        "IMAGE_DIFF": True,
+        "VECTOR_BOX_PADDING": 2,
+        "OCR_MERGE_DIST_H": 5,
+        "MOVE_MIN_TOKENS": 8,
+        "REFINE_MAX_TOKENS": 3,
+        "DISPLAY_LIST_BUDGET_MB": 256,
+        "RASTER_CACHE": True,
+        "RASTER_CACHE_MB": 1024,
+        "WORD_CACHE": True,
+        "WORD_CACHE_MB": 128,
+        "RESULT_CACHE": True,
+        "RESULT_CACHE_MB": 512,
+        "TEXT_MIN_DIFF_LENGTH": 2,
+        "NORMALIZE_TEXT": True,
+        "NORMALIZE_RULES": ["lower", "whitespace", "punctuation"],
+        "AUTO_ORIENT": False,
+        "OUTPUT_PATH": None,
+        "SCALE_OUTPUT": True,
+        "OUTPUT_BW": False,
+        "OUTPUT_GS": False,
+        "REDUCE_FILESIZE": False,
+        "MAIN_PAGE": "New Document",
+    }
+
+
+def _normalize_settings(settings: dict) -> dict:
+    defaults = _load_default_settings()
+
+    for key, value in defaults.items():
+        if key not in settings:
+            settings[key] = value
+            continue
+
+        if isinstance(value, dict) and isinstance(settings[key], dict):
+            for child_key, child_default in value.items():
+                settings[key].setdefault(child_key, child_default)
+
+    if isinstance(settings.get("PAGE_SIZE"), list):
+        page_size_list = settings["PAGE_SIZE"]
+        matched = "AUTO"
+        for name, size in settings["PAGE_SIZES"].items():
+            if list(size) == list(page_size_list):
+                matched = name
+                break
+        settings["PAGE_SIZE"] = matched
+
+    if settings.get("PAGE_SIZE") not in settings.get("PAGE_SIZES", {}):
+        settings["PAGE_SIZE"] = "AUTO"
+
+    return settings
+
+
+def freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(child) for key, child in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(child) for child in value)
+    return value
+
+
+class SettingsStore:
+    """Process-wide owner of the user settings.
+
+    All access goes through a lock, so the debounced writer thread never
+    serializes a dict that the UI thread is halfway through changing.
+    """
+
+    def __init__(self, file_path: Optional[str] = None, debounce_seconds: float = 0.5):
+        self._path = path.abspath(file_path) if file_path else settings_path()
+        self._debounce_seconds = debounce_seconds
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._settings: Optional[dict] = None
+        self._timer: Optional[threading.Timer] = None
+        self._dirty = False
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def _ensure_loaded(self) -> dict:
+        if self._settings is None:
+            settings = None
+            if path.exists(self._path):
+                try:
+                    with open(self._path, "r", encoding="utf-8") as file:
+                        settings = json.load(file)
+                except (OSError, ValueError) as error:
+                    print(f"Ignoring unreadable settings file {self._path}: {error}", file=sys.stderr)
+
+            original = json.dumps(settings, sort_keys=True)
+            if not settings:
+                settings = _load_default_settings()
+            self._settings = _normalize_settings(settings)
+
+            # write back only when normalization actually changed something
+            if json.dumps(self._settings, sort_keys=True) != original:
+                self._schedule_save()
+        return self._settings
+
+    # ------------------------------------------------------------------ #
+    #  reading                                                           #
+    # ------------------------------------------------------------------ #
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a private copy of *key* so callers cannot mutate the store."""
+        with self._lock:
+            return copy.deepcopy(self._ensure_loaded().get(key, default))
+
+    def data(self) -> dict:
+        with self._lock:
+            return copy.deepcopy(self._ensure_loaded())
+
+    def snapshot(self) -> Mapping[str, Any]:
+        """Immutable view of the current settings for a single job."""
+        with self._lock:
+            return freeze(self._ensure_loaded())
+
+    # ------------------------------------------------------------------ #
+    #  writing                                                           #
+    # ------------------------------------------------------------------ #
+
+    def set(self, key: str, value: Any) -> None:
+        self.update({key: value})
+
+    def set_item(self, key: str, child_key: str, value: Any) -> None:
+        """Set one entry of a nested dict setting such as ``INCLUDE_IMAGES``."""
+        with self._lock:
+            settings = self._ensure_loaded()
+            settings.setdefault(key, {})[child_key] = copy.deepcopy(value)
+            self._schedule_save()
+
+    def update(self, changes: Dict[str, Any]) -> None:
+        with self._lock:
+            settings = self._ensure_loaded()
+            for key, value in changes.items():
+                settings[key] = copy.deepcopy(value)
+            self._schedule_save()
+
+    def replace(self, settings: dict) -> None:
+        with self._lock:
+            self._settings = _normalize_settings(copy.deepcopy(settings))
+            self._schedule_save()
+
+    def flush(self) -> None:
+        """Write pending changes now (used at exit and by tools)."""
+        # serialize whole flushes so an older payload can never land last
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                payload = json.dumps(self._settings, indent=4)
+                self._dirty = False
+
+            try:
+                self._write_atomic(payload)
+            except OSError as error:
+                print(f"Failed to save settings to {self._path}: {error}", file=sys.stderr)
+
+    def _schedule_save(self) -> None:
+        self._dirty = True
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self._debounce_seconds, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _write_atomic(self, payload: str) -> None:
+        directory = path.dirname(self._path)
+        fd, temp_path = tempfile.mkstemp(prefix=".settings-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(payload)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self._path)
+        except BaseException:
+            if path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+_store: Optional[SettingsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_settings_store() -> SettingsStore:
+    """Return the process-wide store, creating it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SettingsStore()
+            atexit.register(_store.flush)
+        return _store
+
+
+def load_settings() -> dict:
+    """Mutable copy of the current settings (no disk I/O after the first call)."""
+    return get_settings_store().data()
+
+
+def save_settings(settings: dict) -> None:
+    """Replace the stored settings; the file is written debounced and atomically."""
+    get_settings_store().replace(settings)
@@ -0,0 +1,116 @@
+"""
+Token text normalization.
+
+A normalization is a set of named rules compiled once into a
+:class:`Normalizer`; applying it costs at most one ``unicodedata`` call, one
+case mapping, one ``str.translate`` (width folding and all deletions share a
+single table) and one precompiled regex substitution, whichever of those the
+rules need.  :meth:`Normalizer.normalize_many` runs the same steps over all
+words of a page joined into one string, so the per-call overhead is paid per
+page rather than per word.
+
+Rules:
+
+* ``lower`` / ``casefold`` — case folding (``casefold`` also folds ß, ﬁ, ...);
+* ``nfkc`` — Unicode NFKC compatibility normalization;
+* ``width`` — full-width ASCII and the ideographic space to their half-width forms;
+* ``whitespace`` — drop all whitespace;
+* ``punctuation`` — drop ``. , ; : ( ) [ ] { } < > - _ = + ` ~ " '``;
+* ``numbers`` — canonical numbers: ``1,200.50`` → ``1200.5``, ``007`` → ``7``.
+
+:data:`DEFAULT_RULES` reproduces the original normalization exactly.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_RULES: Tuple[str, ...] = ("lower", "whitespace", "punctuation")
+KNOWN_RULES = frozenset(("lower", "casefold", "nfkc", "width", "whitespace", "punctuation", "numbers"))
+
+PUNCTUATION = ".,;:()[]{}<>-_=+`~\"'"
+# every character str.isspace() (and so the regex \s) accepts lies at or below U+3000
+WHITESPACE = "".join(chr(code) for code in range(0x3001) if chr(code).isspace())
+# full-width "!" .. "~" sit at a fixed offset from ASCII
+FULL_WIDTH = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+FULL_WIDTH[0x3000] = 0x20
+
+NUMBER_PATTERN = re.compile(r"[0-9][0-9,]*(?:\.[0-9]+)?")
+# joins the words of a page for bulk normalization; no rule touches it
+_SEPARATOR = "\x00"
+
+
+def _canonical_number(match: "re.Match") -> str:
+    integer, _, fraction = match.group().replace(",", "").partition(".")
+    integer = integer.lstrip("0") or "0"
+    fraction = fraction.rstrip("0")
+    return f"{integer}.{fraction}" if fraction else integer
+
+
+class Normalizer:
+    """Callable applying one compiled set of rules; see the module docstring."""
+
+    def __init__(self, rules: Iterable[str] = DEFAULT_RULES):
+        self.rules = tuple(rules)
+        unknown = set(self.rules) - KNOWN_RULES
+        if unknown:
+            raise ValueError(f"Unknown normalization rule(s): {', '.join(sorted(unknown))}")
+
+        self._nfkc = "nfkc" in self.rules
+        self._case = str.casefold if "casefold" in self.rules else (str.lower if "lower" in self.rules else None)
+        # numbers are canonicalized after width folding (full-width digits) and
+        # before punctuation removal drops their separators
+        self._numbers = "numbers" in self.rules
+        fold: Dict[int, Optional[int]] = dict(FULL_WIDTH) if "width" in self.rules else {}
+        delete: Dict[int, Optional[int]] = {}
+        if "whitespace" in self.rules:
+            delete.update(dict.fromkeys(map(ord, WHITESPACE)))
+        if "punctuation" in self.rules:
+            delete.update(dict.fromkeys(map(ord, PUNCTUATION)))
+        if not self._numbers:
+            # nothing runs in between, so one table does both
+            fold, delete = {}, {**fold, **delete}
+        self._fold = fold or None
+        self._delete = delete or None
+
+    def _apply(self, text: str) -> str:
+        if self._nfkc:
+            text = unicodedata.normalize("NFKC", text)
+        if self._fold is not None:
+            text = text.translate(self._fold)
+        if self._numbers:
+            text = NUMBER_PATTERN.sub(_canonical_number, text)
+        if self._case is not None:
+            text = self._case(text)
+        if self._delete is not None:
+            text = text.translate(self._delete)
+        return text
+
+    def __call__(self, text: str) -> str:
+        return self._apply(text.strip())
+
+    def normalize_many(self, texts: Sequence[str]) -> List[str]:
+        """Normalize *texts* in one pass; equal to ``[self(text) for text in texts]``."""
+        if not texts:
+            return []
+        joined = _SEPARATOR.join([text.strip() for text in texts])
+        if joined.count(_SEPARATOR) != len(texts) - 1:
+            # a separator inside a word would shift every later word
+            return [self(text) for text in texts]
+        # no rule maps across the separator: it is a starter for NFKC, not a
+        # digit, and not cased (so even the final-sigma rule stops at it)
+        return self._apply(joined).split(_SEPARATOR)
+
+
+@lru_cache(maxsize=16)
+def _cached_normalizer(rules: Tuple[str, ...]) -> Normalizer:
+    return Normalizer(rules)
+
+
+def get_normalizer(rules: Iterable[str] = DEFAULT_RULES) -> Normalizer:
+    """Shared compiled :class:`Normalizer` for *rules*."""
+    return _cached_normalizer(tuple(rules))
+
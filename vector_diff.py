@@ -0,0 +1,178 @@
+"""
+Vector-graphics comparison for drawings.
+
+Engineering drawings change mostly in their linework, which has no text for
+the text diff to see.  Every path of ``page.get_cdrawings()`` is split into
+its primitives (lines, rectangles, quads and Bézier curves); each primitive
+gets a key made of its kind, its coordinates quantized to the tolerance and
+put in a direction-independent order, and its stroke/fill style.
+
+Old and new primitives are matched in two passes:
+
+1. **exact** — identical keys cancel out through a hash multiset, which
+   handles the bulk of an unchanged drawing in linear time;
+2. **tolerant** — the leftovers of the old page go into a spatial grid, and
+   each leftover new primitive only looks at the neighbouring cells for a
+   partner of the same kind and style whose coordinates are all within one
+   quantum, so a primitive sitting on a rounding boundary still matches.
+
+What remains unmatched was removed (old) or added (new) and is returned as
+bounding boxes.  Nothing is rasterized.
+"""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+from lazy_imports import lazy_import
+
+fitz = lazy_import("fitz")
+
+Primitive = Tuple[tuple, Tuple[float, float, float, float]]
+
+
+def _style_key(path: Dict, quantum: float) -> tuple:
+    def color(value):
+        return tuple(round(channel, 2) for channel in value) if value else None
+
+    width = path.get("width") or 0.0
+    return (
+        path.get("type"),
+        color(path.get("color")),
+        color(path.get("fill")),
+        round(width / quantum),
+        path.get("dashes"),
+    )
+
+
+def _points(coords: Sequence[int]) -> List[Tuple[int, int]]:
+    return list(zip(coords[::2], coords[1::2]))
+
+
+def _join(points) -> Tuple[int, ...]:
+    return tuple(value for point in points for value in point)
+
+
+def _canonical(kind: str, coords: List[int]) -> Tuple[int, ...]:
+    """Order *coords* so the same shape always yields the same flat tuple."""
+    if kind == "re":
+        x0, y0, x1, y1 = coords
+        return min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)
+    points = _points(coords)
+    if kind in ("l", "qu"):
+        return _join(sorted(points))
+    # Bézier curve: the same curve may be drawn in either direction
+    return _join(min(points, points[::-1]))
+
+
+def extract_primitives(page, quantum: float = 0.5) -> List[Primitive]:
+    """Split the drawings of *page* into ``(key, bbox)`` primitives.
+
+    Coordinates are in unrotated page space, the same space as word boxes.
+    """
+    get_drawings = getattr(page, "get_cdrawings", page.get_drawings)
+    primitives = []
+    for path in get_drawings():
+        style = _style_key(path, quantum)
+        margin = (path.get("width") or 0.0) / 2
+        for item in path["items"]:
+            kind = item[0]
+            if kind == "l":
+                # straight lines dominate drawings, so they skip the generic path
+                (x0, y0), (x1, y1) = item[1], item[2]
+                start = (round(x0 / quantum), round(y0 / quantum))
+                end = (round(x1 / quantum), round(y1 / quantum))
+                bbox = (min(x0, x1) - margin, min(y0, y1) - margin, max(x0, x1) + margin, max(y0, y1) + margin)
+                primitives.append((("l", style, start + end if start <= end else end + start), bbox))
+                continue
+            if kind == "re":
+                # a rect plus a trailing orientation flag
+                raw = list(item[1])
+            else:
+                # points, or for "qu" a single nested quad of points
+                raw = [value for point in (item[1] if kind == "qu" else item[1:]) for value in point]
+            coords = [round(value / quantum) for value in raw]
+            xs, ys = raw[::2], raw[1::2]
+            bbox = (min(xs) - margin, min(ys) - margin, max(xs) + margin, max(ys) + margin)
+            primitives.append(((kind, style, _canonical(kind, coords)), bbox))
+    return primitives
+
+
+def _close(kind: str, first: Tuple[int, ...], second: Tuple[int, ...]) -> bool:
+    """Whether two canonical coordinate tuples differ by at most one quantum everywhere."""
+    if len(first) != len(second):
+        return False
+    if all(abs(a - b) <= 1 for a, b in zip(first, second)):
+        return True
+    if kind in ("l", "c"):
+        # near-equal end points may have sorted the other way round
+        reversed_second = _join(_points(second)[::-1])
+        return all(abs(a - b) <= 1 for a, b in zip(first, reversed_second))
+    return False
+
+
+def _unmatched(primitives: List[Primitive], others: List[Primitive]) -> List[Primitive]:
+    """Primitives of *primitives* left over once every key of *others* cancels one of them."""
+    budget = Counter(key for key, _ in others)
+    left = []
+    for primitive in primitives:
+        if budget[primitive[0]] > 0:
+            budget[primitive[0]] -= 1
+        else:
+            left.append(primitive)
+    return left
+
+
+def match_primitives(old: List[Primitive], new: List[Primitive],
+                     cell: int = 16) -> Tuple[List[Primitive], List[Primitive]]:
+    """Return the primitives of *old* and *new* that have no counterpart.
+
+    *cell* is the grid cell size in quanta used by the tolerant pass.
+    """
+    old_left, new_left = _unmatched(old, new), _unmatched(new, old)
+    if not old_left or not new_left:
+        return old_left, new_left
+
+    def grid_key(key, column_offset=0, row_offset=0):
+        # anchored on the top-left of the coordinates, which does not depend on their order
+        coords = key[2]
+        return key[0], key[1], min(coords[::2]) // cell + column_offset, min(coords[1::2]) // cell + row_offset
+
+    grid: Dict[tuple, List[int]] = defaultdict(list)
+    for index, (key, _) in enumerate(old_left):
+        grid[grid_key(key)].append(index)
+
+    def find_partner(key):
+        for column_offset in (-1, 0, 1):
+            for row_offset in (-1, 0, 1):
+                for index in grid.get(grid_key(key, column_offset, row_offset), ()):
+                    if index not in matched_old and _close(key[0], old_left[index][0][2], key[2]):
+                        return index
+        return None
+
+    matched_old = set()
+    unmatched_new = []
+    for primitive in new_left:
+        partner = find_partner(primitive[0])
+        if partner is None:
+            unmatched_new.append(primitive)
+        else:
+            matched_old.add(partner)
+
+    unmatched_old = [primitive for index, primitive in enumerate(old_left) if index not in matched_old]
+    return unmatched_old, unmatched_new
+
+
+def diff_primitives(old: List[Primitive], new: List[Primitive]) -> Tuple[List[fitz.Rect], List[fitz.Rect]]:
+    """Bounding boxes of the primitives removed from *old* and added to *new*."""
+    removed, added = match_primitives(old, new)
+    return [fitz.Rect(bbox) for _, bbox in removed], [fitz.Rect(bbox) for _, bbox in added]
+
+
+def diff_pages(old_page, new_page, tolerance: float = 0.5) -> Tuple[List[fitz.Rect], List[fitz.Rect]]:
+    """Bounding boxes of the geometry removed from *old_page* and added to *new_page*.
+
+    Coordinates closer than *tolerance* (in points) count as equal.
+    """
+    return diff_primitives(extract_primitives(old_page, tolerance), extract_primitives(new_page, tolerance))
@@ -0,0 +1,353 @@
+"""
+Watch-folder daemon: compares every new revision of a document as soon as
+it lands in a watched folder.
+
+Document control systems drop revisions into shared folders under names
+such as ``Plan_RevB.pdf`` or ``Spec-v3.pdf``.  A file name is split by a
+regular expression with the named groups ``document`` and ``revision``;
+files of the same document in the same folder form a revision chain, and a
+new revision is compared against the highest revision below it.  Letter
+revisions (preliminary issues A, B, ..., AA) order before numeric ones
+(issued 0, 1, 2, ...).
+
+* **Watching** — inotify (through ``ctypes``, no extra dependency) on Linux,
+  polling of the folder listings everywhere else or with ``--poll``, which
+  network shares need because their remote writes raise no inotify events;
+* **Debouncing** — a file is only compared once its size and modification
+  time have not changed for ``--settle`` seconds and it ends with the
+  ``%%EOF`` marker, so copies in progress are never opened;
+* **Workers** — comparisons run in a bounded process pool; further jobs wait
+  in a queue, so a burst of revisions never starts more than ``--jobs``
+  comparisons at once.
+
+Every comparison goes through the normal engine with the saved settings, so
+it shares the on-disk caches: the words and expensive renders of a revision
+were stored when it was the new side and are read back when it becomes the
+old side of the next comparison.
+
+Run with ``python watch_folder.py FOLDER [FOLDER ...]`` (``--help`` for the
+options); stop with Ctrl+C.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import struct
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from os import path
+from typing import Deque, Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+# "Plan_RevB", "Plan rev. 2", "Spec-v3", "Dwg R12" — a bare r/v needs a separator before it
+DEFAULT_PATTERN = r"^(?P<document>.+?)(?:[ _.-]*rev|[ _.-]+[rv])[ _.-]*(?P<revision>\d+|[A-Z]{1,2})$"
+DEFAULT_SETTLE_SECONDS = 3.0
+DEFAULT_POLL_SECONDS = 2.0
+# outputs of the engine are written next to their inputs and must not be taken for revisions
+OUTPUT_MARKER = " Comparison"
+# bytes at the end of a file searched for the end-of-file marker
+EOF_WINDOW = 1024
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+RevisionKey = Tuple[int, int, object]
+
+
+def revision_key(revision: str) -> RevisionKey:
+    """Sort key of a revision label: letters (A < B < ... < AA) before numbers."""
+    if revision.isdigit():
+        return 1, 0, int(revision)
+    return 0, len(revision), revision.upper()
+
+
+def is_candidate(file_path: str) -> bool:
+    name = path.basename(file_path)
+    return name.lower().endswith(".pdf") and not name.startswith(".") and OUTPUT_MARKER not in name
+
+
+class RevisionIndex:
+    """Known revisions of every document, by folder and document name."""
+
+    def __init__(self, pattern: Pattern[str]):
+        self.pattern = pattern
+        self._chains: Dict[Tuple[str, str], Dict[RevisionKey, str]] = {}
+
+    def parse(self, file_path: str) -> Optional[Tuple[Tuple[str, str], RevisionKey]]:
+        match = self.pattern.match(path.splitext(path.basename(file_path))[0])
+        if match is None:
+            return None
+        document = match.group("document").strip(" _.-").casefold()
+        folder = path.dirname(path.abspath(file_path))
+        return (folder, document), revision_key(match.group("revision"))
+
+    def add(self, file_path: str) -> Optional[str]:
+        """Register *file_path*; return the revision it should be compared against."""
+        parsed = self.parse(file_path)
+        if parsed is None:
+            return None
+        chain_key, revision = parsed
+        chain = self._chains.setdefault(chain_key, {})
+        chain[revision] = path.abspath(file_path)
+        earlier = [key for key in chain if key < revision and path.exists(chain[key])]
+        return chain[max(earlier)] if earlier else None
+
+
+class Debouncer:
+    """Holds changed files back until they have stopped changing."""
+
+    def __init__(self, settle_seconds: float = DEFAULT_SETTLE_SECONDS):
+        self.settle_seconds = settle_seconds
+        # path -> (size, mtime_ns, time the file was first seen with that size and mtime)
+        self._pending: Dict[str, Tuple[int, int, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def touch(self, file_path: str) -> None:
+        self._pending.setdefault(file_path, (-1, -1, 0.0))
+
+    def ready(self, now: Optional[float] = None) -> List[str]:
+        """Files unchanged for the settle time, complete and ready to compare."""
+        now = time.monotonic() if now is None else now
+        settled = []
+        for file_path, (size, mtime_ns, since) in list(self._pending.items()):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                # deleted or renamed away while being written
+                del self._pending[file_path]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                self._pending[file_path] = (stat.st_size, stat.st_mtime_ns, now)
+            elif now - since >= self.settle_seconds and self._complete(file_path, stat.st_size):
+                del self._pending[file_path]
+                settled.append(file_path)
+        return settled
+
+    @staticmethod
+    def _complete(file_path: str, size: int) -> bool:
+        # a PDF being copied has no trailer yet; an incremental update appends a new one
+        try:
+            with open(file_path, "rb") as handle:
+                handle.seek(max(0, size - EOF_WINDOW))
+                return b"%%EOF" in handle.read()
+        except OSError:
+            return False
+
+
+def _scan(folders: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+    listing = {}
+    for folder in folders:
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_file():
+                    stat = entry.stat()
+                    listing[entry.path] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                pass
+    return listing
+
+
+class PollingWatcher:
+    """Reports files whose size or modification time changed between folder scans."""
+
+    def __init__(self, folders: List[str], interval: float = DEFAULT_POLL_SECONDS):
+        self.folders = folders
+        self.interval = interval
+        self._listing = _scan(folders)
+
+    def wait(self, timeout: float) -> Set[str]:
+        time.sleep(min(timeout, self.interval))
+        listing = _scan(self.folders)
+        changed = {file_path for file_path, state in listing.items() if self._listing.get(file_path) != state}
+        self._listing = listing
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Reports files created, written or moved into the folders, via Linux inotify."""
+
+    MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+
+    def __init__(self, folders: List[str]):
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or libc_name is None:
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._folders: Dict[int, str] = {}
+        try:
+            for folder in folders:
+                watch = libc.inotify_add_watch(self._fd, os.fsencode(folder), self.MASK)
+                if watch < 0:
+                    raise OSError(ctypes.get_errno(), f"cannot watch {folder}")
+                self._folders[watch] = folder
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def wait(self, timeout: float) -> Set[str]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        offset = 0
+        while offset + _INOTIFY_EVENT.size <= len(data):
+            watch, _, _, name_length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = data[offset:offset + name_length].rstrip(b"\0")
+            offset += name_length
+            folder = self._folders.get(watch)
+            if folder is not None and name:
+                changed.add(path.join(folder, os.fsdecode(name)))
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def create_watcher(folders: List[str], poll: bool = False, interval: float = DEFAULT_POLL_SECONDS):
+    """inotify where available, unless *poll* asks for polling (e.g. on network shares)."""
+    if not poll:
+        try:
+            return InotifyWatcher(folders)
+        except OSError:
+            pass
+    return PollingWatcher(folders, interval)
+
+
+def _compare_job(old_path: str, new_path: str, output_dir: Optional[str]) -> Tuple[str, str, Optional[str], int, float]:
+    """Compare one revision pair with the saved settings in a worker process."""
+    # imported here: the watcher itself needs neither Qt nor PyMuPDF
+    from py_PDF_compare_gui import CompareThread
+
+    started = time.perf_counter()
+    comparison = CompareThread([], None)
+    if output_dir:
+        comparison.OUTPUT_PATH = output_dir
+    # the engine takes the main (new) document first unless the old one is the main page
+    files = [new_path, old_path] if comparison.MAIN_PAGE == "New Document" else [old_path, new_path]
+    output_path = comparison.handle_files(files)
+    differences = comparison.statistics["TOTAL_DIFFERENCES"]
+    return old_path, new_path, output_path, differences, time.perf_counter() - started
+
+
+def run_watch(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Watch folders and compare each new revision of a document against the previous one."
+    )
+    parser.add_argument("folders", nargs="+", help="folders to watch")
+    parser.add_argument("--pattern", default=DEFAULT_PATTERN,
+                        help="regular expression with groups 'document' and 'revision', matched "
+                             "case-insensitively against the file name without extension")
+    parser.add_argument("-o", "--output-dir", help="write comparisons into this folder (default: as in the settings)")
+    parser.add_argument("-j", "--jobs", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="parallel comparisons (default: half the CPUs)")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE_SECONDS,
+                        help="seconds a file must stay unchanged before it is compared (default: 3)")
+    parser.add_argument("--poll", type=float, nargs="?", const=DEFAULT_POLL_SECONDS,
+                        help="poll every N seconds instead of using inotify (needed for network shares)")
+    args = parser.parse_args(argv)
+
+    folders = [path.abspath(folder) for folder in args.folders]
+    for folder in folders:
+        if not path.isdir(folder):
+            parser.error(f"not a folder: {folder}")
+    try:
+        pattern = re.compile(args.pattern, re.IGNORECASE)
+    except re.error as error:
+        parser.error(f"invalid --pattern: {error}")
+    if not {"document", "revision"} <= set(pattern.groupindex):
+        parser.error("--pattern needs the named groups 'document' and 'revision'")
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    # revisions already present are known, not new
+    index = RevisionIndex(pattern)
+    for file_path in sorted(_scan(folders)):
+        if is_candidate(file_path):
+            index.add(file_path)
+
+    watcher = create_watcher(folders, args.poll is not None, args.poll or DEFAULT_POLL_SECONDS)
+    mode = "polling" if isinstance(watcher, PollingWatcher) else "inotify"
+    print(f"Watching {len(folders)} folder(s) ({mode}, {args.jobs} worker(s)); press Ctrl+C to stop.")
+
+    debouncer = Debouncer(args.settle)
+    queue: Deque[Tuple[str, str]] = deque()
+    running: Dict[Future, Tuple[str, str]] = {}
+    failures = 0
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+            while True:
+                # wake up at least every second while files settle or jobs run
+                timeout = 1.0 if debouncer or running else 60.0
+                for file_path in watcher.wait(timeout):
+                    if is_candidate(file_path):
+                        debouncer.touch(file_path)
+
+                for file_path in debouncer.ready():
+                    if index.parse(file_path) is None:
+                        print(f"SKIP    {file_path} (no revision in the file name)")
+                        continue
+                    previous = index.add(file_path)
+                    if previous is None:
+                        print(f"NEW     {file_path} (no earlier revision)")
+                    elif (previous, file_path) not in queue:
+                        queue.append((previous, file_path))
+
+                # bounded pool: at most one job per worker in flight, the rest wait here
+                while queue and len(running) < args.jobs:
+                    old_path, new_path = queue.popleft()
+                    print(f"START   {path.basename(old_path)} -> {path.basename(new_path)}")
+                    future = executor.submit(_compare_job, old_path, new_path, args.output_dir)
+                    running[future] = (old_path, new_path)
+
+                if running:
+                    done, _ = wait(list(running), timeout=0)
+                    for future in done:
+                        old_path, new_path = running.pop(future)
+                        try:
+                            _, _, output_path, differences, seconds = future.result()
+                        except Exception as error:
+                            failures += 1
+                            print(f"FAILED  {new_path}: {error}", file=sys.stderr)
+                            continue
+                        if output_path is None:
+                            print(f"SAME    {new_path} is identical to {path.basename(old_path)} ({seconds:.2f}s)")
+                        else:
+                            print(f"OK      {new_path} -> {output_path}  ({differences} difference(s), {seconds:.2f}s)")
+    except KeyboardInterrupt:
+        print("Stopped.")
+    finally:
+        watcher.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_watch())
@@ -0,0 +1,66 @@
+"""
+On-disk cache of the words on each page.
+
+In a chain of revisions every document is compared twice: once as the new
+side against its predecessor and once as the old side against its
+successor.  :class:`WordCache` keeps the words extracted from a file, keyed
+by its digest, so the second comparison reads them back instead of parsing
+the page contents again.
+
+Words are stored before normalization and filtering, in reading order, as
+``(x0, y0, x1, y1, text)`` in unrotated page space, so one entry serves every
+normalization setting and page rotation.  An entry holds the pages extracted
+so far; pages skipped as identical are added when a later comparison needs
+them.  The entries live in a :class:`disk_cache.DiskCache` and a budget of 0
+disables the cache.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from disk_cache import DiskCache
+
+DEFAULT_BUDGET = 128 * 1024 * 1024
+
+Word = Tuple[float, float, float, float, str]
+
+
+def page_words(page) -> List[Word]:
+    """Non-blank words of *page* in reading order, stripped."""
+    words = page.get_text("words")
+    words.sort(key=lambda word: (word[5], word[6], word[7], word[1], word[0]))
+    return [
+        (word[0], word[1], word[2], word[3], word[4].strip())
+        for word in words
+        if (word[4] or "").strip()
+    ]
+
+
+class WordCache:
+    """Words of every extracted page of a file, by file digest."""
+
+    def __init__(self, budget: int = DEFAULT_BUDGET, root: Optional[str] = None):
+        self.budget = budget
+        self._store = DiskCache("words", budget, root)
+
+    def load(self, digest: Optional[bytes]) -> Dict[int, List[Word]]:
+        if digest is None or self.budget <= 0:
+            return {}
+        data = self._store.read(digest.hex(), ".json.z")
+        if data is None:
+            return {}
+        try:
+            pages = json.loads(zlib.decompress(data))
+        except (ValueError, zlib.error):
+            # a truncated or foreign file is just a miss
+            return {}
+        return {int(page): [tuple(word) for word in words] for page, words in pages.items()}
+
+    def store(self, digest: Optional[bytes], pages: Dict[int, List[Word]]) -> None:
+        if digest is None or self.budget <= 0:
+            return
+        data = json.dumps({str(page): words for page, words in pages.items()}, separators=(",", ":"))
+        self._store.write(digest.hex(), zlib.compress(data.encode("utf-8"), 6), ".json.z")